@@ -0,0 +1,24 @@
+"""
+    python -m anoncreds.bench <benchmark> [options]
+
+where the benchmark is one of compare, backends, phases, simulator,
+executor_latency, verifier_pool or four_squares (see python -m anoncreds.bench <benchmark> --help).
+"""
+import importlib
+import sys
+
+BENCHMARKS = ['compare', 'backends', 'phases', 'simulator', 'executor_latency',
+              'verifier_pool', 'four_squares']
+
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    if not args or args[0] not in BENCHMARKS:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    module = importlib.import_module('anoncreds.bench.' + args[0])
+    return module.main(args[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
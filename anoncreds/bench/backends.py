@@ -0,0 +1,339 @@
+"""
+Runs the same flows on every registered crypto backend (see
+config.config), checks that the proofs made on one backend verify on the
+others, and compares the backends' times, primitive by primitive and
+phase by phase.
+
+    python -m anoncreds.bench backends --repeat 5 --output backends.json
+
+Only one backend can be loaded in a process, so every backend runs in a
+process of its own, twice. First it runs the flows with the fixed test
+primes, saving the public keys, proof requests and proofs, and times the
+primitives and the phases. Then it verifies the proofs the other backends
+saved, after checking that it serializes them again to the same bytes.
+Backends that can't be loaded (e.g. gmpy2 is not installed) are reported
+and left out. Exits with 1 if a proof doesn't cross-verify.
+"""
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+from anoncreds.bench.compare import SUITE, pointName
+from anoncreds.bench.executor_latency import percentile
+from anoncreds.bench.fixtures import primes
+from anoncreds.bench.phases import SweepPoint, runFlow, measure, \
+    environment, _Timings
+from anoncreds.protocol.codec import pack, unpack
+from anoncreds.protocol.repo.public_repo import PublicRepoInMemory
+from anoncreds.protocol.types import ID
+from anoncreds.protocol.utils import pairingGroup
+from anoncreds.protocol.verifier import Verifier
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+from config.config import cmod, selectBackend, availableBackends, \
+    BACKEND_ENV
+
+# the points of the compare suite with fewer attributes
+QUICK_SUITE = [SweepPoint(point.flow, 2, 1, 1, point.L) for point in SUITE]
+
+# a primitive is timed this many times per repeat
+PRIMITIVE_ROUNDS = 20
+
+PRODUCE = 'produce'
+VERIFY = 'verify'
+
+OK = 'ok'
+UNAVAILABLE = 'unavailable'
+
+
+def _artifactsPath(workDir, backend):
+    return os.path.join(workDir, backend + '.flows')
+
+
+def _resultPath(workDir, backend, stage):
+    return os.path.join(workDir, '{}.{}.json'.format(backend, stage))
+
+
+def timePrimitives(repeat):
+    """
+    :return: the median time of every primitive, in seconds
+    """
+    group = pairingGroup()
+    pPrime, qPrime = primes['prime1']
+    n = (2 * pPrime + 1) * (2 * qPrime + 1)
+    x, y = cmod.random(n), cmod.random(n)
+    e = cmod.integer(cmod.randomBits(2128))
+    g, h = group.random(cmod.G1), group.random(cmod.G1)
+    z = group.random(cmod.ZR)
+    ops = OrderedDict([
+        ('integer.mul', lambda: x * y),
+        ('integer.modexp', lambda: x ** e),
+        ('integer.inverse', lambda: x ** -1),
+        ('integer.serialize', lambda: cmod.deserialize(cmod.serialize(x))),
+        ('G1.mul', lambda: g * h),
+        ('G1.exp', lambda: g ** z),
+        ('pairing', lambda: cmod.pair(g, h)),
+    ])
+    res = OrderedDict()
+    for name, op in ops.items():
+        values = []
+        for _ in range(repeat * PRIMITIVE_ROUNDS):
+            start = time.perf_counter()
+            op()
+            values.append(time.perf_counter() - start)
+        res[name] = percentile(values, 50)
+    return res
+
+
+async def _exportPublic(flow):
+    entries = []
+    for schemaId in flow.schemaIds:
+        repo = flow.publicRepo
+        schema = await repo.getSchema(schemaId)
+        entry = OrderedDict([
+            ('schema', schema),
+            ('pk', await repo.getPublicKey(schemaId)),
+            ('pkR', await repo.getPublicKeyRevocation(schemaId))])
+        try:
+            entry['accumPk'] = await repo.getPublicKeyAccumulator(schemaId)
+        except ValueError:
+            # primary flow, no accumulator
+            pass
+        else:
+            entry['accum'] = await repo.getAccumulator(schemaId)
+            entry['tails'] = await repo.getTails(schemaId)
+        entries.append(entry)
+    return entries
+
+
+async def _importPublic(entries):
+    """
+    A public repo with the exported schemas and keys. They are submitted in
+    the order they were to the exporting one, so they get the same
+    sequence numbers.
+    """
+    repo = PublicRepoInMemory()
+    for entry in entries:
+        schema = await repo.submitSchema(entry['schema'])
+        schemaId = ID(schema.getKey(), schemaId=schema.seqId)
+        await repo.submitPublicKeys(schemaId, entry['pk'], entry['pkR'])
+        if 'accumPk' in entry:
+            await repo.submitAccumulator(schemaId, entry['accumPk'],
+                                         entry['accum'], entry['tails'])
+    return repo
+
+
+async def produce(points, repeat, path):
+    """
+    Runs a flow for every point, saving what a verifier needs to the path,
+    and times the primitives and the phases.
+
+    :return: the median times in seconds, named after the primitive or
+    '<point>.<phase>'
+    """
+    flows = OrderedDict()
+    for point in points:
+        flow = await runFlow(point, _Timings())
+        flows[pointName(point)] = OrderedDict([
+            ('public', await _exportPublic(flow)),
+            ('proofRequest', flow.proofRequest),
+            ('proof', flow.proof)])
+    with open(path, 'wb') as f:
+        pickle.dump(pack(flows), f)
+
+    times = timePrimitives(repeat)
+    for point in points:
+        res = await measure(point, repeat)
+        for phase, summary in res['phases'].items():
+            times['{}.{}'.format(pointName(point), phase)] = summary['p50']
+    return times
+
+
+async def verifyArtifacts(path):
+    """
+    Verifies every proof saved to the path by produce, possibly on another
+    backend.
+
+    :return: 'ok' or what went wrong, for every flow
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    packed = pickle.loads(data)
+    res = OrderedDict()
+    for name, flow in unpack(packed).items():
+        if pickle.dumps(pack({name: flow})) != \
+                pickle.dumps({name: packed[name]}):
+            res[name] = 'serialized differently'
+            continue
+        try:
+            repo = await _importPublic(flow['public'])
+            verifier = Verifier(WalletInMemory('verifier1', repo))
+            verified = await verifier.verify(flow['proofRequest'],
+                                             flow['proof'])
+            res[name] = OK if verified else 'not verified'
+        except Exception as ex:
+            res[name] = '{}: {}'.format(type(ex).__name__, ex)
+    return res
+
+
+def _worker(backend, stage, workDir, repeat, points):
+    selectBackend(backend)
+    loop = asyncio.get_event_loop()
+    if stage == PRODUCE:
+        result = loop.run_until_complete(produce(
+            points, repeat, _artifactsPath(workDir, backend)))
+    else:
+        result = OrderedDict()
+        for other in sorted(os.listdir(workDir)):
+            producer, ext = os.path.splitext(other)
+            if ext == '.flows' and producer != backend:
+                result[producer] = loop.run_until_complete(verifyArtifacts(
+                    os.path.join(workDir, other)))
+    with open(_resultPath(workDir, backend, stage), 'w') as f:
+        json.dump(result, f, indent=2)
+
+
+def _runWorker(backend, stage, workDir, repeat, quick):
+    args = [sys.executable, '-m', 'anoncreds.bench', 'backends',
+            '--worker', backend, '--stage', stage, '--work-dir', workDir,
+            '--repeat', str(repeat)] + (['--quick'] if quick else [])
+    # selected through the environment too, as the fixtures imported with
+    # the flows use the backend
+    env = dict(os.environ, **{BACKEND_ENV: backend})
+    proc = subprocess.run(args, env=env, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True)
+    if proc.returncode:
+        lines = proc.stderr.strip().splitlines()
+        return lines[-1] if lines else 'exited with {}'.format(
+            proc.returncode)
+    with open(_resultPath(workDir, backend, stage)) as f:
+        return json.load(f, object_pairs_hook=OrderedDict)
+
+
+def compareBackends(backends, repeat, quick=False, workDir=None):
+    """
+    Runs every backend in its own processes.
+
+    :return: a report with the times of every backend, the result of
+    verifying every backend's proofs on every other one, and why the
+    backends that couldn't be run couldn't
+    """
+    times = OrderedDict()
+    crossVerification = OrderedDict()
+    unavailable = OrderedDict()
+    with tempfile.TemporaryDirectory() as tmp:
+        workDir = workDir or tmp
+        for backend in backends:
+            res = _runWorker(backend, PRODUCE, workDir, repeat, quick)
+            if isinstance(res, str):
+                unavailable[backend] = res
+            else:
+                times[backend] = res
+        for backend in times:
+            res = _runWorker(backend, VERIFY, workDir, repeat, quick)
+            if isinstance(res, str):
+                # the backend ran the flows, but can't read other's proofs
+                res = OrderedDict((producer, OrderedDict([('*', res)]))
+                                  for producer in times
+                                  if producer != backend)
+            for producer, flows in res.items():
+                crossVerification.setdefault(producer, OrderedDict())[
+                    backend] = flows
+    return OrderedDict([('environment', environment()),
+                        ('repeat', repeat),
+                        ('times', times),
+                        ('crossVerification', crossVerification),
+                        (UNAVAILABLE, unavailable)])
+
+
+def failures(report):
+    """
+    :return: (producer, verifier, flow, what went wrong) for every proof
+    that didn't cross-verify
+    """
+    return [(producer, verifier, flow, status)
+            for producer, verifiers in report['crossVerification'].items()
+            for verifier, flows in verifiers.items()
+            for flow, status in flows.items() if status != OK]
+
+
+def formatReport(report):
+    backends = list(report['times'])
+    lines = []
+    if backends:
+        base = backends[0]
+        header = ['time (ms)'] + backends + \
+            ['{}/{}'.format(b, base) for b in backends[1:]]
+        rows = [header]
+        for metric, value in report['times'][base].items():
+            values = [report['times'][b].get(metric) for b in backends]
+            rows.append([metric] +
+                        ['-' if v is None else '{:.3f}'.format(v * 1000)
+                         for v in values] +
+                        ['-' if v is None or not value else
+                         '{:.2f}'.format(v / value) for v in values[1:]])
+        widths = [max(len(row[i]) for row in rows)
+                  for i in range(len(header))]
+        for i, row in enumerate(rows):
+            lines.append('  '.join(v.ljust(w) if j == 0 else v.rjust(w)
+                                   for j, (v, w) in
+                                   enumerate(zip(row, widths))))
+            if not i:
+                lines.append('  '.join('-' * w for w in widths))
+
+    if len(backends) > 1:
+        lines.append('')
+        problems = failures(report)
+        lines.append('cross-verification: ' + (
+            'all proofs verified on all backends' if not problems else
+            '{} failed'.format(len(problems))))
+        for producer, verifier, flow, status in problems:
+            lines.append('  {} proof of {} on {}: {}'.format(
+                flow, producer, verifier, status))
+    for backend, reason in report[UNAVAILABLE].items():
+        lines.append('')
+        lines.append('{} unavailable: {}'.format(backend, reason))
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m anoncreds.bench backends',
+        description=__doc__.splitlines()[1])
+    parser.add_argument('--backends', nargs='+', default=None,
+                        help='backends to compare (all registered ones if '
+                             'omitted: {})'.format(
+                            ', '.join(availableBackends())))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true',
+                        help='run small flows, to check conformance only')
+    parser.add_argument('--output', help='also write the report as JSON to '
+                                         'this file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--stage', choices=[PRODUCE, VERIFY],
+                        help=argparse.SUPPRESS)
+    parser.add_argument('--work-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args(args)
+
+    if args.worker:
+        _worker(args.worker, args.stage, args.work_dir, args.repeat,
+                QUICK_SUITE if args.quick else SUITE)
+        return 0
+
+    report = compareBackends(args.backends or availableBackends(),
+                             args.repeat, args.quick)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    print(formatReport(report))
+    return 1 if failures(report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Runs the benchmark suite and compares its metrics (median phase times and
+crypto operation counts) with a stored baseline, failing if any of them
+regressed beyond its tolerance.
+
+    python -m anoncreds.bench compare --baseline baseline.json --update
+    python -m anoncreds.bench compare --baseline baseline.json \\
+        --tolerance '*.seconds=0.5' --tolerance '*.pairing=0'
+
+Operation counts don't depend on the machine, so they can be held to no
+tolerance at all; times are compared with --time-tolerance (a fraction of
+the baseline value) and can be left out with --ops-only on noisy machines.
+Exits with 1 if something regressed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections import namedtuple, OrderedDict
+from fnmatch import fnmatchcase
+
+from anoncreds.bench.phases import SweepPoint, PRIMARY, REVOCATION, \
+    runFlow, measure, environment, _Timings
+from anoncreds.protocol.op_counter import countOps
+
+SUITE = [SweepPoint(PRIMARY, 4, 1, 1, None),
+         SweepPoint(REVOCATION, 4, 1, 1, 5)]
+
+SECONDS = 'seconds'
+
+OK = 'ok'
+REGRESSED = 'REGRESSED'
+IMPROVED = 'improved'
+NEW = 'new'
+MISSING = 'missing'
+
+Comparison = namedtuple('Comparison',
+                        'metric, baseline, current, change, tolerance, status')
+
+
+class _OpCounts(_Timings):
+    """
+    Counts the operations of every phase instead of timing it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.ops = OrderedDict()
+
+    async def timed(self, phase, coro):
+        with countOps() as ops:
+            res = await coro
+        self.ops[phase] = ops
+        return res
+
+
+def pointName(point: SweepPoint):
+    name = '{}-a{}p{}c{}'.format(point.flow, point.attrs, point.predicates,
+                                 point.claims)
+    return name if point.L is None else '{}L{}'.format(name, point.L)
+
+
+async def runSuite(repeat, points=SUITE, times=True):
+    """
+    :return: metrics named '<point>.<phase>.<op>' (operation counts) and
+    '<point>.<phase>.seconds' (median time)
+    """
+    metrics = OrderedDict()
+    for point in points:
+        name = pointName(point)
+        counts = _OpCounts()
+        await runFlow(point, counts)
+        for phase, ops in counts.ops.items():
+            for op, n in sorted(ops.items()):
+                metrics['{}.{}.{}'.format(name, phase, op)] = n
+        if times:
+            res = await measure(point, repeat)
+            for phase, summary in res['phases'].items():
+                metrics['{}.{}.{}'.format(name, phase, SECONDS)] = \
+                    summary['p50']
+    return metrics
+
+
+def toleranceFor(metric, tolerances, timeTolerance, opsTolerance):
+    """
+    The tolerance of the last matching pattern, or the default one of the
+    metric's kind.
+    """
+    tolerance = timeTolerance if metric.endswith('.' + SECONDS) \
+        else opsTolerance
+    for pattern, value in tolerances:
+        if fnmatchcase(metric, pattern):
+            tolerance = value
+    return tolerance
+
+
+def compareMetrics(baseline, current, tolerances=(), timeTolerance=0.25,
+                   opsTolerance=0.0):
+    """
+    Compares every metric of the baseline and the current run. A metric
+    regressed if it grew by more than its tolerance (a fraction of the
+    baseline value).
+
+    :param tolerances: (pattern, tolerance) pairs overriding the defaults
+    for the metrics matching the fnmatch pattern
+    :return: a list of Comparisons
+    """
+    res = []
+    for metric in sorted(set(baseline) | set(current)):
+        old = baseline.get(metric)
+        new = current.get(metric)
+        tolerance = toleranceFor(metric, tolerances, timeTolerance,
+                                 opsTolerance)
+        if old is None:
+            res.append(Comparison(metric, None, new, None, tolerance, NEW))
+            continue
+        if new is None:
+            res.append(Comparison(metric, old, None, None, tolerance, MISSING))
+            continue
+        change = (new - old) / old if old else (0.0 if new == old else
+                                                float('inf'))
+        if change > tolerance:
+            status = REGRESSED
+        elif change < -tolerance or (change < 0 and not tolerance):
+            status = IMPROVED
+        else:
+            status = OK
+        res.append(Comparison(metric, old, new, change, tolerance, status))
+    return res
+
+
+def formatTable(comparisons):
+    def fmt(value):
+        if value is None:
+            return '-'
+        if isinstance(value, float):
+            return '{:.4g}'.format(value)
+        return str(value)
+
+    rows = [('metric', 'baseline', 'current', 'change', 'tolerance',
+             'status')]
+    for c in comparisons:
+        rows.append((c.metric, fmt(c.baseline), fmt(c.current),
+                     '-' if c.change is None else '{:+.1%}'.format(c.change),
+                     '{:.0%}'.format(c.tolerance), c.status))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ['  '.join(v.ljust(w) if i == 0 else v.rjust(w)
+                       for i, (v, w) in enumerate(zip(row, widths)))
+             for row in rows]
+    lines.insert(1, '  '.join('-' * w for w in widths))
+    return '\n'.join(lines)
+
+
+def _tolerance(value):
+    pattern, sep, fraction = value.rpartition('=')
+    if not sep or not pattern:
+        raise argparse.ArgumentTypeError(
+            'expected PATTERN=FRACTION, got {}'.format(value))
+    return pattern, float(fraction)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m anoncreds.bench compare',
+        description=__doc__.splitlines()[1])
+    parser.add_argument('--baseline', required=True,
+                        help='baseline JSON file')
+    parser.add_argument('--update', action='store_true',
+                        help='write the current metrics as the baseline '
+                             'instead of comparing')
+    parser.add_argument('--current',
+                        help='compare metrics from this file instead of '
+                             'running the suite')
+    parser.add_argument('--output', help='also write the current metrics '
+                                         'to this file')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--ops-only', action='store_true',
+                        help="don't time the phases")
+    parser.add_argument('--time-tolerance', type=float, default=0.25)
+    parser.add_argument('--ops-tolerance', type=float, default=0.0)
+    parser.add_argument('--tolerance', type=_tolerance, action='append',
+                        default=[], metavar='PATTERN=FRACTION',
+                        help='tolerance for the metrics matching the '
+                             'pattern, e.g. "*.verify.seconds=0.5"')
+    parser.add_argument('--all', action='store_true',
+                        help='list unchanged metrics too')
+    args = parser.parse_args(args)
+
+    if args.current:
+        with open(args.current) as f:
+            metrics = json.load(f)['metrics']
+    else:
+        loop = asyncio.get_event_loop()
+        metrics = loop.run_until_complete(
+            runSuite(args.repeat, times=not args.ops_only))
+    report = OrderedDict([('environment', environment()),
+                          ('repeat', args.repeat),
+                          ('metrics', metrics)])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('wrote {} metrics to {}'.format(len(metrics), args.baseline))
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['metrics']
+    if args.ops_only:
+        baseline = {metric: value for metric, value in baseline.items()
+                    if not metric.endswith('.' + SECONDS)}
+    comparisons = compareMetrics(baseline, metrics, args.tolerance,
+                                 args.time_tolerance, args.ops_tolerance)
+    regressed = [c for c in comparisons if c.status == REGRESSED]
+    shown = comparisons if args.all else \
+        [c for c in comparisons if c.status != OK]
+    if shown:
+        print(formatTable(shown))
+    print('{} metrics compared, {} regressed'.format(len(comparisons),
+                                                     len(regressed)))
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
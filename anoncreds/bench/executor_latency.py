@@ -0,0 +1,86 @@
+"""
+Measures verification latency and event-loop responsiveness under
+concurrent load for each CryptoExecutor mode.
+
+    python -m anoncreds.bench.executor_latency --requests 40 --concurrency 8
+"""
+import argparse
+import asyncio
+import time
+
+from anoncreds.bench.fixtures import setupGvt, gvtProofRequest
+from anoncreds.protocol.executor import CryptoExecutor, INLINE, THREAD, \
+    PROCESS
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def measure(mode, requests, concurrency, workers):
+    executor = CryptoExecutor(mode, maxWorkers=workers)
+    try:
+        _, prover, verifier, _ = await setupGvt(executor)
+        proofRequest = gvtProofRequest(verifier)
+        proof = await prover.presentProof(proofRequest)
+
+        # a ticker standing in for the other requests a service handles
+        lags = []
+        stop = asyncio.Event()
+
+        async def ticker(interval=0.005):
+            while not stop.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(interval)
+                lags.append(time.perf_counter() - start - interval)
+
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def verifyOne():
+            async with semaphore:
+                start = time.perf_counter()
+                assert await verifier.verify(proofRequest, proof)
+                latencies.append(time.perf_counter() - start)
+
+        tickerTask = asyncio.ensure_future(ticker())
+        start = time.perf_counter()
+        await asyncio.gather(*[verifyOne() for _ in range(requests)])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await tickerTask
+    finally:
+        executor.shutdown()
+
+    return {
+        'mode': mode,
+        'throughput': requests / elapsed,
+        'latencyP50': percentile(latencies, 50),
+        'latencyP95': percentile(latencies, 95),
+        'loopLagP99': percentile(lags, 99) if lags else 0,
+        'loopLagMax': max(lags) if lags else 0,
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--modes', nargs='+',
+                        default=[INLINE, THREAD, PROCESS])
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(args)
+
+    loop = asyncio.get_event_loop()
+    for mode in args.modes:
+        res = loop.run_until_complete(
+            measure(mode, args.requests, args.concurrency, args.workers))
+        print('{mode:8} {throughput:7.1f} req/s  '
+              'latency p50 {latencyP50:.3f}s p95 {latencyP95:.3f}s  '
+              'loop lag p99 {loopLagP99:.3f}s max {loopLagMax:.3f}s'
+              .format(**res))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+from anoncreds.protocol.executor import CryptoExecutor
+from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.prover import Prover
+from anoncreds.protocol.repo.attributes_repo import AttributeRepoInMemory
+from anoncreds.protocol.repo.public_repo import PublicRepoInMemory
+from anoncreds.protocol.types import ID, ProofRequest, AttributeInfo, \
+    PredicateGE, AttribDef, AttribType
+from anoncreds.protocol.verifier import Verifier
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
+from anoncreds.protocol.wallet.prover_wallet import ProverWalletInMemory
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+from config.config import cmod
+
+# safe primes for the keys, so that they needn't be generated
+primes = {
+    "prime1":
+        (cmod.integer(
+            157329491389375793912190594961134932804032426403110797476730107804356484516061051345332763141806005838436304922612495876180233509449197495032194146432047460167589034147716097417880503952139805241591622353828629383332869425029086898452227895418829799945650973848983901459733426212735979668835984691928193677469),
+         cmod.integer(
+             151323892648373196579515752826519683836764873607632072057591837216698622729557534035138587276594156320800768525825023728398410073692081011811496168877166664537052088207068061172594879398773872352920912390983199416927388688319207946493810449203702100559271439586753256728900713990097168484829574000438573295723))
+    , "prime2":
+        (cmod.integer(
+            150619677884468353208058156632953891431975271416620955614548039937246769610622017033385394658879484186852231469238992217246264205570458379437126692055331206248530723117202131739966737760399755490935589223401123762051823602343810554978803032803606907761937587101969193241921351011430750970746500680609001799529),
+         cmod.integer(
+             171590857568436644992359347719703764048501078398666061921719064395827496970696879481740311141148273607392657321103691543916274965279072000206208571551864201305434022165176563363954921183576230072812635744629337290242954699427160362586102068962285076213200828451838142959637006048439307273563604553818326766703))
+}
+
+GVT = AttribDef('gvt',
+                [AttribType('name', encode=True),
+                 AttribType('age', encode=False),
+                 AttribType('height', encode=False),
+                 AttribType('sex', encode=True)])
+XYZCorp = AttribDef('xyz',
+                    [AttribType('status', encode=True),
+                     AttribType('period', encode=False)])
+
+
+async def setupGvt(executor: CryptoExecutor = None, publicRepo=None,
+                   version='1.0'):
+    """
+    Creates an issuer, a prover holding a GVT claim (with revocation)
+    and a verifier, all sharing one public repo. Give every setup on the
+    same repo another schema version.
+
+    :return: (issuer, prover, verifier, schemaId)
+    """
+    publicRepo = publicRepo or PublicRepoInMemory()
+    attrRepo = AttributeRepoInMemory()
+    issuer = Issuer(IssuerWalletInMemory('issuer1', publicRepo), attrRepo,
+                    executor)
+    prover = Prover(ProverWalletInMemory('prover1', publicRepo), executor)
+    verifier = Verifier(WalletInMemory('verifier1', publicRepo), executor)
+
+    pPrime, qPrime = primes['prime1']
+    schema = await issuer.genSchema('GVT', version, GVT.attribNames())
+    schemaId = ID(schema.getKey())
+    await issuer.genKeys(schemaId, p_prime=pPrime, q_prime=qPrime)
+    await issuer.issueAccumulator(schemaId=schemaId, iA=100, L=5)
+    attrRepo.addAttributes(schema.getKey(), prover.proverId,
+                           GVT.attribs(name='Alex', age=28, height=175,
+                                       sex='male'))
+
+    claimsReq = await prover.createClaimRequest(schemaId)
+    signature, claims = await issuer.issueClaim(schemaId, claimsReq)
+    await prover.processClaim(schemaId, claims, signature)
+    return issuer, prover, verifier, schemaId
+
+
+def gvtProofRequest(verifier: Verifier) -> ProofRequest:
+    return ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                        verifiableAttributes={
+                            'uuid': AttributeInfo(name='name')},
+                        predicates={'predicate_uuid': PredicateGE('age', 18)})
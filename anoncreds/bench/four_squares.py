@@ -0,0 +1,79 @@
+"""
+Times fourSquares over deltas of the given sizes, and counts how many of
+them the greedy decomposition (largest square first, as it used to be
+done) fails on.
+
+    python -m anoncreds.bench four_squares --bits 8 16 64 256 --count 200
+
+Deltas of encoded attributes are up to 256 bits.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from collections import OrderedDict
+
+from anoncreds.bench.executor_latency import percentile
+from anoncreds.protocol.utils import fourSquares, largestSquareLessThan
+
+
+def greedyFourSquares(delta):
+    """
+    The squares taken largest first, or None if they don't sum to delta.
+    """
+    u = []
+    for _ in range(4):
+        u.append(largestSquareLessThan(delta - sum(x * x for x in u)))
+    return u if sum(x * x for x in u) == delta else None
+
+
+def measure(bits, count, rnd):
+    times = []
+    greedyFailures = 0
+    for _ in range(count):
+        delta = rnd.getrandbits(bits) | (1 << (bits - 1))
+        start = time.perf_counter()
+        u = fourSquares(delta)
+        times.append(time.perf_counter() - start)
+        assert sum(x * x for x in u.values()) == delta
+        if greedyFourSquares(delta) is None:
+            greedyFailures += 1
+    return OrderedDict([
+        ('bits', bits),
+        ('count', count),
+        ('p50', percentile(times, 50)),
+        ('p90', percentile(times, 90)),
+        ('max', max(times)),
+        ('greedyFailures', greedyFailures / count),
+    ])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m anoncreds.bench four_squares',
+        description=__doc__.splitlines()[1])
+    parser.add_argument('--bits', type=int, nargs='+',
+                        default=[4, 8, 16, 32, 64, 128, 256, 512])
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+    args = parser.parse_args(args)
+
+    rnd = random.Random(args.seed)
+    results = [measure(bits, args.count, rnd) for bits in args.bits]
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return
+    print('{:>6}  {:>10}  {:>10}  {:>10}  {:>15}'.format(
+        'bits', 'p50 (ms)', 'p90 (ms)', 'max (ms)', 'greedy failed'))
+    for res in results:
+        print('{:>6}  {:>10.3f}  {:>10.3f}  {:>10.3f}  {:>15.1%}'.format(
+            res['bits'], res['p50'] * 1000, res['p90'] * 1000,
+            res['max'] * 1000, res['greedyFailures']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Times every protocol phase (genKeys, issueAccumulator, issueClaim,
+processClaim, presentProof, verify) over a sweep of attributes per
+schema, predicates, claims per proof and accumulator sizes, for both
+primary-only and revocation flows. Writes JSON with percentiles.
+
+    python -m anoncreds.bench.phases --attrs 4 16 --predicates 0 2 \\
+        --claims 1 2 --L 5 100 --repeat 5 --output phases.json
+
+genKeys is timed with the fixed test primes, i.e. without the safe prime
+generation that dominates it otherwise.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from collections import namedtuple, OrderedDict
+
+from anoncreds.bench.executor_latency import percentile
+from anoncreds.bench.fixtures import primes
+from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.prover import Prover
+from anoncreds.protocol.repo.attributes_repo import AttributeRepoInMemory
+from anoncreds.protocol.repo.public_repo import PublicRepoInMemory
+from anoncreds.protocol.types import AttribDef, AttribType, ID, \
+    ProofRequest, AttributeInfo, PredicateGE
+from anoncreds.protocol.verifier import Verifier
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
+from anoncreds.protocol.wallet.prover_wallet import ProverWalletInMemory
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+
+PRIMARY = 'primary'
+REVOCATION = 'revocation'
+
+PHASES = ['genKeys', 'issueAccumulator', 'issueClaim', 'processClaim',
+          'presentProof', 'verify']
+
+SweepPoint = namedtuple('SweepPoint', 'flow, attrs, predicates, claims, L')
+
+FlowResult = namedtuple('FlowResult',
+                        'publicRepo, schemaIds, proofRequest, proof')
+
+
+def sweepPoints(flows, attrs, predicates, claims, Ls):
+    """
+    All combinations of the parameters. The accumulator size only matters
+    for the revocation flow, and predicates need attributes that are not
+    revealed (one per claim is).
+    """
+    points = []
+    for flow, a, p, c in itertools.product(flows, attrs, predicates, claims):
+        if p > a - 1:
+            continue
+        for L in (Ls if flow == REVOCATION else [None]):
+            points.append(SweepPoint(flow, a, p, c, L))
+    return points
+
+
+def summarize(values):
+    return OrderedDict([
+        ('n', len(values)),
+        ('mean', sum(values) / len(values)),
+        ('min', min(values)),
+        ('p50', percentile(values, 50)),
+        ('p90', percentile(values, 90)),
+        ('p99', percentile(values, 99)),
+        ('max', max(values)),
+    ])
+
+
+class _Timings:
+    def __init__(self):
+        self.values = {phase: [] for phase in PHASES}
+
+    async def timed(self, phase, coro):
+        start = time.perf_counter()
+        res = await coro
+        self.values[phase].append(time.perf_counter() - start)
+        return res
+
+
+async def runFlow(point: SweepPoint, timings: _Timings):
+    """
+    Runs all the phases once, from key generation to verification.
+
+    :return: the public repo, the IDs of the schemas, and the verified
+    proof with its request
+    """
+    revocation = point.flow == REVOCATION
+    publicRepo = PublicRepoInMemory()
+    attrRepo = AttributeRepoInMemory()
+    issuer = Issuer(IssuerWalletInMemory('issuer1', publicRepo), attrRepo)
+    prover = Prover(ProverWalletInMemory('prover1', publicRepo))
+    verifier = Verifier(WalletInMemory('verifier1', publicRepo))
+    pPrime, qPrime = primes['prime1']
+
+    verifiableAttributes = {}
+    predicates = {}
+    schemaIds = []
+    for c in range(point.claims):
+        attrDef = AttribDef('schema{}'.format(c),
+                            [AttribType('s{}_attr{}'.format(c, i),
+                                        encode=False)
+                             for i in range(point.attrs)])
+        schema = await issuer.genSchema(attrDef.name, '1.0',
+                                        attrDef.attribNames())
+        schemaId = ID(schema.getKey())
+        schemaIds.append(schemaId)
+        await timings.timed('genKeys', issuer.genKeys(
+            schemaId, p_prime=pPrime, q_prime=qPrime))
+        if revocation:
+            await timings.timed('issueAccumulator', issuer.issueAccumulator(
+                schemaId=schemaId, iA=100 + c, L=point.L))
+        attrRepo.addAttributes(schema.getKey(), prover.proverId,
+                               attrDef.attribs(**{name: 20 + i for i, name in
+                                                  enumerate(
+                                                      attrDef.attribNames())}))
+
+        claimsReq = await prover.createClaimRequest(schemaId,
+                                                    reqNonRevoc=revocation)
+        signature, claims = await timings.timed(
+            'issueClaim', issuer.issueClaim(schemaId, claimsReq))
+        await timings.timed('processClaim',
+                            prover.processClaim(schemaId, claims, signature))
+
+        verifiableAttributes['uuid{}'.format(c)] = \
+            AttributeInfo(name='s{}_attr0'.format(c))
+        # predicates go to the claims in turn
+        for p in range(c, point.predicates, point.claims):
+            predicates['predicate_uuid{}'.format(p)] = PredicateGE(
+                's{}_attr{}'.format(c, 1 + p // point.claims), 18)
+
+    proofRequest = ProofRequest('proof1', '1.0', verifier.generateNonce(),
+                                verifiableAttributes=verifiableAttributes,
+                                predicates=predicates)
+    proof = await timings.timed('presentProof',
+                                prover.presentProof(proofRequest))
+    assert await timings.timed('verify', verifier.verify(proofRequest, proof))
+    return FlowResult(publicRepo, schemaIds, proofRequest, proof)
+
+
+async def measure(point: SweepPoint, repeat):
+    timings = _Timings()
+    for _ in range(repeat):
+        await runFlow(point, timings)
+    res = OrderedDict(point._asdict())
+    res['phases'] = OrderedDict((phase, summarize(values))
+                                for phase, values in timings.values.items()
+                                if values)
+    return res
+
+
+def environment():
+    return OrderedDict([
+        ('python', sys.version.split()[0]),
+        ('platform', platform.platform()),
+        ('machine', platform.machine()),
+        ('cpus', os.cpu_count()),
+        ('time', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+    ])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--flows', nargs='+', choices=[PRIMARY, REVOCATION],
+                        default=[PRIMARY, REVOCATION])
+    parser.add_argument('--attrs', type=int, nargs='+', default=[4])
+    parser.add_argument('--predicates', type=int, nargs='+', default=[0, 1])
+    parser.add_argument('--claims', type=int, nargs='+', default=[1])
+    parser.add_argument('--L', type=int, nargs='+', default=[5])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='file to write (stdout if omitted)')
+    args = parser.parse_args(args)
+
+    loop = asyncio.get_event_loop()
+    results = []
+    for point in sweepPoints(args.flows, args.attrs, args.predicates,
+                             args.claims, args.L):
+        results.append(loop.run_until_complete(measure(point, args.repeat)))
+        print('done {}'.format(point), file=sys.stderr)
+
+    report = OrderedDict([('environment', environment()),
+                          ('repeat', args.repeat),
+                          ('results', results)])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
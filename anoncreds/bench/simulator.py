@@ -0,0 +1,327 @@
+"""
+Simulates a workload of several issuers, provers and verifiers sharing a
+public repo: a mix of claim issuance, proof presentation, revocation and
+verification run with the given concurrency. Reports throughput, latency
+percentiles and the public repo calls per operation.
+
+    python -m anoncreds.bench.simulator --issuers 2 --provers 10 \\
+        --verifiers 2 --ops 200 --concurrency 8 \\
+        --mix issue=1 proof=4 revoke=1 verify=4 --repo sqlite
+
+Every prover starts with a claim from every issuer. A revoked claim is
+not used for proofs until the prover is issued a new one.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import namedtuple, OrderedDict, Counter, defaultdict
+from contextvars import ContextVar
+
+from anoncreds.bench.executor_latency import percentile
+from anoncreds.bench.fixtures import GVT, primes
+from anoncreds.protocol.executor import CryptoExecutor, INLINE, THREAD, \
+    PROCESS
+from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.prover import Prover
+from anoncreds.protocol.repo.attributes_repo import AttributeRepoInMemory
+from anoncreds.protocol.repo.public_repo import PublicRepo, \
+    PublicRepoInMemory, PublicRepoSqlite
+from anoncreds.protocol.types import ID, ProofRequest, AttributeInfo, \
+    PredicateGE
+from anoncreds.protocol.verifier import Verifier
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
+from anoncreds.protocol.wallet.prover_wallet import ProverWalletInMemory
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+
+ISSUE = 'issue'
+PROOF = 'proof'
+REVOKE = 'revoke'
+VERIFY = 'verify'
+OPERATIONS = [ISSUE, PROOF, REVOKE, VERIFY]
+
+MEMORY = 'memory'
+SQLITE = 'sqlite'
+
+DEFAULT_MIX = OrderedDict([(ISSUE, 1), (PROOF, 4), (REVOKE, 1), (VERIFY, 4)])
+
+REPO_METHODS = ['getSchema', 'getPublicKey', 'getPublicKeyRevocation',
+                'getPublicKeyAccumulator', 'getAccumulator', 'getTails',
+                'getSchemas', 'getPublicKeys', 'getPublicKeysRevocation',
+                'getPublicKeysAccumulator', 'getAccumulators',
+                'submitSchema', 'submitPublicKeys', 'submitAccumulator',
+                'submitAccumUpdate']
+
+Workload = namedtuple('Workload', 'issuers, provers, verifiers, ops, '
+                                  'concurrency, mix, repo, L, seed')
+
+_currentOp = ContextVar('currentOp', default=None)
+
+
+class CountingPublicRepo(PublicRepo):
+    """
+    Counts the calls to a public repo per simulated operation ('setup'
+    outside of them).
+    """
+
+    def __init__(self, repo: PublicRepo):
+        self.calls = defaultdict(Counter)
+        for name in REPO_METHODS:
+            setattr(self, name, self._counting(name, getattr(repo, name)))
+
+    def _counting(self, name, method):
+        async def call(*args, **kwargs):
+            self.calls[_currentOp.get() or 'setup'][name] += 1
+            return await method(*args, **kwargs)
+
+        return call
+
+
+class Simulation:
+    def __init__(self, workload: Workload, executor: CryptoExecutor = None):
+        self.workload = workload
+        self._executor = executor
+        self._random = random.Random(workload.seed)
+        backend = PublicRepoSqlite() if workload.repo == SQLITE \
+            else PublicRepoInMemory()
+        self.repo = CountingPublicRepo(backend)
+        self._backend = backend
+        self._attrRepo = AttributeRepoInMemory()
+        self.issuers = []
+        self.provers = []
+        self.verifiers = []
+        # (issuer index, prover index) -> index of the valid claim
+        self._claims = {}
+        self._proverLocks = []
+        self._proofs = []
+        self.latencies = {op: [] for op in OPERATIONS}
+        self.outcomes = {op: Counter() for op in OPERATIONS}
+
+    async def setUp(self):
+        w = self.workload
+        for i in range(w.issuers):
+            issuer = Issuer(IssuerWalletInMemory('issuer{}'.format(i),
+                                                 self.repo),
+                            self._attrRepo, self._executor)
+            schema = await issuer.genSchema('GVT', '1.0', GVT.attribNames())
+            pPrime, qPrime = primes['prime1' if i % 2 == 0 else 'prime2']
+            await issuer.genKeys(ID(schema.getKey()), p_prime=pPrime,
+                                 q_prime=qPrime)
+            await issuer.issueAccumulator(ID(schema.getKey()), iA=100 + i,
+                                          L=w.L)
+            self.issuers.append((issuer, schema))
+        for p in range(w.provers):
+            self.provers.append(Prover(
+                ProverWalletInMemory('prover{}'.format(p), self.repo),
+                self._executor))
+            self._proverLocks.append(asyncio.Lock())
+            for i, (_, schema) in enumerate(self.issuers):
+                self._attrRepo.addAttributes(
+                    schema.getKey(), 'prover{}'.format(p),
+                    GVT.attribs(name='prover{}'.format(p), age=18 + p % 50,
+                                height=150 + p % 50, sex='female'))
+                await self._issue(i, p)
+        for v in range(w.verifiers):
+            self.verifiers.append(Verifier(
+                WalletInMemory('verifier{}'.format(v), self.repo),
+                self._executor))
+
+    def close(self):
+        if isinstance(self._backend, PublicRepoSqlite):
+            self._backend.close()
+
+    async def run(self):
+        """
+        Runs the operations and returns the elapsed time.
+        """
+        w = self.workload
+        ops, weights = zip(*w.mix.items())
+        queue = self._random.choices(ops, weights, k=w.ops)
+        queue.reverse()
+
+        async def worker():
+            while queue:
+                await self._runOp(queue.pop())
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(w.concurrency)])
+        return time.perf_counter() - start
+
+    async def _runOp(self, op):
+        token = _currentOp.set(op)
+        start = time.perf_counter()
+        try:
+            outcome = await getattr(self, '_' + op)()
+        except Exception as ex:
+            outcome = type(ex).__name__
+        finally:
+            _currentOp.reset(token)
+        self.latencies[op].append(time.perf_counter() - start)
+        self.outcomes[op][outcome] += 1
+
+    async def _issue(self, i=None, p=None):
+        if i is None:
+            # prefer the claims that are missing or revoked
+            missing = [(i, p) for i in range(len(self.issuers))
+                       for p in range(len(self.provers))
+                       if (i, p) not in self._claims]
+            i, p = self._random.choice(missing) if missing else (
+                self._random.randrange(len(self.issuers)),
+                self._random.randrange(len(self.provers)))
+        issuer, schema = self.issuers[i]
+        prover = self.provers[p]
+        schemaId = ID(schema.getKey())
+        async with self._proverLocks[p]:
+            claimsReq = await prover.createClaimRequest(schemaId)
+            signature, claims = await issuer.issueClaim(schemaId, claimsReq)
+            await prover.processClaim(schemaId, claims, signature)
+            self._claims[(i, p)] = signature.nonRevocClaim.i
+        return 'issued'
+
+    async def _proof(self):
+        if not self._claims:
+            return 'no claims'
+        i, p = self._random.choice(sorted(self._claims))
+        _, schema = self.issuers[i]
+        verifier = self._random.choice(self.verifiers)
+        proofRequest = ProofRequest(
+            'proof1', '1.0', verifier.generateNonce(),
+            verifiableAttributes={
+                'uuid': AttributeInfo(name='name',
+                                      schema_seq_no=schema.seqId)},
+            predicates={'predicate_uuid': PredicateGE(
+                'age', 18, schema_seq_no=schema.seqId)})
+        async with self._proverLocks[p]:
+            if (i, p) not in self._claims:
+                return 'revoked meanwhile'
+            proof = await self.provers[p].presentProof(proofRequest)
+        self._proofs.append((verifier, proofRequest, proof))
+        return 'presented'
+
+    async def _revoke(self):
+        if not self._claims:
+            return 'no claims'
+        i, p = self._random.choice(sorted(self._claims))
+        issuer, schema = self.issuers[i]
+        async with self._proverLocks[p]:
+            if (i, p) not in self._claims:
+                return 'revoked meanwhile'
+            claimIndex = self._claims.pop((i, p))
+        await issuer.revoke(ID(schema.getKey()), claimIndex)
+        return 'revoked'
+
+    async def _verify(self):
+        if not self._proofs:
+            return 'no proofs'
+        verifier, proofRequest, proof = self._proofs.pop(
+            self._random.randrange(len(self._proofs)))
+        # a proof made before a revocation doesn't verify any more
+        return 'verified' if await verifier.verify(proofRequest, proof) \
+            else 'rejected'
+
+    def report(self, elapsed):
+        operations = OrderedDict()
+        for op in OPERATIONS:
+            values = self.latencies[op]
+            if not values:
+                continue
+            operations[op] = OrderedDict([
+                ('count', len(values)),
+                ('throughput', len(values) / elapsed),
+                ('p50', percentile(values, 50)),
+                ('p95', percentile(values, 95)),
+                ('p99', percentile(values, 99)),
+                ('outcomes', dict(self.outcomes[op])),
+                ('repoCalls', dict(self.repo.calls.get(op, {}))),
+            ])
+        return OrderedDict([
+            ('workload', OrderedDict(self.workload._asdict())),
+            ('elapsed', elapsed),
+            ('throughput', sum(len(v) for v in self.latencies.values()) /
+             elapsed),
+            ('operations', operations),
+            ('setupRepoCalls', dict(self.repo.calls.get('setup', {}))),
+        ])
+
+
+async def simulate(workload: Workload, executor: CryptoExecutor = None):
+    """
+    Sets up the parties and runs the workload.
+
+    :return: the report
+    """
+    simulation = Simulation(workload, executor)
+    try:
+        await simulation.setUp()
+        elapsed = await simulation.run()
+        return simulation.report(elapsed)
+    finally:
+        simulation.close()
+
+
+def formatReport(report):
+    lines = ['{:7} {:>6} {:>8} {:>8} {:>8} {:>8} {:>10}  {}'.format(
+        'op', 'count', 'ops/s', 'p50', 'p95', 'p99', 'repo/op', 'outcomes')]
+    for op, res in report['operations'].items():
+        lines.append(
+            '{:7} {:6} {:8.1f} {:8.3f} {:8.3f} {:8.3f} {:10.1f}  {}'.format(
+                op, res['count'], res['throughput'], res['p50'], res['p95'],
+                res['p99'], sum(res['repoCalls'].values()) / res['count'],
+                ', '.join('{} {}'.format(n, outcome) for outcome, n in
+                          sorted(res['outcomes'].items()))))
+    lines.append('{:.1f} ops/s in {:.2f}s'.format(report['throughput'],
+                                                  report['elapsed']))
+    return '\n'.join(lines)
+
+
+def _mixEntry(value):
+    op, sep, weight = value.partition('=')
+    if op not in OPERATIONS or not sep:
+        raise argparse.ArgumentTypeError(
+            'expected one of {} with a weight, e.g. proof=4'.format(
+                ', '.join(OPERATIONS)))
+    return op, float(weight)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--issuers', type=int, default=2)
+    parser.add_argument('--provers', type=int, default=4)
+    parser.add_argument('--verifiers', type=int, default=2)
+    parser.add_argument('--ops', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--mix', type=_mixEntry, nargs='+',
+                        default=list(DEFAULT_MIX.items()),
+                        metavar='OP=WEIGHT')
+    parser.add_argument('--repo', choices=[MEMORY, SQLITE], default=MEMORY)
+    parser.add_argument('--L', type=int, default=None,
+                        help='accumulator size (enough for all issuances '
+                             'if omitted)')
+    parser.add_argument('--executor', choices=[INLINE, THREAD, PROCESS],
+                        default=INLINE)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    args = parser.parse_args(args)
+
+    workload = Workload(args.issuers, args.provers, args.verifiers,
+                        args.ops, args.concurrency, OrderedDict(args.mix),
+                        args.repo, args.L or args.provers + args.ops,
+                        args.seed)
+    executor = CryptoExecutor(args.executor)
+    loop = asyncio.get_event_loop()
+    try:
+        report = loop.run_until_complete(simulate(workload, executor))
+    finally:
+        executor.shutdown()
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(formatReport(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Measures VerifierPool throughput for a growing number of worker processes.
+
+    python -m anoncreds.bench.verifier_pool --workers 1 2 4 --requests 40 \\
+        --schemas 4
+
+The proofs are drawn in turn from claims of several schemas, so that they
+are routed to different workers, as they are in production. The speedup is
+the throughput relative to the first worker count; it can't grow beyond
+the number of cores.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from anoncreds.bench.executor_latency import percentile
+from anoncreds.bench.fixtures import setupGvt, gvtProofRequest
+from anoncreds.protocol.repo.public_repo import PublicRepoInMemory
+from anoncreds.protocol.verifier_pool import VerifierPool
+
+
+async def makeProofs(schemas):
+    """
+    :return: the verifier's wallet and a (proofRequest, proof) pair for
+    every schema
+    """
+    publicRepo = PublicRepoInMemory()
+    proofs = []
+    verifier = None
+    for i in range(schemas):
+        _, prover, verifier, _ = await setupGvt(
+            publicRepo=publicRepo, version='1.{}'.format(i))
+        proofRequest = gvtProofRequest(verifier)
+        proofs.append((proofRequest,
+                       await prover.presentProof(proofRequest)))
+    return verifier.wallet, proofs
+
+
+async def measure(wallet, proofs, workers, requests, concurrency,
+                  maxPending):
+    pool = VerifierPool(wallet, workers=workers, maxPending=maxPending)
+    try:
+        # warm up, so that the keys are already in the workers
+        for proofRequest, proof in proofs:
+            assert await pool.verify(proofRequest, proof)
+
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def verifyOne(proofRequest, proof):
+            async with semaphore:
+                start = time.perf_counter()
+                assert await pool.verify(proofRequest, proof)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[verifyOne(*proofs[i % len(proofs)])
+                               for i in range(requests)])
+        elapsed = time.perf_counter() - start
+        metrics = pool.metrics
+    finally:
+        pool.shutdown()
+
+    return {
+        'workers': workers,
+        'throughput': requests / elapsed,
+        'latencyP50': percentile(latencies, 50),
+        'latencyP95': percentile(latencies, 95),
+        'keyShipments': sum(m.keyShipments for m in metrics),
+        'spilled': sum(m.spilled for m in metrics),
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--max-pending', type=int, default=2,
+                        help='verifications run by a worker at a time')
+    parser.add_argument('--schemas', type=int, default=4,
+                        help='number of schemas the proofs are drawn from')
+    args = parser.parse_args(args)
+
+    loop = asyncio.get_event_loop()
+    wallet, proofs = loop.run_until_complete(makeProofs(args.schemas))
+    print('{} cores'.format(os.cpu_count()))
+    base = None
+    for workers in args.workers:
+        res = loop.run_until_complete(
+            measure(wallet, proofs, workers, args.requests, args.concurrency,
+                    args.max_pending))
+        base = base or res['throughput']
+        print('{workers:3} workers {throughput:7.1f} req/s '
+              '(x{speedup:.2f})  latency p50 {latencyP50:.3f}s '
+              'p95 {latencyP95:.3f}s  key shipments {keyShipments}  '
+              'spilled {spilled}'.format(speedup=res['throughput'] / base,
+                                         **res))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict, namedtuple
+
+CacheStats = namedtuple('CacheStats',
+                        'hits, misses, evictions, expirations, coalesced, size')
+
+
+class LRUCache:
+    """
+    A bounded least-recently-used cache with an optional time-to-live
+    for its entries.
+    """
+
+    def __init__(self, maxSize: int, ttl=None, timer=time.monotonic):
+        if maxSize < 1:
+            raise ValueError('maxSize must be positive')
+        self.maxSize = maxSize
+        self.ttl = ttl
+        self._timer = timer
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    def get(self, key):
+        """
+        Looks up a key.
+
+        :param key: cache key
+        :return: a (found, value) pair
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        value, expiresAt = entry
+        if expiresAt is not None and self._timer() >= expiresAt:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def put(self, key, value):
+        expiresAt = self._timer() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, expiresAt)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions,
+                          self.expirations, self.coalesced, len(self))
@@ -0,0 +1,65 @@
+from collections.abc import KeysView, ValuesView
+
+from anoncreds.protocol.utils import serializeToStr, deserializeFromStr, \
+    isCryptoInteger, isGroupElement
+
+
+class Packed:
+    """
+    A crypto integer or group element in its serialized form.
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def __getstate__(self):
+        return self.value
+
+    def __setstate__(self, state):
+        self.value = state
+
+
+def pack(obj):
+    """
+    Makes a protocol value picklable, so it can be sent to another process.
+
+    Crypto integers and group elements are serialized; namedtuples,
+    dicts, lists, sets and plain objects (e.g. Accumulator) keep their
+    types. Dict views become lists.
+    """
+    if isCryptoInteger(obj) or isGroupElement(obj):
+        return Packed(serializeToStr(obj))
+    if isinstance(obj, tuple) and hasattr(obj, '_fields'):
+        return type(obj)._make(pack(v) for v in obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        return type(obj)(pack(v) for v in obj)
+    if isinstance(obj, (KeysView, ValuesView)):
+        return [pack(v) for v in obj]
+    if isinstance(obj, dict):
+        return type(obj)((pack(k), pack(v)) for k, v in obj.items())
+    if hasattr(obj, '__dict__') and not callable(obj):
+        packed = object.__new__(type(obj))
+        packed.__dict__.update(pack(vars(obj)))
+        return packed
+    return obj
+
+
+def unpack(obj):
+    """
+    Reverses pack.
+    """
+    if isinstance(obj, Packed):
+        return deserializeFromStr(obj.value)
+    if isinstance(obj, tuple) and hasattr(obj, '_fields'):
+        return type(obj)._make(unpack(v) for v in obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        return type(obj)(unpack(v) for v in obj)
+    if isinstance(obj, dict):
+        return type(obj)((unpack(k), unpack(v)) for k, v in obj.items())
+    if hasattr(obj, '__dict__') and not callable(obj):
+        unpacked = object.__new__(type(obj))
+        unpacked.__dict__.update(unpack(vars(obj)))
+        return unpacked
+    return obj
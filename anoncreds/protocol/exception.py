@@ -1,2 +1,14 @@
 class NotFoundError(RuntimeError):
     pass
+
+
+class PoolBusyError(RuntimeError):
+    pass
+
+
+class NonceReplayError(ValueError):
+    pass
+
+
+class MalformedProofError(ValueError):
+    pass
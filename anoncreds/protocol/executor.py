@@ -0,0 +1,67 @@
+import asyncio
+
+from anoncreds.protocol.codec import pack, unpack
+
+INLINE = 'inline'
+THREAD = 'thread'
+PROCESS = 'process'
+
+
+def _runPacked(fn, packedArgs):
+    return pack(fn(*unpack(packedArgs)))
+
+
+class CryptoExecutor:
+    """
+    Runs the pure crypto steps of the protocol (key generation, signing,
+    proof initialization, T-hat computation) for the async Issuer, Prover
+    and Verifier. Wallet and repo calls always stay on the event loop.
+
+    Modes:
+    - inline: on the calling thread, blocking the loop (the default);
+    - thread: in a thread pool. The loop keeps serving other tasks, but
+      crypto steps don't run in parallel as they hold the GIL;
+    - process: in a process pool. Arguments and results are sent with
+      anoncreds.protocol.codec, so the functions must be module-level.
+    """
+
+    def __init__(self, mode=INLINE, maxWorkers=None):
+        if mode not in (INLINE, THREAD, PROCESS):
+            raise ValueError('Unknown execution mode {}'.format(mode))
+        self.mode = mode
+        self.maxWorkers = maxWorkers
+        self._pool = None
+
+    async def run(self, fn, *args):
+        """
+        Runs fn(*args) according to the executor's mode.
+
+        :param fn: a synchronous function
+        :return: its result
+        """
+        if self.mode == INLINE:
+            return fn(*args)
+
+        loop = asyncio.get_event_loop()
+        pool = self._getPool()
+        if self.mode == THREAD:
+            return await loop.run_in_executor(pool, fn, *args)
+        return unpack(await loop.run_in_executor(pool, _runPacked, fn,
+                                                 pack(args)))
+
+    def shutdown(self, wait=True):
+        if self._pool:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    def _getPool(self):
+        if not self._pool:
+            # imported here, as concurrent.futures (with multiprocessing)
+            # takes longer to import than the whole protocol, and the
+            # default inline mode doesn't need it
+            from concurrent.futures import ThreadPoolExecutor, \
+                ProcessPoolExecutor
+            self._pool = ThreadPoolExecutor(self.maxWorkers) \
+                if self.mode == THREAD \
+                else ProcessPoolExecutor(self.maxWorkers)
+        return self._pool
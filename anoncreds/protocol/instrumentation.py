@@ -0,0 +1,180 @@
+"""
+Timing of the protocol phases (signing, proof initialization, tau
+computation, repo fetches etc.), reported as spans to a pluggable
+Instrumentation. The default one does nothing:
+
+    collector = MetricsCollector()
+    setInstrumentation(collector)
+    ...
+    text = collector.exportOpenMetrics()
+
+Span names are dotted, e.g. 'prover.init_proof.nonrevoc',
+'verifier.tau.primary' or 'repo.getAccumulator'.
+"""
+import functools
+import threading
+import time
+from collections import namedtuple, deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Sequence
+
+SpanRecord = namedtuple('SpanRecord', 'name, parent, start, duration, failed')
+Histogram = namedtuple('Histogram', 'buckets, counts, count, sum')
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+_NOOP_SPAN = nullcontext()
+
+
+class Instrumentation:
+    """
+    Receives the spans of the protocol phases. This one ignores them.
+    """
+
+    def span(self, name: str):
+        """
+        :return: a context manager timing the phase
+        """
+        return _NOOP_SPAN
+
+    def observe(self, name: str, seconds: float):
+        pass
+
+
+_instrumentation = Instrumentation()
+
+
+def setInstrumentation(instrumentation: Instrumentation = None):
+    """
+    Sets the instrumentation spans are reported to (no-op one if None).
+    """
+    global _instrumentation
+    _instrumentation = instrumentation or Instrumentation()
+
+
+def getInstrumentation() -> Instrumentation:
+    return _instrumentation
+
+
+def span(name: str):
+    return _instrumentation.span(name)
+
+
+def traced(name: str):
+    """
+    Reports every call of the decorated coroutine function as a span.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with _instrumentation.span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+_currentSpan = ContextVar('currentSpan', default=None)
+
+
+class _Span:
+    def __init__(self, collector, name):
+        self._collector = collector
+        self._name = name
+
+    def __enter__(self):
+        self._parent = _currentSpan.get()
+        self._token = _currentSpan.set(self._name)
+        self._start = self._collector._timer()
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        duration = self._collector._timer() - self._start
+        _currentSpan.reset(self._token)
+        self._collector._record(SpanRecord(self._name, self._parent,
+                                           self._start, duration,
+                                           excType is not None))
+        return False
+
+
+class MetricsCollector(Instrumentation):
+    """
+    Keeps a histogram of durations per span name, and the most recent
+    spans.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 maxSpans=1000, timer=time.perf_counter):
+        self.buckets = tuple(sorted(buckets))
+        self._timer = timer
+        self._spans = deque(maxlen=maxSpans)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @property
+    def spans(self) -> Sequence[SpanRecord]:
+        with self._lock:
+            return list(self._spans)
+
+    @property
+    def histograms(self) -> Dict[str, Histogram]:
+        with self._lock:
+            return {name: Histogram(self.buckets, list(h[0]), h[1], h[2])
+                    for name, h in sorted(self._histograms.items())}
+
+    def span(self, name: str):
+        return _Span(self, name)
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            self._observe(name, seconds)
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._histograms.clear()
+
+    def exportOpenMetrics(self) -> str:
+        """
+        The histograms in the OpenMetrics text format.
+        """
+        lines = ['# TYPE anoncreds_phase_seconds histogram',
+                 '# UNIT anoncreds_phase_seconds seconds',
+                 '# HELP anoncreds_phase_seconds Duration of protocol '
+                 'phases.']
+        for name, h in self.histograms.items():
+            cumulative = 0
+            for le, n in zip(h.buckets, h.counts):
+                cumulative += n
+                lines.append(
+                    'anoncreds_phase_seconds_bucket{{phase="{}",le="{}"}} {}'
+                    .format(name, le, cumulative))
+            lines.append(
+                'anoncreds_phase_seconds_bucket{{phase="{}",le="+Inf"}} {}'
+                .format(name, h.count))
+            lines.append('anoncreds_phase_seconds_count{{phase="{}"}} {}'
+                         .format(name, h.count))
+            lines.append('anoncreds_phase_seconds_sum{{phase="{}"}} {}'
+                         .format(name, h.sum))
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def _record(self, record: SpanRecord):
+        with self._lock:
+            self._spans.append(record)
+            self._observe(record.name, record.duration)
+
+    def _observe(self, name, seconds):
+        h = self._histograms.get(name)
+        if h is None:
+            h = self._histograms[name] = [[0] * len(self.buckets), 0, 0.0]
+        for i, le in enumerate(self.buckets):
+            if seconds <= le:
+                h[0][i] += 1
+                break
+        h[1] += 1
+        h[2] += seconds
@@ -1,8 +1,12 @@
 from typing import Dict
 
+from anoncreds.protocol.executor import CryptoExecutor
 from anoncreds.protocol.globals import LARGE_MASTER_SECRET
+from anoncreds.protocol.instrumentation import traced
 from anoncreds.protocol.primary.primary_claim_issuer import PrimaryClaimIssuer
 from anoncreds.protocol.repo.attributes_repo import AttributeRepo
+from anoncreds.protocol.revocation.accumulators.accumulator_allocator import \
+    AccumulatorAllocator
 from anoncreds.protocol.revocation.accumulators.non_revocation_claim_issuer import \
     NonRevocationClaimIssuer
 from anoncreds.protocol.types import PrimaryClaim, NonRevocationClaim, \
@@ -14,11 +18,14 @@ from config.config import cmod
 
 
 class Issuer:
-    def __init__(self, wallet: IssuerWallet, attrRepo: AttributeRepo):
+    def __init__(self, wallet: IssuerWallet, attrRepo: AttributeRepo,
+                 executor: CryptoExecutor = None,
+                 allocator: AccumulatorAllocator = None):
         self.wallet = wallet
         self._attrRepo = attrRepo
-        self._primaryIssuer = PrimaryClaimIssuer(wallet)
-        self._nonRevocationIssuer = NonRevocationClaimIssuer(wallet)
+        self._primaryIssuer = PrimaryClaimIssuer(wallet, executor)
+        self._nonRevocationIssuer = NonRevocationClaimIssuer(wallet, executor,
+                                                             allocator)
 
     #
     # PUBLIC
@@ -29,7 +36,7 @@ class Issuer:
         return self.wallet.walletId
 
     def isSchemaExists(self, schemaKey):
-        return self.wallet._schemasByKey.get(schemaKey)
+        return self.wallet.cachedSchema(schemaKey)
 
     async def genSchema(self, name, version, attrNames) -> Schema:
         """
@@ -43,6 +50,7 @@ class Issuer:
         schema = Schema(name, version, attrNames, self.issuerId)
         return await self.wallet.submitSchema(schema)
 
+    @traced('issuer.gen_keys')
     async def genKeys(self, schemaId: ID, p_prime=None, q_prime=None) -> (
             PublicKey, RevocationPublicKey):
         """
@@ -63,6 +71,7 @@ class Issuer:
                                                  skR=skR)
         return pk, pkR
 
+    @traced('issuer.issue_accumulator')
     async def issueAccumulator(self, schemaId: ID, iA,
                                L) -> AccumulatorPublicKey:
         """
@@ -83,6 +92,7 @@ class Issuer:
                                             accumSK=accSK)
         return accPK
 
+    @traced('issuer.revoke')
     async def revoke(self, schemaId: ID, i):
         """
         Performs revocation of a Claim.
@@ -91,10 +101,9 @@ class Issuer:
         definition schema)
         :param i: claim's sequence number within accumulator
         """
-        acc, ts = await self._nonRevocationIssuer.revoke(schemaId, i)
-        await self.wallet.submitAccumUpdate(schemaId=schemaId, accum=acc,
-                                            timestampMs=ts)
+        await self._nonRevocationIssuer.revoke(schemaId, i)
 
+    @traced('issuer.issue_claim')
     async def issueClaim(self, schemaId: ID, claimRequest: ClaimRequest,
                          iA=None,
                          i=None) -> (Claims, Dict[str, ClaimAttributeValues]):
@@ -118,14 +127,14 @@ class Issuer:
         # iA = iA if iA else (await self.wallet.getAccumulator(schemaId)).iA
 
         # TODO this has un-obvious side-effects
-        await self._genContxt(schemaId, iA, claimRequest.userId)
+        m2 = await self._genContxt(schemaId, iA, claimRequest.userId)
 
         (c1, claim) = await self._issuePrimaryClaim(schemaId, attributes,
-                                           claimRequest.U)
+                                           claimRequest.U, m2)
         # TODO re-enable when revocation registry is fully implemented
         c2 = await self._issueNonRevocationClaim(schemaId, claimRequest.Ur,
                                                  iA,
-                                                 i) if claimRequest.Ur else None
+                                                 i, m2) if claimRequest.Ur else None
 
         signature = Claims(primaryClaim=c1, nonRevocClaim=c2)
 
@@ -159,16 +168,14 @@ class Issuer:
         return m2
 
     async def _issuePrimaryClaim(self, schemaId: ID, attributes: Attribs,
-                                 U) -> (PrimaryClaim, Dict[str, ClaimAttributeValues]):
+                                 U, m2=None) -> (PrimaryClaim, Dict[str, ClaimAttributeValues]):
         return await self._primaryIssuer.issuePrimaryClaim(schemaId,
-                                                           attributes, U)
+                                                           attributes, U, m2)
 
     async def _issueNonRevocationClaim(self, schemaId: ID, Ur, iA=None,
-                                       i=None) -> NonRevocationClaim:
-        claim, accum, ts = await self._nonRevocationIssuer.issueNonRevocationClaim(
-            schemaId, Ur, iA, i)
-        await self.wallet.submitAccumUpdate(schemaId=schemaId, accum=accum,
-                                            timestampMs=ts)
+                                       i=None, m2=None) -> NonRevocationClaim:
+        claim, _, _ = await self._nonRevocationIssuer.issueNonRevocationClaim(
+            schemaId, Ur, iA, i, m2)
         return claim
 
     def __repr__(self):
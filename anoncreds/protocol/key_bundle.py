@@ -0,0 +1,107 @@
+"""
+Saving and loading an issuer's key material for a schema, so that tests
+and restarting services don't have to generate it again.
+
+    bundle = await exportKeyBundle(issuer.wallet, schemaId)
+    saveKeyBundle(bundle, 'gvt.keys')
+    ...
+    schema = await importKeyBundle(issuer.wallet, loadKeyBundle('gvt.keys'))
+
+The file holds secret keys and is unpickled when loaded: it must only be
+read from a trusted location.
+"""
+import pickle
+from collections import namedtuple
+
+from anoncreds.protocol.codec import pack, unpack
+from anoncreds.protocol.types import ID, Accumulator, Schema
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWallet
+
+KEY_BUNDLE_MAGIC = b'anoncreds-key-bundle-1\n'
+
+KeyBundle = namedtuple('KeyBundle', 'schema, pk, sk, pkR, skR, accumPk, '
+                                    'accumSk, accum, tails')
+
+
+async def exportKeyBundle(wallet: IssuerWallet, schemaId: ID) -> KeyBundle:
+    """
+    Collects the keys (and the accumulator, if issued) of the schema from
+    the issuer's wallet.
+    """
+    schema = await wallet.getSchema(schemaId)
+    pk = await wallet.getPublicKey(schemaId)
+    sk = await wallet.getSecretKey(schemaId)
+    pkR = await wallet.getPublicKeyRevocation(schemaId)
+    skR = await wallet.getSecretKeyRevocation(schemaId)
+    try:
+        accumSk = await wallet.getSecretKeyAccumulator(schemaId)
+    except ValueError:
+        # no accumulator issued
+        return KeyBundle(schema, pk, sk, pkR, skR, None, None, None, None)
+    return KeyBundle(schema, pk, sk, pkR, skR,
+                     await wallet.getPublicKeyAccumulator(schemaId), accumSk,
+                     _copyAccumulator(await wallet.getAccumulator(schemaId)),
+                     await wallet.getTails(schemaId))
+
+
+async def importKeyBundle(wallet: IssuerWallet, bundle: KeyBundle) -> Schema:
+    """
+    Submits the bundle's schema, keys and accumulator, as genSchema,
+    genKeys and issueAccumulator of an Issuer would.
+
+    :return: the submitted schema
+    """
+    schema = await wallet.submitSchema(bundle.schema)
+    schemaId = ID(schema.getKey(), schemaId=schema.seqId)
+    await importKeys(wallet, schemaId, bundle)
+    if bundle.accum:
+        await importAccumulator(wallet, schemaId, bundle)
+    return schema
+
+
+async def importKeys(wallet: IssuerWallet, schemaId: ID, bundle: KeyBundle):
+    """
+    Submits the bundle's keys for an already submitted schema.
+
+    :return: the submitted (pk, pkR), as Issuer.genKeys returns them
+    """
+    pk, pkR = await wallet.submitPublicKeys(schemaId=schemaId, pk=bundle.pk,
+                                            pkR=bundle.pkR)
+    await wallet.submitSecretKeys(schemaId=schemaId, sk=bundle.sk,
+                                  skR=bundle.skR)
+    return pk, pkR
+
+
+async def importAccumulator(wallet: IssuerWallet, schemaId: ID,
+                            bundle: KeyBundle):
+    """
+    Submits the bundle's accumulator for an already submitted schema.
+    Every import gets its own copy of the accumulator.
+    """
+    accumPk = await wallet.submitAccumPublic(schemaId=schemaId,
+                                             accumPK=bundle.accumPk,
+                                             accum=_copyAccumulator(
+                                                 bundle.accum),
+                                             tails=bundle.tails)
+    await wallet.submitAccumSecret(schemaId=schemaId, accumSK=bundle.accumSk)
+    return accumPk
+
+
+def saveKeyBundle(bundle: KeyBundle, path):
+    with open(path, 'wb') as f:
+        f.write(KEY_BUNDLE_MAGIC)
+        pickle.dump(pack(bundle), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def loadKeyBundle(path) -> KeyBundle:
+    with open(path, 'rb') as f:
+        if f.read(len(KEY_BUNDLE_MAGIC)) != KEY_BUNDLE_MAGIC:
+            raise ValueError('{} is not a key bundle'.format(path))
+        return unpack(pickle.load(f))
+
+
+def _copyAccumulator(accum: Accumulator) -> Accumulator:
+    # the accumulator changes with every issuance and revocation
+    copy = Accumulator(accum.iA, accum.acc, set(accum.V), accum.L)
+    copy.currentI = accum.currentI
+    return copy
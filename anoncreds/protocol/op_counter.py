@@ -0,0 +1,95 @@
+"""
+Counts the crypto operations a piece of code performs, so that tests can
+hold presentProof, verify etc. to an operation budget:
+
+    with countOps() as ops:
+        await verifier.verify(proofRequest, proof)
+    assert ops['modexp'] <= 30
+
+Integer (mod N) and pairing group operations are counted by charm's own
+benchmark counters, hashes by get_hash_as_int. The counters are global to
+the process: only what runs in it is counted (use an inline
+CryptoExecutor), concurrent calls are counted together and counting can't
+be nested.
+
+Once counted, charm won't mix elements of the shared group
+(utils.pairingGroup) with elements of other PairingGroup instances, so
+group elements must all come from the shared group.
+
+Keys: 'modexp', 'modmul', 'moddiv' for integers (inversions are modexp
+with exponent -1), 'pairing', '<type>.exp', '<type>.mul', '<type>.div' for
+group elements of type ZR, G1 or GT, and 'hash'. A utils.multiExp is
+counted as one modexp per base, not as the multiplications it is made of.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from config.config import cmod
+
+_INTEGER_OPS = {'Exp': 'modexp', 'Mul': 'modmul', 'Div': 'moddiv'}
+_GROUP_OPS = ['Exp', 'Mul', 'Div']
+# order of the types in charm's granular benchmarks
+_GROUP_TYPES = ['ZR', 'G1', 'G2', 'GT']
+
+_lock = threading.Lock()
+_counts = None
+
+
+@contextmanager
+def countOps():
+    """
+    Counts the operations performed while in the context.
+
+    :return: a Counter of operations, filled in when the context exits
+    :raises RuntimeError: if operations are already being counted
+    """
+    global _counts
+    if not _lock.acquire(blocking=False):
+        raise RuntimeError('Operations are already being counted')
+
+    # imported here, as utils counts hashes with this module
+    from anoncreds.protocol.utils import pairingGroup
+    group = pairingGroup()
+    counts = Counter()
+    try:
+        cmod.InitBenchmark()
+        cmod.StartBenchmark(list(_INTEGER_OPS))
+        group.InitBenchmark()
+        group.StartBenchmark(_GROUP_OPS + ['Pair', 'Granular'])
+        _counts = counts
+        yield counts
+    finally:
+        _counts = None
+        cmod.EndBenchmark()
+        group.EndBenchmark()
+        _lock.release()
+
+    for op, name in _INTEGER_OPS.items():
+        counts[name] += cmod.GetGeneralBenchmarks()[op]
+    counts['pairing'] += group.GetGeneralBenchmarks()['Pair']
+    for op, perType in group.GetGranularBenchmarks().items():
+        for groupType, n in zip(_GROUP_TYPES, perType):
+            counts['{}.{}'.format(groupType, op.lower())] += n
+    # keep only what was performed, so that counts compare easily
+    for name, n in list(counts.items()):
+        if not n:
+            del counts[name]
+
+
+def countHash():
+    counts = _counts
+    if counts is not None:
+        counts['hash'] += 1
+
+
+def countMultiExp(bases, muls):
+    """
+    Counts a multi-exponentiation of the bases, done with muls counted
+    multiplications, as one exponentiation per base.
+    """
+    counts = _counts
+    if counts is not None:
+        counts['modexp'] += bases
+        # the backend counts the multiplications, taken off when the context exits
+        counts['modmul'] -= muls
@@ -1,14 +1,17 @@
 from typing import Sequence, Dict
 
+from anoncreds.protocol.executor import CryptoExecutor
 from anoncreds.protocol.globals import LARGE_VPRIME, LARGE_MVECT, LARGE_E_START, \
     LARGE_ETILDE, \
     LARGE_VTILDE, LARGE_UTILDE, LARGE_RTILDE, LARGE_ALPHATILDE, ITERATIONS, \
     DELTA
-from anoncreds.protocol.primary.primary_proof_common import calcTge, calcTeq
+from anoncreds.protocol.primary.primary_proof_common import calcRur, \
+    calcTgePrecomputed
 from anoncreds.protocol.types import PrimaryClaim, Predicate, PrimaryInitProof, \
     PrimaryEqualInitProof, PrimaryPrecicateGEInitProof, PrimaryProof, \
     PrimaryEqualProof, PrimaryPredicateGEProof, \
-    ID, ClaimInitDataType, ClaimAttributeValues
+    ID, ClaimInitDataType, ClaimAttributeValues, PublicKey, PrimaryPrecomputed, \
+    GePrecomputed
 from anoncreds.protocol.utils import splitRevealedAttrs, fourSquares
 from anoncreds.protocol.wallet.prover_wallet import ProverWallet
 from config.config import cmod
@@ -37,24 +40,33 @@ class PrimaryClaimInitializer:
 
 
 class PrimaryProofBuilder:
-    def __init__(self, wallet: ProverWallet):
+    def __init__(self, wallet: ProverWallet, executor: CryptoExecutor = None):
         self._wallet = wallet
+        self._executor = executor or CryptoExecutor()
 
     async def initProof(self, schemaId, c1: PrimaryClaim,
                         revealedAttrs: Sequence[str],
                         predicates: Sequence[Predicate],
-                        m1Tilde, m2Tilde, claimAttributes: Dict[str, ClaimAttributeValues]) -> PrimaryInitProof:
+                        m1Tilde, m2Tilde, claimAttributes: Dict[str, ClaimAttributeValues],
+                        precomputed: PrimaryPrecomputed = None,
+                        gePrecomputed: Sequence[GePrecomputed] = None) -> PrimaryInitProof:
         if not c1:
             return None
 
-        eqProof = await self._initEqProof(schemaId, c1, revealedAttrs,
-                                          m1Tilde, m2Tilde, claimAttributes)
-        geProofs = []
-        for predicate in predicates:
-            geProof = await self._initGeProof(schemaId, eqProof, c1,
-                                              predicate, claimAttributes)
-            geProofs.append(geProof)
-        return PrimaryInitProof(eqProof, geProofs)
+        pk = await self._wallet.getPublicKey(ID(schemaId=schemaId))
+        return await self._executor.run(initPrimaryProof, pk, c1,
+                                        revealedAttrs, predicates,
+                                        m1Tilde, m2Tilde, claimAttributes,
+                                        precomputed, gePrecomputed)
+
+    async def precompute(self, schemaId, c1: PrimaryClaim) \
+            -> PrimaryPrecomputed:
+        pk = await self._wallet.getPublicKey(ID(schemaId=schemaId))
+        return await self._executor.run(precomputePrimaryProof, pk, c1)
+
+    async def precomputeGe(self, schemaId) -> GePrecomputed:
+        pk = await self._wallet.getPublicKey(ID(schemaId=schemaId))
+        return await self._executor.run(precomputeGeProof, pk)
 
     async def finalizeProof(self, schemaId, cH,
                             initProof: PrimaryInitProof) -> PrimaryProof:
@@ -71,77 +83,6 @@ class PrimaryProofBuilder:
             geProofs.append(geProof)
         return PrimaryProof(eqProof, geProofs)
 
-    async def _initEqProof(self, schemaId, c1: PrimaryClaim,
-                           revealedAttrs: Sequence[str], m1Tilde, m2Tilde, claimAttributes: Dict[str, ClaimAttributeValues]) \
-            -> PrimaryEqualInitProof:
-        m2Tilde = m2Tilde if m2Tilde else cmod.integer(
-            cmod.randomBits(LARGE_MVECT))
-        revealedAttrs, unrevealedAttrs = splitRevealedAttrs(claimAttributes, [a.name for a in revealedAttrs])
-        mtilde = self._getMTilde(unrevealedAttrs)
-
-        Ra = cmod.integer(cmod.randomBits(LARGE_VPRIME))
-        pk = await self._wallet.getPublicKey(ID(schemaId=schemaId))
-
-        A, e, v = c1.A, c1.e, c1.v
-        Aprime = A * (pk.S ** Ra) % pk.N
-        vprime = (v - e * Ra)
-        eprime = e - (2 ** LARGE_E_START)
-
-        etilde = cmod.integer(cmod.randomBits(LARGE_ETILDE))
-        vtilde = cmod.integer(cmod.randomBits(LARGE_VTILDE))
-
-        Rur = 1 % pk.N
-        for k, value in unrevealedAttrs.items():
-            if k in claimAttributes:
-                Rur = Rur * (pk.R[k] ** mtilde[k])
-        Rur *= pk.Rms ** m1Tilde
-        Rur *= pk.Rctxt ** m2Tilde
-
-        # T = ((Aprime ** etilde) * Rur * (pk.S ** vtilde)) % pk.N
-        T = calcTeq(pk, Aprime, etilde, vtilde, mtilde, m1Tilde, m2Tilde,
-                    unrevealedAttrs.keys())
-
-        return PrimaryEqualInitProof(c1, Aprime, T, etilde, eprime, vtilde,
-                                     vprime, mtilde, m1Tilde, m2Tilde,
-                                     unrevealedAttrs.keys(), revealedAttrs)
-
-    async def _initGeProof(self, schemaId, eqProof: PrimaryEqualInitProof,
-                           c1: PrimaryClaim, predicate: Predicate, claimAttributes: Dict[str, ClaimAttributeValues]) \
-            -> PrimaryPrecicateGEInitProof:
-        # gen U for Delta
-        pk = await self._wallet.getPublicKey(ID(schemaId=schemaId))
-        k, value = predicate.attrName, predicate.value
-        delta = claimAttributes[k].encoded - value
-        if delta < 0:
-            raise ValueError("Predicate is not satisfied")
-
-        u = fourSquares(delta)
-
-        # prepare C list
-        r = {}
-        T = {}
-        CList = []
-        for i in range(0, ITERATIONS):
-            r[str(i)] = cmod.integer(cmod.randomBits(LARGE_VPRIME))
-            T[str(i)] = (pk.Z ** u[str(i)]) * (pk.S ** r[str(i)]) % pk.N
-            CList.append(T[str(i)])
-        r[DELTA] = cmod.integer(cmod.randomBits(LARGE_VPRIME))
-        T[DELTA] = (pk.Z ** delta) * (pk.S ** r[DELTA]) % pk.N
-        CList.append(T[DELTA])
-
-        # prepare Tau List
-        utilde = {}
-        rtilde = {}
-        for i in range(0, ITERATIONS):
-            utilde[str(i)] = cmod.integer(cmod.randomBits(LARGE_UTILDE))
-            rtilde[str(i)] = cmod.integer(cmod.randomBits(LARGE_RTILDE))
-        rtilde[DELTA] = cmod.integer(cmod.randomBits(LARGE_RTILDE))
-        alphatilde = cmod.integer(cmod.randomBits(LARGE_ALPHATILDE))
-
-        TauList = calcTge(pk, utilde, rtilde, eqProof.mTilde[k], alphatilde, T)
-        return PrimaryPrecicateGEInitProof(CList, TauList, u, utilde, r, rtilde,
-                                           alphatilde, predicate, T)
-
     async def _finalizeEqProof(self, schemaId, cH,
                                initProof: PrimaryEqualInitProof) -> PrimaryEqualProof:
         e = initProof.eTilde + (cH * initProof.ePrime)
@@ -180,8 +121,154 @@ class PrimaryProofBuilder:
         return PrimaryPredicateGEProof(u, r, alpha, eqProof.m[str(k)],
                                        initProof.T, initProof.predicate)
 
-    def _getMTilde(self, unrevealedAttrs):
-        mtilde = {}
-        for key, value in unrevealedAttrs.items():
-            mtilde[key] = cmod.integer(cmod.randomBits(LARGE_MVECT))
-        return mtilde
+
+def initPrimaryProof(pk: PublicKey, c1: PrimaryClaim,
+                     revealedAttrs: Sequence[str],
+                     predicates: Sequence[Predicate],
+                     m1Tilde, m2Tilde,
+                     claimAttributes: Dict[str, ClaimAttributeValues],
+                     precomputed: PrimaryPrecomputed = None,
+                     gePrecomputed: Sequence[GePrecomputed] = None) \
+        -> PrimaryInitProof:
+    eqProof = _initEqProof(pk, c1, revealedAttrs, m1Tilde, m2Tilde,
+                           claimAttributes, precomputed)
+    gePrecomputed = gePrecomputed or [None] * len(predicates)
+    geProofs = [None] * len(predicates)
+    # predicates on the same attribute share the randomness of T[DELTA];
+    # the one with the greatest value is initialized first, so the others'
+    # T[DELTA] are its own times a non-negative power of Z
+    shared = {}
+    for n in sorted(range(len(predicates)),
+                    key=lambda n: (predicates[n].attrName,
+                                   -predicates[n].value)):
+        predicate = predicates[n]
+        geProofs[n] = _initGeProof(pk, eqProof, c1, predicate,
+                                   claimAttributes, gePrecomputed[n],
+                                   shared.get(predicate.attrName))
+        shared.setdefault(predicate.attrName, geProofs[n])
+    return PrimaryInitProof(eqProof, geProofs)
+
+
+def precomputePrimaryProof(pk: PublicKey, c1: PrimaryClaim) \
+        -> PrimaryPrecomputed:
+    Ra = cmod.integer(cmod.randomBits(LARGE_VPRIME))
+
+    A, e, v = c1.A, c1.e, c1.v
+    Aprime = A * (pk.S ** Ra) % pk.N
+    vprime = (v - e * Ra)
+    eprime = e - (2 ** LARGE_E_START)
+
+    etilde = cmod.integer(cmod.randomBits(LARGE_ETILDE))
+    vtilde = cmod.integer(cmod.randomBits(LARGE_VTILDE))
+    AprimeS = (Aprime ** etilde) * (pk.S ** vtilde) % pk.N
+
+    return PrimaryPrecomputed(c1, Aprime, eprime, vprime, etilde, vtilde,
+                              AprimeS)
+
+
+def _initEqProof(pk: PublicKey, c1: PrimaryClaim,
+                 revealedAttrs: Sequence[str], m1Tilde, m2Tilde, claimAttributes: Dict[str, ClaimAttributeValues],
+                 precomputed: PrimaryPrecomputed = None) \
+        -> PrimaryEqualInitProof:
+    m2Tilde = m2Tilde if m2Tilde else cmod.integer(
+        cmod.randomBits(LARGE_MVECT))
+    revealedAttrs, unrevealedAttrs = splitRevealedAttrs(claimAttributes, [a.name for a in revealedAttrs])
+    mtilde = _getMTilde(unrevealedAttrs)
+
+    if not precomputed:
+        precomputed = precomputePrimaryProof(pk, c1)
+
+    # T = ((Aprime ** etilde) * Rur * (pk.S ** vtilde)) % pk.N
+    Rur = calcRur(pk, mtilde, m1Tilde, m2Tilde, unrevealedAttrs.keys())
+    T = precomputed.AprimeS * Rur % pk.N
+
+    return PrimaryEqualInitProof(c1, precomputed.Aprime, T,
+                                 precomputed.eTilde, precomputed.ePrime,
+                                 precomputed.vTilde, precomputed.vPrime,
+                                 mtilde, m1Tilde, m2Tilde,
+                                 unrevealedAttrs.keys(), revealedAttrs)
+
+
+def precomputeGeProof(pk: PublicKey, delta=True) -> GePrecomputed:
+    """
+    :param delta: whether to precompute the T[DELTA] parts too, which a
+    predicate sharing them with another one on the same attribute doesn't
+    need
+    """
+    r = {}
+    Sr = {}
+    utilde = {}
+    rtilde = {}
+    TauParts = {}
+    for i in range(0, ITERATIONS):
+        r[str(i)] = cmod.integer(cmod.randomBits(LARGE_VPRIME))
+        Sr[str(i)] = pk.S ** r[str(i)]
+        utilde[str(i)] = cmod.integer(cmod.randomBits(LARGE_UTILDE))
+        rtilde[str(i)] = cmod.integer(cmod.randomBits(LARGE_RTILDE))
+        TauParts[str(i)] = (pk.Z ** utilde[str(i)]) * (
+            pk.S ** rtilde[str(i)]) % pk.N
+    if delta:
+        r[DELTA] = cmod.integer(cmod.randomBits(LARGE_VPRIME))
+        Sr[DELTA] = pk.S ** r[DELTA]
+        rtilde[DELTA] = cmod.integer(cmod.randomBits(LARGE_RTILDE))
+        TauParts[DELTA] = pk.S ** rtilde[DELTA]
+    alphatilde = cmod.integer(cmod.randomBits(LARGE_ALPHATILDE))
+
+    return GePrecomputed(r, Sr, utilde, rtilde, TauParts, alphatilde,
+                         pk.S ** alphatilde)
+
+
+def _initGeProof(pk: PublicKey, eqProof: PrimaryEqualInitProof,
+                 c1: PrimaryClaim, predicate: Predicate, claimAttributes: Dict[str, ClaimAttributeValues],
+                 precomputed: GePrecomputed = None,
+                 shared: PrimaryPrecicateGEInitProof = None) \
+        -> PrimaryPrecicateGEInitProof:
+    """
+    :param shared: the init proof of a predicate on the same attribute
+    with a value not lower than this one's, whose r[DELTA] and
+    rTilde[DELTA] this proof uses too
+    """
+    # gen U for Delta
+    k, value = predicate.attrName, predicate.value
+    delta = claimAttributes[k].encoded - value
+    if delta < 0:
+        raise ValueError("Predicate is not satisfied")
+
+    u = fourSquares(delta)
+
+    if not precomputed:
+        precomputed = precomputeGeProof(pk, delta=not shared)
+
+    # prepare C list
+    T = {}
+    CList = []
+    for i in range(0, ITERATIONS):
+        T[str(i)] = (pk.Z ** u[str(i)]) * precomputed.Sr[str(i)] % pk.N
+        CList.append(T[str(i)])
+    r, rTilde = precomputed.r, precomputed.rTilde
+    if shared:
+        # Z^(m - value) * S^r[DELTA] = Z^(m - sharedValue) * S^r[DELTA] *
+        # Z^(sharedValue - value), and the tau of DELTA is the same
+        r = dict(r, **{DELTA: shared.r[DELTA]})
+        rTilde = dict(rTilde, **{DELTA: shared.rTilde[DELTA]})
+        T[DELTA] = shared.T[DELTA] * (
+            pk.Z ** (shared.predicate.value - value)) % pk.N
+        TDeltaTau = shared.TauList[ITERATIONS]
+    else:
+        T[DELTA] = (pk.Z ** delta) * precomputed.Sr[DELTA] % pk.N
+        TDeltaTau = None
+    CList.append(T[DELTA])
+
+    # prepare Tau List
+    TauList = calcTgePrecomputed(pk, eqProof.mTilde[k], T, precomputed,
+                                 TDeltaTau)
+    return PrimaryPrecicateGEInitProof(CList, TauList, u, precomputed.uTilde,
+                                       r, rTilde, precomputed.alphaTilde,
+                                       predicate, T)
+
+
+def _getMTilde(unrevealedAttrs):
+    mtilde = {}
+    for key, value in unrevealedAttrs.items():
+        mtilde[key] = cmod.integer(cmod.randomBits(LARGE_MVECT))
+    return mtilde
@@ -1,15 +1,26 @@
 from anoncreds.protocol.globals import ITERATIONS, DELTA
+from anoncreds.protocol.utils import multiExp
 
 
 def calcTeq(pk, Aprime, e, v, mtilde, m1Tilde, m2Tilde, unrevealedAttrNames):
-    Rur = 1 % pk.N
-    for k in unrevealedAttrNames:
-        Rur = Rur * (pk.R[k] ** mtilde[k])
-    Rur *= pk.Rms ** m1Tilde
-    Rur *= pk.Rctxt ** m2Tilde
+    Rur = calcRur(pk, mtilde, m1Tilde, m2Tilde, unrevealedAttrNames)
     return ((Aprime ** e) * Rur * (pk.S ** v)) % pk.N
 
 
+def calcRur(pk, mtilde, m1Tilde, m2Tilde, unrevealedAttrNames):
+    return multiExp(*rurTerms(pk, mtilde, m1Tilde, m2Tilde,
+                              unrevealedAttrNames), pk.N)
+
+
+def rurTerms(pk, mtilde, m1Tilde, m2Tilde, unrevealedAttrNames):
+    """
+    The bases and the exponents of Rur.
+    """
+    bases = [pk.R[k] for k in unrevealedAttrNames] + [pk.Rms, pk.Rctxt]
+    exps = [mtilde[k] for k in unrevealedAttrNames] + [m1Tilde, m2Tilde]
+    return bases, exps
+
+
 def calcTge(pk, u, r, mj, alpha, T):
     TauList = []
     for i in range(0, ITERATIONS):
@@ -18,11 +29,21 @@ def calcTge(pk, u, r, mj, alpha, T):
     Ttau = (pk.Z ** mj) * (pk.S ** r[DELTA]) % pk.N
     TauList.append(Ttau)
 
-    # gen Q
-    Q = 1 % pk.N
-    for i in range(0, ITERATIONS):
-        Q *= T[str(i)] ** u[str(i)]
-    Q = Q * (pk.S ** alpha) % pk.N
-    TauList.append(Q)
+    TauList.append(calcQ(pk, u, T, pk.S ** alpha))
 
     return TauList
+
+
+def calcTgePrecomputed(pk, mj, T, precomputed, TDeltaTau=None):
+    TauList = [precomputed.TauParts[str(i)] for i in range(0, ITERATIONS)]
+    if TDeltaTau is None:
+        TDeltaTau = (pk.Z ** mj) * precomputed.TauParts[DELTA] % pk.N
+    TauList.append(TDeltaTau)
+    TauList.append(calcQ(pk, precomputed.uTilde, T, precomputed.SAlpha))
+    return TauList
+
+
+def calcQ(pk, u, T, SAlpha):
+    Q = multiExp([T[str(i)] for i in range(0, ITERATIONS)],
+                 [u[str(i)] for i in range(0, ITERATIONS)], pk.N)
+    return Q * SAlpha % pk.N
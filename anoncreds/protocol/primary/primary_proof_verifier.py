@@ -1,56 +1,89 @@
+from anoncreds.protocol.executor import CryptoExecutor
 from anoncreds.protocol.globals import LARGE_E_START, ITERATIONS, DELTA
-from anoncreds.protocol.primary.primary_proof_common import calcTeq, calcTge
+from anoncreds.protocol.primary.primary_proof_common import rurTerms, calcQ
 from anoncreds.protocol.types import PrimaryEqualProof, \
-    PrimaryPredicateGEProof, PrimaryProof, ID
+    PrimaryPredicateGEProof, PrimaryProof, ID, PublicKey
+from anoncreds.protocol.utils import batchInverse, multiExp
 from anoncreds.protocol.wallet.wallet import Wallet
 from config.config import cmod
 
 
 class PrimaryProofVerifier:
-    def __init__(self, wallet: Wallet):
+    def __init__(self, wallet: Wallet, executor: CryptoExecutor = None):
         self._wallet = wallet
+        self._executor = executor or CryptoExecutor()
 
     async def verify(self, schemaId, cHash, primaryProof: PrimaryProof):
-        cH = cmod.integer(cHash)
-        THat = await self._verifyEquality(schemaId, cH, primaryProof.eqProof)
-        for geProof in primaryProof.geProofs:
-            THat += await self._verifyGEPredicate(schemaId, cH, geProof)
-
-        return THat
-
-    async def _verifyEquality(self, schemaId, cH, proof: PrimaryEqualProof):
-        THat = []
         pk = await self._wallet.getPublicKey(ID(schemaId=schemaId))
         attrNames = (await self._wallet.getSchema(ID(schemaId=schemaId))).attrNames
-        unrevealedAttrNames = set(attrNames) - set(proof.revealedAttrs.keys())
+        return await self._executor.run(calcPrimaryTHat, pk, attrNames,
+                                        cHash, primaryProof)
 
-        T1 = calcTeq(pk, proof.Aprime, proof.e, proof.v,
-                     proof.m, proof.m1, proof.m2,
-                     unrevealedAttrNames)
 
-        Rar = 1 % pk.N
-        for attrName in proof.revealedAttrs.keys():
-            Rar *= pk.R[str(attrName)] ** proof.revealedAttrs[str(attrName)]
-        Rar *= proof.Aprime ** (2 ** LARGE_E_START)
-        T2 = (pk.Z / Rar) ** (-1 * cH) % pk.N
-        T = T1 * T2 % pk.N
+def calcPrimaryTHat(pk: PublicKey, attrNames, cHash,
+                    primaryProof: PrimaryProof):
+    cH = cmod.integer(cHash)
 
-        THat.append(T)
-        return THat
+    # the only inverses the equations need are those of Z and of the
+    # predicates' T values, so they are all computed with one inversion
+    toInvert = [pk.Z]
+    for geProof in primaryProof.geProofs:
+        toInvert += [geProof.T[str(i)] for i in range(0, ITERATIONS)]
+        toInvert.append(geProof.T[DELTA])
+    inverses = batchInverse(toInvert, pk.N)
+    ZInv = inverses[0]
 
-    async def _verifyGEPredicate(self, schemaId, cH,
-                                 proof: PrimaryPredicateGEProof):
-        pk = await self._wallet.getPublicKey(ID(schemaId=schemaId))
-        k, v = proof.predicate.attrName, proof.predicate.value
+    THat = _verifyEquality(pk, attrNames, cH, primaryProof.eqProof, ZInv)
+    for n, geProof in enumerate(primaryProof.geProofs):
+        start = 1 + n * (ITERATIONS + 1)
+        THat += _verifyGEPredicate(pk, cH, geProof, ZInv,
+                                   inverses[start:start + ITERATIONS + 1])
+
+    return THat
+
+
+def _verifyEquality(pk: PublicKey, attrNames, cH, proof: PrimaryEqualProof,
+                    ZInv):
+    # T = Aprime^e * S^v * Rur * (Z / (Rar * Aprime^(2^596)))^(-cH),
+    # rearranged so that every base is raised to a power once:
+    # Aprime^(e + cH * 2^596) * S^v * Rur * Rar^cH * (Z^-1)^cH
+    unrevealedAttrNames = set(attrNames) - set(proof.revealedAttrs.keys())
+
+    # the exponents of Rur, Rar and Z^-1 are of similar sizes, so they're
+    # raised together
+    bases, exps = rurTerms(pk, proof.m, proof.m1, proof.m2,
+                           unrevealedAttrNames)
+    for attrName in proof.revealedAttrs.keys():
+        bases.append(pk.R[str(attrName)])
+        exps.append(cH * proof.revealedAttrs[str(attrName)])
+    bases.append(ZInv)
+    exps.append(cH)
+
+    T = proof.Aprime ** (proof.e + cH * (2 ** LARGE_E_START))
+    T = T * multiExp(bases, exps, pk.N) * (pk.S ** proof.v) % pk.N
+
+    return [T]
+
+
+def _verifyGEPredicate(pk: PublicKey, cH, proof: PrimaryPredicateGEProof,
+                       ZInv, TInv):
+    # TInv holds the inverses of T[0..ITERATIONS-1] and T[DELTA];
+    # (T[DELTA] * Z^v)^(-cH) is split so that Z is raised once with the
+    # merged exponent mj - v * cH
+    k, v = proof.predicate.attrName, proof.predicate.value
+
+    TauList = []
+    for i in range(0, ITERATIONS):
+        Ttau = (pk.Z ** proof.u[str(i)]) * (pk.S ** proof.r[str(i)]) * \
+               (TInv[i] ** cH) % pk.N
+        TauList.append(Ttau)
 
-        TauList = calcTge(pk, proof.u, proof.r, proof.mj, proof.alpha, proof.T)
+    TDeltaPow = TInv[ITERATIONS] ** cH
+    zExp = int(proof.mj) - int(cH) * v
+    Zpow = pk.Z ** zExp if zExp >= 0 else ZInv ** -zExp
+    TauList.append(Zpow * (pk.S ** proof.r[DELTA]) * TDeltaPow % pk.N)
 
-        for i in range(0, ITERATIONS):
-            TT = proof.T[str(i)] ** (-1 * cH) % pk.N
-            TauList[i] = TauList[i] * TT % pk.N
-        TauList[ITERATIONS] = TauList[ITERATIONS] * (
-            (proof.T[DELTA] * (pk.Z ** v)) ** (-1 * cH)) % pk.N
-        TauList[ITERATIONS + 1] = (TauList[ITERATIONS + 1] * (
-            proof.T[DELTA] ** (-1 * cH))) % pk.N
+    TauList.append(calcQ(pk, proof.u, proof.T, pk.S ** proof.alpha) *
+                   TDeltaPow % pk.N)
 
-        return TauList
+    return TauList
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from collections import deque
+
+from anoncreds.protocol.executor import CryptoExecutor
+from anoncreds.protocol.primary.primary_proof_builder import \
+    PrimaryProofBuilder
+from anoncreds.protocol.revocation.accumulators.non_revocation_proof_builder import \
+    NonRevocationProofBuilder
+from anoncreds.protocol.types import ID, Claims
+from anoncreds.protocol.wallet.prover_wallet import ProverWallet
+
+
+class _BackgroundFill:
+    """
+    Runs fill() in a background task when entries have been used. A fill
+    that fails is logged, and tried again when entries are used next.
+    """
+
+    def __init__(self):
+        self._wanted = asyncio.Event()
+        self._task = None
+
+    async def fill(self):
+        raise NotImplementedError
+
+    def start(self):
+        if not self._task:
+            self._wanted.set()
+            self._task = asyncio.ensure_future(self._refill())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refill(self):
+        while True:
+            await self._wanted.wait()
+            self._wanted.clear()
+            try:
+                await self.fill()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception('Precomputation failed, trying again when '
+                                  'entries are used')
+
+
+class ProofPrecomputationPool(_BackgroundFill):
+    """
+    Keeps request independent proof commitments ready for the prover's
+    stored claims: the randomized A (Aprime) with (Aprime ^ eTilde) * (S ^
+    vTilde), and the non-revocation C list randomization. A Prover given
+    this pool only does the attribute dependent work when a proof request
+    comes in.
+
+    fill() tops up the pool and is meant to be called when the holder is
+    idle; start() instead refills it in a background task whenever entries
+    are used. Entries are used at most once, as reusing the randomness
+    would link proofs and leak the claim.
+    """
+
+    def __init__(self, wallet: ProverWallet, executor: CryptoExecutor = None,
+                 size=1):
+        super().__init__()
+        self._wallet = wallet
+        self._primaryProofBuilder = PrimaryProofBuilder(wallet, executor)
+        self._nonRevocProofBuilder = NonRevocationProofBuilder(wallet,
+                                                               executor)
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def available(self, schemaId) -> int:
+        return len(self._entries.get(schemaId, ()))
+
+    async def fill(self):
+        """
+        Precomputes entries for every stored claim, up to size entries
+        per claim.
+        """
+        allClaims = await self._wallet.getAllClaimsSignatures()
+        for schemaKey, claims in allClaims.items():
+            schemaId = (await self._wallet.getSchema(ID(schemaKey))).seqId
+            entries = self._entries.setdefault(schemaId, deque())
+            while len(entries) < self.size:
+                entries.append(await self._precompute(schemaId, claims))
+
+    def take(self, schemaId, claims: Claims):
+        """
+        Removes and returns entries precomputed for the given claims.
+
+        :return: (PrimaryPrecomputed, NonRevocPrecomputed), or
+        (None, None) if none are ready
+        """
+        entries = self._entries.get(schemaId)
+        self._wanted.set()
+        while entries:
+            primary, nonRevoc = entries.popleft()
+            # entries made for a claim that has been replaced since
+            if primary.c1 != claims.primaryClaim:
+                continue
+            if (nonRevoc is None) != (claims.nonRevocClaim is None) or \
+                    (nonRevoc and nonRevoc.gi != claims.nonRevocClaim.gi):
+                continue
+            self.hits += 1
+            return primary, nonRevoc
+        self.misses += 1
+        return None, None
+
+    async def _precompute(self, schemaId, claims: Claims):
+        primary = await self._primaryProofBuilder.precompute(
+            schemaId, claims.primaryClaim)
+        nonRevoc = await self._nonRevocProofBuilder.precompute(
+            schemaId, claims.nonRevocClaim) if claims.nonRevocClaim else None
+        return primary, nonRevoc
+
+
+class PredicatePrecomputationCache(_BackgroundFill):
+    """
+    Keeps the predicate independent parts of GE predicate proofs ready for
+    the public keys of the prover's stored claims: the (r, S ^ r) pairs of
+    the T values, and (Z ^ uTilde) * (S ^ rTilde), S ^ rTilde[DELTA] and
+    S ^ alphaTilde of the tau list. Only the powers of Z depending on the
+    predicate's delta are left for proving time.
+
+    Filled the same way as ProofPrecomputationPool; entries are used once.
+    """
+
+    def __init__(self, wallet: ProverWallet, executor: CryptoExecutor = None,
+                 size=4):
+        super().__init__()
+        self._wallet = wallet
+        self._primaryProofBuilder = PrimaryProofBuilder(wallet, executor)
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def available(self, schemaId) -> int:
+        return len(self._entries.get(schemaId, ()))
+
+    async def fill(self):
+        """
+        Precomputes entries for the keys of every stored claim, up to size
+        entries per key.
+        """
+        allClaims = await self._wallet.getAllClaimsSignatures()
+        for schemaKey in allClaims.keys():
+            schemaId = (await self._wallet.getSchema(ID(schemaKey))).seqId
+            entries = self._entries.setdefault(schemaId, deque())
+            while len(entries) < self.size:
+                entries.append(
+                    await self._primaryProofBuilder.precomputeGe(schemaId))
+
+    def take(self, schemaId, count):
+        """
+        Removes and returns up to count entries for the schema's key.
+
+        :return: a list of count GePrecomputed, padded with None when there
+        aren't enough entries ready
+        """
+        entries = self._entries.get(schemaId, deque())
+        self._wanted.set()
+        res = []
+        while entries and len(res) < count:
+            res.append(entries.popleft())
+        self.hits += len(res)
+        self.misses += count - len(res)
+        return res + [None] * (count - len(res))
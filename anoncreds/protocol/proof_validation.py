@@ -0,0 +1,213 @@
+"""
+Structural checks of a proof, cheap enough to run before the expensive
+verification: the shape of the proof against the proof request and the
+schemas, the types of all values and the bit lengths of the responses.
+"""
+import asyncio
+from typing import Dict, Sequence
+
+from anoncreds.protocol.exception import MalformedProofError
+from anoncreds.protocol.globals import LARGE_ETILDE, LARGE_E_END_RANGE, \
+    LARGE_VTILDE, LARGE_VPRIME_PRIME, LARGE_MVECT, LARGE_M2_TILDE, \
+    LARGE_MASTER_SECRET, LARGE_RTILDE, LARGE_VPRIME, LARGE_ALPHATILDE, \
+    ITERATIONS, DELTA
+from anoncreds.protocol.types import FullProof, ProofRequest, PublicKey, ID, \
+    PrimaryEqualProof, PrimaryPredicateGEProof, NonRevocProof
+from anoncreds.protocol.utils import isCryptoInteger, isGroupElement, \
+    pairingGroup
+from anoncreds.protocol.wallet.wallet import Wallet
+from config.config import cmod
+
+C_HASH_BITS = 256
+
+# A response is x = xTilde + cHash * x', so it has at most
+# max(|xTilde|, C_HASH_BITS + |x'|) + 1 bits.
+E_BITS = max(LARGE_ETILDE, C_HASH_BITS + LARGE_E_END_RANGE) + 1
+# v' = v - e * Ra is about as long as v
+V_BITS = max(LARGE_VTILDE, C_HASH_BITS + LARGE_VPRIME_PRIME + 2) + 1
+# attributes are encoded as hashes
+M_BITS = max(LARGE_MVECT, C_HASH_BITS + C_HASH_BITS) + 1
+M1_BITS = max(LARGE_M2_TILDE, C_HASH_BITS + LARGE_MASTER_SECRET) + 1
+# m2Tilde is shared with the non-revocation proof, where it is an element
+# of the pairing group's ZR (less than LARGE_M2_TILDE bits)
+M2_BITS = max(LARGE_M2_TILDE, C_HASH_BITS + LARGE_MASTER_SECRET) + 1
+U_BITS = M_BITS
+R_BITS = max(LARGE_RTILDE, C_HASH_BITS + LARGE_VPRIME) + 1
+# alpha' = r[DELTA] - sum(u[i] * r[i]), with u[i] at most half as long as
+# an attribute
+ALPHA_BITS = max(LARGE_ALPHATILDE,
+                 C_HASH_BITS + LARGE_VPRIME + C_HASH_BITS // 2 + 3) + 1
+
+GE_KEYS = {str(i) for i in range(ITERATIONS)}
+NON_REVOC_C_LIST_SIZE = 7
+GE_C_LIST_SIZE = ITERATIONS + 1
+
+
+async def prevalidateProof(wallet: Wallet, proofRequest: ProofRequest,
+                           proof: FullProof, checkSubgroups=False):
+    """
+    Fetches the schemas and public keys the proof refers to and checks the
+    proof's structure (see validateProof).
+    """
+    try:
+        seqNos = [proofItem.schema_seq_no
+                  for proofItem in proof.proofs.values()]
+    except AttributeError:
+        raise MalformedProofError('Malformed proof items')
+    schemas = await asyncio.gather(
+        *[wallet.getSchema(ID(schemaId=seqNo)) for seqNo in seqNos])
+    pks = await asyncio.gather(
+        *[wallet.getPublicKey(ID(schemaId=seqNo)) for seqNo in seqNos])
+    validateProof(proofRequest, proof,
+                  {seqNo: schema.attrNames
+                   for seqNo, schema in zip(seqNos, schemas)},
+                  dict(zip(seqNos, pks)), checkSubgroups)
+
+
+def validateProof(proofRequest: ProofRequest, proof: FullProof,
+                  attrNames: Dict[int, Sequence[str]],
+                  pks: Dict[int, PublicKey], checkSubgroups=False):
+    """
+    Checks the structure of a proof without verifying it.
+
+    :param attrNames: attribute names of the schemas, by schema seq no
+    :param pks: public keys, by schema seq no
+    :param checkSubgroups: whether to check that the group elements of the
+    non-revocation proofs belong to the right subgroup. It takes several
+    milliseconds per element.
+    :raises MalformedProofError: if the proof can't be valid
+    """
+    try:
+        _validateProof(proofRequest, proof, attrNames, pks, checkSubgroups)
+    except MalformedProofError:
+        raise
+    except Exception as ex:
+        # whatever fails on a malformed proof (missing keys, wrong types)
+        raise MalformedProofError('Malformed proof: {!r}'.format(ex)) from ex
+
+
+def _validateProof(proofRequest: ProofRequest, proof: FullProof,
+                   attrNames, pks, checkSubgroups):
+    cHash = proof.aggregatedProof.cHash
+    _checkBits('cHash', cHash, C_HASH_BITS)
+    if cHash < 0:
+        raise MalformedProofError('cHash is negative')
+
+    cListSize = 0
+    for key, proofItem in proof.proofs.items():
+        seqNo = proofItem.schema_seq_no
+        if key != str(seqNo):
+            raise MalformedProofError(
+                'Proof item {} is for schema {}'.format(key, seqNo))
+        primaryProof = proofItem.proof.primaryProof
+        if not primaryProof:
+            raise MalformedProofError(
+                'No primary proof for schema {}'.format(seqNo))
+
+        pk = pks[seqNo]
+        _validateEqProof(primaryProof.eqProof, attrNames[seqNo], pk)
+        for geProof in primaryProof.geProofs:
+            _validateGeProof(geProof, primaryProof.eqProof, pk)
+        cListSize += 1 + GE_C_LIST_SIZE * len(primaryProof.geProofs)
+
+        if proofItem.proof.nonRevocProof:
+            _validateNonRevocProof(proofItem.proof.nonRevocProof,
+                                   checkSubgroups)
+            cListSize += NON_REVOC_C_LIST_SIZE
+
+    if len(proof.aggregatedProof.CList) != cListSize:
+        raise MalformedProofError('CList has {} values, {} expected'.format(
+            len(proof.aggregatedProof.CList), cListSize))
+
+    # every revealed attribute and predicate asked for is proven
+    requestedProof = proof.requestedProof
+    for uuid, attr in proofRequest.verifiableAttributes.items():
+        seqNo, _, encoded = requestedProof.revealed_attrs[uuid]
+        eqProof = proof.proofs[str(seqNo)].proof.primaryProof.eqProof
+        if attr.name not in eqProof.revealedAttrs or \
+                int(eqProof.revealedAttrs[attr.name]) != int(encoded):
+            raise MalformedProofError(
+                'Attribute {} is not revealed as {}'.format(attr.name,
+                                                            encoded))
+
+    for uuid, predicate in proofRequest.predicates.items():
+        seqNo = requestedProof.predicates[uuid]
+        geProofs = proof.proofs[str(seqNo)].proof.primaryProof.geProofs
+        if not any(geProof.predicate.attrName == predicate.attrName and
+                   geProof.predicate.type == predicate.type and
+                   geProof.predicate.value >= predicate.value
+                   for geProof in geProofs):
+            raise MalformedProofError(
+                'Predicate {} is not proven'.format(predicate))
+
+
+def _validateEqProof(eqProof: PrimaryEqualProof, attrNames, pk: PublicKey):
+    _checkBits('e', eqProof.e, E_BITS)
+    _checkBits('v', eqProof.v, V_BITS)
+    _checkBits('m1', eqProof.m1, M1_BITS)
+    _checkBits('m2', eqProof.m2, M2_BITS)
+    _checkResidue('Aprime', eqProof.Aprime, pk.N)
+
+    revealed = set(eqProof.revealedAttrs.keys())
+    if not revealed.issubset(attrNames) or \
+            set(eqProof.m.keys()) != set(attrNames) - revealed:
+        raise MalformedProofError(
+            'Attributes of the proof do not match the schema')
+    for name, value in eqProof.revealedAttrs.items():
+        _checkBits(name, value, M_BITS)
+    for name, value in eqProof.m.items():
+        _checkBits(name, value, M_BITS)
+
+
+def _validateGeProof(geProof: PrimaryPredicateGEProof,
+                     eqProof: PrimaryEqualProof, pk: PublicKey):
+    attrName = geProof.predicate.attrName
+    # mj ties the predicate to the attribute in the equality proof
+    if attrName not in eqProof.m or geProof.mj != eqProof.m[attrName]:
+        raise MalformedProofError(
+            'Predicate {} is not for a hidden attribute'.format(attrName))
+    if set(geProof.u.keys()) != GE_KEYS or \
+            set(geProof.r.keys()) != GE_KEYS | {DELTA} or \
+            set(geProof.T.keys()) != GE_KEYS | {DELTA}:
+        raise MalformedProofError('Malformed predicate proof')
+
+    for value in geProof.u.values():
+        _checkBits('u', value, U_BITS)
+    for value in geProof.r.values():
+        _checkBits('r', value, R_BITS)
+    _checkBits('alpha', geProof.alpha, ALPHA_BITS)
+    for value in geProof.T.values():
+        _checkResidue('T', value, pk.N)
+
+
+def _validateNonRevocProof(nonRevocProof: NonRevocProof, checkSubgroups):
+    group = pairingGroup() if checkSubgroups else None
+    for name, value in zip(nonRevocProof.XList._fields, nonRevocProof.XList):
+        if not isGroupElement(value) or value.type != cmod.ZR:
+            raise MalformedProofError('{} is not in ZR'.format(name))
+    for name, value in zip(nonRevocProof.CProof._fields,
+                           nonRevocProof.CProof):
+        if not isGroupElement(value) or value.type != cmod.G1 or \
+                (checkSubgroups and not group.ismember(value)):
+            raise MalformedProofError('{} is not in G1'.format(name))
+
+
+def _checkBits(name, value, bits):
+    if not (isCryptoInteger(value) or isinstance(value, int)):
+        raise MalformedProofError('{} is not an integer'.format(name))
+    if abs(int(value)).bit_length() > bits:
+        raise MalformedProofError(
+            '{} is longer than {} bits'.format(name, bits))
+
+
+def _checkResidue(name, value, N):
+    # a value without the modulus would make the verifier's
+    # exponentiations blow up; charm refuses to compare integers with
+    # different moduli
+    try:
+        valid = isCryptoInteger(value) and 0 < int(value) < int(N) and \
+                value == cmod.integer(int(value)) % N
+    except Exception:
+        valid = False
+    if not valid:
+        raise MalformedProofError('{} is not a residue mod N'.format(name))
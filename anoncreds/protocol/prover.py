@@ -1,9 +1,13 @@
-from functools import reduce
+import asyncio
 from typing import Dict, Sequence, Any
 
+from anoncreds.protocol.executor import CryptoExecutor
 from anoncreds.protocol.globals import LARGE_MASTER_SECRET, LARGE_M2_TILDE
+from anoncreds.protocol.instrumentation import span, traced
 from anoncreds.protocol.primary.primary_proof_builder import \
     PrimaryClaimInitializer, PrimaryProofBuilder
+from anoncreds.protocol.proof_precomputation import ProofPrecomputationPool, \
+    PredicatePrecomputationCache
 from anoncreds.protocol.revocation.accumulators.non_revocation_proof_builder import \
     NonRevocationClaimInitializer, \
     NonRevocationProofBuilder
@@ -11,20 +15,26 @@ from anoncreds.protocol.types import PrimaryClaim, NonRevocationClaim, Proof, \
     InitProof, ProofRequest, ProofClaims, \
     FullProof, \
     Schema, ID, SchemaKey, ClaimRequest, Claims, RequestedProof, AggregatedProof, ProofInfo, ClaimAttributeValues
-from anoncreds.protocol.utils import get_hash_as_int, isCryptoInteger
+from anoncreds.protocol.transcript import Transcript
+from anoncreds.protocol.utils import isCryptoInteger
 from anoncreds.protocol.wallet.prover_wallet import ProverWallet
 from config.config import cmod
 
 
 class Prover:
-    def __init__(self, wallet: ProverWallet):
+    def __init__(self, wallet: ProverWallet, executor: CryptoExecutor = None,
+                 precomputation: ProofPrecomputationPool = None,
+                 predicatePrecomputation: PredicatePrecomputationCache = None):
         self.wallet = wallet
+        self._precomputation = precomputation
+        self._predicatePrecomputation = predicatePrecomputation
 
         self._primaryClaimInitializer = PrimaryClaimInitializer(wallet)
         self._nonRevocClaimInitializer = NonRevocationClaimInitializer(wallet)
 
-        self._primaryProofBuilder = PrimaryProofBuilder(wallet)
-        self._nonRevocProofBuilder = NonRevocationProofBuilder(wallet)
+        self._primaryProofBuilder = PrimaryProofBuilder(wallet, executor)
+        self._nonRevocProofBuilder = NonRevocationProofBuilder(wallet,
+                                                               executor)
 
     #
     # PUBLIC
@@ -72,6 +82,7 @@ class Prover:
                                                           reqNonRevoc)
         return res
 
+    @traced('prover.process_claim')
     async def processClaim(self, schemaId: ID, claimAttributes: Dict[str, ClaimAttributeValues], signature: Claims):
         """
         Processes and saves a received Claim for the given Schema.
@@ -99,6 +110,7 @@ class Prover:
             res.append(await self.processClaim(schemaId, claim_attributes, claim_signature))
         return res
 
+    @traced('prover.present_proof')
     async def presentProof(self, proofRequest: ProofRequest) -> FullProof:
         """
         Presents a proof to the verifier.
@@ -107,7 +119,8 @@ class Prover:
         attributes, predicates, timestamps for non-revocation)
         :return: a proof (both primary and non-revocation) and revealed attributes (initial non-encoded values)
         """
-        claims, requestedProof = await self._findClaims(proofRequest)
+        with span('prover.find_claims'):
+            claims, requestedProof = await self._findClaims(proofRequest)
         proof = await self._prepareProof(claims, proofRequest.nonce, requestedProof)
         return proof
 
@@ -209,60 +222,102 @@ class Prover:
 
     async def _prepareProof(self, claims: Dict[SchemaKey, ProofClaims],
                             nonce, requestedProof) -> FullProof:
+        await self._prefetch(claims)
+
         m1Tilde = cmod.integer(cmod.randomBits(LARGE_M2_TILDE))
-        initProofs = {}
+
+        # 1. init proofs (claims only share m1Tilde, so they are initialized
+        # concurrently; the C lists are still collected in claims order)
+        transcript = Transcript(nonce)
+        schemaIds = list(claims.keys())
+        initProofs = await asyncio.gather(
+            *[self._initProof(schemaId, claims[schemaId], m1Tilde,
+                              transcript)
+              for schemaId in schemaIds])
         CList = []
-        TauList = []
+        for initProof in initProofs:
+            if initProof.nonRevocInitProof:
+                CList += initProof.nonRevocInitProof.asCList()
+            if initProof.primaryInitProof:
+                CList += initProof.primaryInitProof.asCList()
 
-        # 1. init proofs
-        for schemaId, val in claims.items():
-            c1, c2, revealedAttrs, predicates = val.claims.primaryClaim, val.claims.nonRevocClaim, val.revealedAttrs, val.predicates
+        # 2. hash
+        with span('prover.hash'):
+            transcript.absorbAll(CList)
+            cH = transcript.challenge()
+
+        # 3. finalize proofs
+        proofInfos = await asyncio.gather(
+            *[self._finalizeProof(schemaId, cH, initProof)
+              for schemaId, initProof in zip(schemaIds, initProofs)])
+        proofs = {str(schemaId): proofInfo
+                  for schemaId, proofInfo in zip(schemaIds, proofInfos)}
+
+        aggregatedProof = AggregatedProof(cH, self._prepare_collection(CList))
+
+        return FullProof(proofs, aggregatedProof, requestedProof)
 
-            claim = await self.wallet.getClaimAttributes(ID(schemaId=schemaId))
+    async def _initProof(self, schemaId, val: ProofClaims,
+                         m1Tilde, transcript: Transcript) -> InitProof:
+        c1, c2, revealedAttrs, predicates = val.claims.primaryClaim, val.claims.nonRevocClaim, val.revealedAttrs, val.predicates
 
-            nonRevocInitProof = None
-            if c2:
+        claim = await self.wallet.getClaimAttributes(ID(schemaId=schemaId))
+
+        primaryPre, nonRevocPre = \
+            self._precomputation.take(schemaId, val.claims) \
+            if self._precomputation else (None, None)
+
+        nonRevocInitProof = None
+        if c2:
+            with span('prover.init_proof.nonrevoc'):
                 nonRevocInitProof = await self._nonRevocProofBuilder.initProof(
-                    schemaId, c2)
-                CList += nonRevocInitProof.asCList()
-                TauList += nonRevocInitProof.asTauList()
-
-            primaryInitProof = None
-            if c1:
-                m2Tilde = cmod.integer(int(
-                    nonRevocInitProof.TauListParams.m2)) if nonRevocInitProof else None
+                    schemaId, c2, nonRevocPre)
+            transcript.absorbAll(nonRevocInitProof.asTauList())
+
+        primaryInitProof = None
+        if c1:
+            m2Tilde = cmod.integer(int(
+                nonRevocInitProof.TauListParams.m2)) if nonRevocInitProof else None
+            gePre = self._predicatePrecomputation.take(
+                schemaId, len(predicates)) \
+                if self._predicatePrecomputation else None
+            with span('prover.init_proof.primary'):
                 primaryInitProof = await self._primaryProofBuilder.initProof(
                     schemaId, c1, revealedAttrs, predicates,
-                    m1Tilde, m2Tilde, claim)
-                CList += primaryInitProof.asCList()
-                TauList += primaryInitProof.asTauList()
-
-            initProof = InitProof(nonRevocInitProof, primaryInitProof)
-            initProofs[schemaId] = initProof
+                    m1Tilde, m2Tilde, claim, primaryPre, gePre)
+            transcript.absorbAll(primaryInitProof.asTauList())
 
-        # 2. hash
-        cH = self._get_hash(self._prepare_collection(CList), self._prepare_collection(TauList), nonce)
+        return InitProof(nonRevocInitProof, primaryInitProof)
 
-        # 3. finalize proofs
-        proofs = {}
-        for schemaId, initProof in initProofs.items():
-            nonRevocProof = None
-            if initProof.nonRevocInitProof:
+    async def _finalizeProof(self, schemaId, cH,
+                             initProof: InitProof) -> ProofInfo:
+        nonRevocProof = None
+        if initProof.nonRevocInitProof:
+            with span('prover.finalize_proof.nonrevoc'):
                 nonRevocProof = await self._nonRevocProofBuilder.finalizeProof(
                     schemaId, cH, initProof.nonRevocInitProof)
+        with span('prover.finalize_proof.primary'):
             primaryProof = await self._primaryProofBuilder.finalizeProof(
                 schemaId, cH, initProof.primaryInitProof)
 
-            schema = await self.wallet.getSchema(ID(schemaId=schemaId))
+        schema = await self.wallet.getSchema(ID(schemaId=schemaId))
 
-            proof = Proof(primaryProof, nonRevocProof)
-            proofInfo = ProofInfo(proof=proof, schema_seq_no=schemaId, issuer_did=schema.issuerId)
+        proof = Proof(primaryProof, nonRevocProof)
+        return ProofInfo(proof=proof, schema_seq_no=schemaId, issuer_did=schema.issuerId)
 
-            proofs[str(schemaId)] = proofInfo
-
-        aggregatedProof = AggregatedProof(cH, self._prepare_collection(CList))
-
-        return FullProof(proofs, aggregatedProof, requestedProof)
+    async def _prefetch(self, claims: Dict[SchemaKey, ProofClaims]):
+        # request everything the claims need at once, so that a batching
+        # repo can serve them with a few bulk calls
+        fetches = []
+        for schemaId, val in claims.items():
+            schemaId = ID(schemaId=schemaId)
+            fetches.append(self.wallet.getSchema(schemaId))
+            if val.claims.primaryClaim:
+                fetches.append(self.wallet.getPublicKey(schemaId))
+            if val.claims.nonRevocClaim:
+                fetches.append(self.wallet.getPublicKeyRevocation(schemaId))
+                fetches.append(self.wallet.getAccumulator(schemaId))
+        await asyncio.gather(*fetches)
 
     async def _getCList(self, initProofs: Dict[Schema, InitProof]):
         CList = []
@@ -280,7 +335,3 @@ class Prover:
 
     def _prepare_collection(self, values):
         return [cmod.toInt(el) if isCryptoInteger(el) else el for el in values]
-
-    def _get_hash(self, CList, TauList, nonce):
-        return get_hash_as_int(nonce,
-                               *reduce(lambda x, y: x + y, [TauList, CList]))
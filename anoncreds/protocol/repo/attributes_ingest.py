@@ -0,0 +1,78 @@
+import csv
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Tuple
+
+from anoncreds.protocol.repo.attributes_repo import AttributeRepo
+from anoncreds.protocol.types import AttribDef, Attribs, SchemaKey
+
+Record = Tuple[str, Dict[str, object]]
+
+
+def readCsv(path, userIdField='userId', **csvArgs) -> Iterator[Record]:
+    """
+    Streams (userId, attribute values) records from a CSV file with a
+    header row.
+    """
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f, **csvArgs):
+            userId = row.pop(userIdField)
+            yield userId, row
+
+
+def readJsonl(path, userIdField='userId') -> Iterator[Record]:
+    """
+    Streams (userId, attribute values) records from a file with one JSON
+    object per line.
+    """
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                userId = row.pop(userIdField)
+                yield userId, row
+
+
+def ingestAttributes(repo: AttributeRepo, schemaKey: SchemaKey,
+                     attribDef: AttribDef, records: Iterable[Record],
+                     chunkSize=1000) -> int:
+    """
+    Encodes and stores attributes of many users, one chunk at a time.
+
+    Values of attributes that are not hashed (encode=False) must be
+    integers; strings such as the ones read from a CSV file are converted.
+
+    :param repo: repo to store the attributes in
+    :param schemaKey: schema the attributes belong to
+    :param attribDef: definition of the schema's attributes
+    :param records: (userId, attribute values) pairs, e.g. from readCsv
+    :param chunkSize: number of users stored with one bulk call
+    :return: number of users stored
+    """
+    attrTypes = {at.name: at
+                 for types in attribDef.attrTypes
+                 for at in types}
+    records = iter(records)
+    count = 0
+    while True:
+        chunk = [(userId, _toAttribs(attribDef, attrTypes, userId, vals))
+                 for userId, vals in islice(records, chunkSize)]
+        if not chunk:
+            return count
+        repo.addAttributesBulk(schemaKey, chunk)
+        count += len(chunk)
+
+
+def _toAttribs(attribDef: AttribDef, attrTypes, userId, vals) -> Attribs:
+    if set(vals) != set(attrTypes):
+        raise ValueError(
+            'Attributes {} of user {} do not match the schema attributes {}'
+                .format(sorted(vals), userId, sorted(attrTypes)))
+
+    vals = {name: value if attrTypes[name].encode or isinstance(value, int)
+            else int(value)
+            for name, value in vals.items()}
+    attribs = attribDef.attribs(**vals)
+    # encode once here instead of on every issuance
+    attribs.encoded()
+    return attribs
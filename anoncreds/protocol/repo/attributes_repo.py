@@ -1,6 +1,10 @@
+import json
 from abc import abstractmethod
+from typing import Iterable, Tuple
 
-from anoncreds.protocol.types import Attribs, SchemaKey
+from anoncreds.protocol.types import Attribs, AttribDef, AttribType, \
+    SchemaKey
+from config.config import cmod
 
 
 class AttributeRepo:
@@ -13,14 +17,131 @@ class AttributeRepo:
                       attributes: Attribs):
         raise NotImplementedError
 
+    def addAttributesBulk(self, schemaKey: SchemaKey,
+                          attributes: Iterable[Tuple[object, Attribs]]):
+        """
+        Stores attributes of many users at once.
+
+        :param schemaKey: schema the attributes belong to
+        :param attributes: (userId, attributes) pairs
+        """
+        for userId, attrs in attributes:
+            self.addAttributes(schemaKey, userId, attrs)
+
 
 class AttributeRepoInMemory(AttributeRepo):
     def __init__(self):
         self.attributes = {}
 
     def getAttributes(self, schemaKey: SchemaKey, userId) -> Attribs:
-        return self.attributes.get((schemaKey, userId))
+        return self.attributes.get((schemaKey, str(userId)))
+
+    def addAttributes(self, schemaKey: SchemaKey, userId,
+                      attributes: Attribs):
+        self.attributes[(schemaKey, str(userId))] = attributes
+
+
+class AttributeRepoSqlite(AttributeRepo):
+    """
+    An AttributeRepo persisted in a SQLite database.
+
+    Attributes are stored together with their encoding, so claims can be
+    issued without hashing the attribute values again.
+    """
+
+    def __init__(self, path=':memory:'):
+        # imported here, so that importing the protocol doesn't pay for it
+        import sqlite3
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS attrib_defs (
+                name TEXT, version TEXT, issuerId TEXT, def TEXT,
+                PRIMARY KEY (name, version, issuerId));
+            CREATE TABLE IF NOT EXISTS attributes (
+                name TEXT, version TEXT, issuerId TEXT, userId TEXT,
+                vals TEXT, encoded TEXT,
+                PRIMARY KEY (name, version, issuerId, userId))
+                WITHOUT ROWID;
+        ''')
+        self._attribDefs = {}
+
+    def close(self):
+        self._conn.close()
+
+    def getAttributes(self, schemaKey: SchemaKey, userId) -> Attribs:
+        row = self._conn.execute(
+            'SELECT vals, encoded FROM attributes '
+            'WHERE name=? AND version=? AND issuerId=? AND userId=?',
+            (*self._keyColumns(schemaKey), str(userId))).fetchone()
+        if not row:
+            return None
+
+        attribDef = self._getAttribDef(schemaKey)
+        encodeFlags = {at.name: at.encode
+                       for attrTypes in attribDef.attrTypes
+                       for at in attrTypes}
+        vals = json.loads(row[0])
+        encoded = {name: cmod.integer(int(value)) if encodeFlags[name]
+                   else value
+                   for name, value in json.loads(row[1]).items()}
+        return Attribs.fromEncoded(attribDef, vals, encoded)
 
     def addAttributes(self, schemaKey: SchemaKey, userId,
                       attributes: Attribs):
-        self.attributes[(schemaKey, userId)] = attributes
+        self.addAttributesBulk(schemaKey, [(userId, attributes)])
+
+    def addAttributesBulk(self, schemaKey: SchemaKey,
+                          attributes: Iterable[Tuple[object, Attribs]]):
+        keyColumns = self._keyColumns(schemaKey)
+        rows = []
+        for userId, attrs in attributes:
+            if not rows:
+                self._putAttribDef(schemaKey, attrs.credType)
+            rows.append((*keyColumns, str(userId),
+                         json.dumps(dict(attrs.items())),
+                         json.dumps(self._encodedToJson(attrs))))
+
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO attributes VALUES (?, ?, ?, ?, ?, ?)',
+                rows)
+
+    # HELPER
+
+    @staticmethod
+    def _keyColumns(schemaKey: SchemaKey):
+        return schemaKey.name, schemaKey.version, str(schemaKey.issuerId)
+
+    @staticmethod
+    def _encodedToJson(attrs: Attribs):
+        encodeFlags = {at.name: at.encode
+                       for attrTypes in attrs.credType.attrTypes
+                       for at in attrTypes}
+        return {name: str(int(value)) if encodeFlags[name] else value
+                for name, value in attrs.encoded().items()}
+
+    def _putAttribDef(self, schemaKey: SchemaKey, attribDef: AttribDef):
+        if schemaKey in self._attribDefs and \
+                self._attribDefs[schemaKey] == attribDef:
+            return
+        data = {'names': attribDef.names,
+                'attrTypes': [[[at.name, at.encode] for at in attrTypes]
+                              for attrTypes in attribDef.attrTypes]}
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO attrib_defs VALUES (?, ?, ?, ?)',
+                (*self._keyColumns(schemaKey), json.dumps(data)))
+        self._attribDefs[schemaKey] = attribDef
+
+    def _getAttribDef(self, schemaKey: SchemaKey) -> AttribDef:
+        if schemaKey not in self._attribDefs:
+            row = self._conn.execute(
+                'SELECT def FROM attrib_defs '
+                'WHERE name=? AND version=? AND issuerId=?',
+                self._keyColumns(schemaKey)).fetchone()
+            data = json.loads(row[0])
+            self._attribDefs[schemaKey] = AttribDef(
+                data['names'],
+                [[AttribType(name, encode) for name, encode in attrTypes]
+                 for attrTypes in data['attrTypes']])
+        return self._attribDefs[schemaKey]
@@ -0,0 +1,205 @@
+import asyncio
+import time
+from typing import Dict
+
+from anoncreds.protocol.cache import LRUCache, CacheStats
+from anoncreds.protocol.repo.public_repo import PublicRepo
+from anoncreds.protocol.types import ID, PublicKey, RevocationPublicKey, \
+    Schema, TailsType, Accumulator, AccumulatorPublicKey, TimestampType, \
+    SchemaKey
+
+SCHEMAS = 'schemas'
+PUBLIC_KEYS = 'publicKeys'
+REVOCATION_KEYS = 'revocationKeys'
+ACCUMULATORS = 'accumulators'
+
+
+class CachingPublicRepo(PublicRepo):
+    """
+    A PublicRepo proxy keeping bounded LRU caches in front of another repo.
+
+    Concurrent misses for the same value are served by a single call to the
+    underlying repo. Accumulators change on every issuance and revocation,
+    so they have their own (usually short) time-to-live.
+
+    A value submitted while it is being fetched wins: the fetched (older)
+    value is neither cached nor given to callers coming after the submit.
+    """
+
+    def __init__(self, repo: PublicRepo,
+                 schemasSize=1024,
+                 publicKeysSize=1024,
+                 revocationKeysSize=1024,
+                 accumulatorsSize=1024,
+                 accumulatorTtl=60,
+                 timer=time.monotonic):
+        self._repo = repo
+        self._caches = {
+            SCHEMAS: LRUCache(schemasSize, timer=timer),
+            PUBLIC_KEYS: LRUCache(publicKeysSize, timer=timer),
+            REVOCATION_KEYS: LRUCache(revocationKeysSize, timer=timer),
+            ACCUMULATORS: LRUCache(accumulatorsSize, ttl=accumulatorTtl,
+                                   timer=timer),
+        }
+        self._inflight = {}
+        # (cache name, key) -> number of submits of the value
+        self._versions = {}
+
+    @property
+    def stats(self) -> Dict[str, CacheStats]:
+        return {name: cache.stats for name, cache in self._caches.items()}
+
+    # GET
+
+    async def getSchema(self, schemaId: ID) -> Schema:
+        key = self._schemaCacheKey(schemaId)
+        if not key:
+            return await self._repo.getSchema(schemaId)
+
+        found, schema = self._caches[SCHEMAS].get(key)
+        if found:
+            return schema
+
+        schema = await self._singleFlight(
+            SCHEMAS, key, lambda: self._repo.getSchema(schemaId))
+        self._cacheSchema(schema)
+        return schema
+
+    async def getPublicKey(self,
+                           schemaId: ID,
+                           signatureType='CL') -> PublicKey:
+        return await self._getValueForId(
+            PUBLIC_KEYS, 'pk', schemaId,
+            lambda sId: self._repo.getPublicKey(sId, signatureType))
+
+    async def getPublicKeyRevocation(self,
+                                     schemaId: ID,
+                                     signatureType='CL') -> RevocationPublicKey:
+        return await self._getValueForId(
+            REVOCATION_KEYS, 'pkR', schemaId,
+            lambda sId: self._repo.getPublicKeyRevocation(sId, signatureType))
+
+    async def getPublicKeyAccumulator(self,
+                                      schemaId: ID) -> AccumulatorPublicKey:
+        return await self._getValueForId(
+            REVOCATION_KEYS, 'accumPk', schemaId,
+            self._repo.getPublicKeyAccumulator)
+
+    async def getAccumulator(self, schemaId: ID) -> Accumulator:
+        return await self._getValueForId(
+            ACCUMULATORS, 'accum', schemaId, self._repo.getAccumulator)
+
+    async def getTails(self, schemaId: ID) -> TailsType:
+        return await self._getValueForId(
+            REVOCATION_KEYS, 'tails', schemaId, self._repo.getTails)
+
+    # SUBMIT
+
+    async def submitSchema(self,
+                           schema: Schema) -> Schema:
+        schema = await self._repo.submitSchema(schema)
+        if schema:
+            self._cacheSchema(schema)
+        return schema
+
+    async def submitPublicKeys(self,
+                               schemaId: ID,
+                               pk: PublicKey,
+                               pkR: RevocationPublicKey = None,
+                               signatureType='CL') -> (
+            PublicKey, RevocationPublicKey):
+        pk, pkR = await self._repo.submitPublicKeys(schemaId, pk, pkR,
+                                                    signatureType)
+        schemaKey = await self._getSchemaKey(schemaId)
+        self._putSubmitted(PUBLIC_KEYS, ('pk', schemaKey), pk)
+        if pkR:
+            self._putSubmitted(REVOCATION_KEYS, ('pkR', schemaKey), pkR)
+        return pk, pkR
+
+    async def submitAccumulator(self, schemaId: ID,
+                                accumPK: AccumulatorPublicKey,
+                                accum: Accumulator,
+                                tails: TailsType) -> AccumulatorPublicKey:
+        accumPK = await self._repo.submitAccumulator(schemaId, accumPK, accum,
+                                                     tails)
+        schemaKey = await self._getSchemaKey(schemaId)
+        self._putSubmitted(ACCUMULATORS, ('accum', schemaKey), accum)
+        self._putSubmitted(REVOCATION_KEYS, ('accumPk', schemaKey), accumPK)
+        self._putSubmitted(REVOCATION_KEYS, ('tails', schemaKey), tails)
+        return accumPK
+
+    async def submitAccumUpdate(self, schemaId: ID, accum: Accumulator,
+                                timestampMs: TimestampType):
+        await self._repo.submitAccumUpdate(schemaId, accum, timestampMs)
+        schemaKey = await self._getSchemaKey(schemaId)
+        self._putSubmitted(ACCUMULATORS, ('accum', schemaKey), accum)
+
+    # HELPER
+
+    async def _getValueForId(self, cacheName, kind, schemaId: ID,
+                             getFromRepo):
+        schemaKey = await self._getSchemaKey(schemaId)
+        key = (kind, schemaKey)
+        found, value = self._caches[cacheName].get(key)
+        if found:
+            return value
+
+        schemaId = schemaId._replace(schemaKey=schemaKey)
+        return await self._singleFlight(cacheName, key,
+                                        lambda: getFromRepo(schemaId))
+
+    async def _singleFlight(self, cacheName, key, fetch):
+        inflightKey = (cacheName, key)
+        inflight = self._inflight.get(inflightKey)
+        if inflight:
+            self._caches[cacheName].coalesced += 1
+            return await asyncio.shield(inflight)
+
+        version = self._versions.get(inflightKey, 0)
+        future = asyncio.get_event_loop().create_future()
+        self._inflight[inflightKey] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as ex:
+            future.set_exception(ex)
+            # waiters (if any) re-raise it; don't warn when there are none
+            future.exception()
+            raise
+        else:
+            # a value submitted meanwhile may be newer than the fetched one
+            if self._versions.get(inflightKey, 0) == version:
+                self._caches[cacheName].put(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(inflightKey) is future:
+                del self._inflight[inflightKey]
+
+    def _putSubmitted(self, cacheName, key, value):
+        inflightKey = (cacheName, key)
+        self._versions[inflightKey] = self._versions.get(inflightKey, 0) + 1
+        # later gets mustn't join a fetch started before the submit
+        self._inflight.pop(inflightKey, None)
+        self._caches[cacheName].put(key, value)
+
+    async def _getSchemaKey(self, schemaId: ID) -> SchemaKey:
+        if schemaId.schemaKey:
+            return schemaId.schemaKey
+        return (await self.getSchema(schemaId)).getKey()
+
+    def _cacheSchema(self, schema: Schema):
+        cache = self._caches[SCHEMAS]
+        cache.put(('key', schema.getKey()), schema)
+        if schema.seqId:
+            cache.put(('id', schema.seqId), schema)
+
+    @staticmethod
+    def _schemaCacheKey(schemaId: ID):
+        if schemaId.schemaKey:
+            return 'key', schemaId.schemaKey
+        if schemaId.schemaId:
+            return 'id', schemaId.schemaId
+        return None
@@ -1,6 +1,8 @@
+import asyncio
 from abc import abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
 
+from anoncreds.protocol.codec import pack, unpack
 from anoncreds.protocol.types import ID, PublicKey, RevocationPublicKey, \
     Schema, TailsType, Accumulator, \
     AccumulatorPublicKey, TimestampType, SchemaKey
@@ -38,6 +40,39 @@ class PublicRepo:
     async def getTails(self, schemaId: ID) -> TailsType:
         raise NotImplementedError
 
+    # BULK GET
+    #
+    # Repos backed by a remote ledger should override these with a single
+    # round trip; the defaults just issue the single lookups concurrently.
+
+    async def getSchemas(self, schemaIds: Sequence[ID]) -> Sequence[Schema]:
+        return await asyncio.gather(
+            *[self.getSchema(schemaId) for schemaId in schemaIds])
+
+    async def getPublicKeys(self, schemaIds: Sequence[ID],
+                            signatureType='CL') -> Sequence[PublicKey]:
+        return await asyncio.gather(
+            *[self.getPublicKey(schemaId, signatureType)
+              for schemaId in schemaIds])
+
+    async def getPublicKeysRevocation(self, schemaIds: Sequence[ID],
+                                      signatureType='CL') -> \
+            Sequence[RevocationPublicKey]:
+        return await asyncio.gather(
+            *[self.getPublicKeyRevocation(schemaId, signatureType)
+              for schemaId in schemaIds])
+
+    async def getPublicKeysAccumulator(self, schemaIds: Sequence[ID]) -> \
+            Sequence[AccumulatorPublicKey]:
+        return await asyncio.gather(
+            *[self.getPublicKeyAccumulator(schemaId)
+              for schemaId in schemaIds])
+
+    async def getAccumulators(self, schemaIds: Sequence[ID]) -> \
+            Sequence[Accumulator]:
+        return await asyncio.gather(
+            *[self.getAccumulator(schemaId) for schemaId in schemaIds])
+
     # SUBMIT
 
     @abstractmethod
@@ -149,10 +184,9 @@ class PublicRepoInMemory(PublicRepo):
         accumPK = accumPK._replace(seqId=self._acumPkId)
         self._acumPkId += 1
         await self._cacheValueForId(self._accums, schemaId, accum)
-        accumPk = await self._cacheValueForId(self._accumPks, schemaId,
-                                              accumPK)
+        await self._cacheValueForId(self._accumPks, schemaId, accumPK)
         await self._cacheValueForId(self._tails, schemaId, tails)
-        return accumPk
+        return accumPK
 
     async def submitAccumUpdate(self, schemaId: ID, accum: Accumulator,
                                 timestampMs: TimestampType):
@@ -173,3 +207,160 @@ class PublicRepoInMemory(PublicRepo):
         schema = await self.getSchema(schemaId)
         schemaKey = schema.getKey()
         dictionary[schemaKey] = value
+
+
+class PublicRepoSqlite(PublicRepo):
+    """
+    A PublicRepo persisted in a SQLite database.
+
+    Keys and accumulators are stored pickled, so the database must only
+    be opened from a trusted location.
+    """
+
+    PK = 'pk'
+    PK_R = 'pkR'
+    ACCUM_PK = 'accumPk'
+    ACCUM = 'accum'
+    TAILS = 'tails'
+
+    def __init__(self, path=':memory:'):
+        # imported here rather than with the module, so that importing the
+        # protocol doesn't pay for the SQLite and pickle modules
+        import sqlite3
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS schemas (
+                seqId INTEGER PRIMARY KEY,
+                name TEXT, version TEXT, issuerId TEXT, value BLOB,
+                UNIQUE (name, version, issuerId));
+            CREATE TABLE IF NOT EXISTS public_values (
+                kind TEXT, schemaSeqId INTEGER, seqId INTEGER, value BLOB,
+                PRIMARY KEY (kind, schemaSeqId)) WITHOUT ROWID;
+        ''')
+
+    def close(self):
+        self._conn.close()
+
+    # GET
+
+    async def getSchema(self, schemaId: ID) -> Schema:
+        row = None
+        if schemaId.schemaKey:
+            row = self._conn.execute(
+                'SELECT value FROM schemas '
+                'WHERE name=? AND version=? AND issuerId=?',
+                tuple(schemaId.schemaKey)).fetchone()
+        if not row and schemaId.schemaId:
+            row = self._conn.execute(
+                'SELECT value FROM schemas WHERE seqId=?',
+                (schemaId.schemaId,)).fetchone()
+        if not row:
+            raise KeyError(
+                'No schema with ID={} and key={}'.format(
+                    schemaId.schemaId,
+                    schemaId.schemaKey))
+        return self._load(row[0])
+
+    async def getPublicKey(self,
+                           schemaId: ID,
+                           signatureType='CL') -> PublicKey:
+        return await self._getValueForId(self.PK, schemaId)
+
+    async def getPublicKeyRevocation(self,
+                                     schemaId: ID,
+                                     signatureType='CL') -> RevocationPublicKey:
+        return await self._getValueForId(self.PK_R, schemaId)
+
+    async def getPublicKeyAccumulator(self,
+                                      schemaId: ID) -> AccumulatorPublicKey:
+        return await self._getValueForId(self.ACCUM_PK, schemaId)
+
+    async def getAccumulator(self, schemaId: ID) -> Accumulator:
+        return await self._getValueForId(self.ACCUM, schemaId)
+
+    async def getTails(self, schemaId: ID) -> TailsType:
+        return await self._getValueForId(self.TAILS, schemaId)
+
+    # SUBMIT
+
+    async def submitSchema(self,
+                           schema: Schema) -> Schema:
+        with self._conn:
+            # a schema submitted again keeps its seqId, which the keys and
+            # accumulators stored for it refer to
+            self._conn.execute(
+                'INSERT OR IGNORE INTO schemas '
+                '(name, version, issuerId) VALUES (?, ?, ?)',
+                tuple(schema.getKey()))
+            seqId = self._conn.execute(
+                'SELECT seqId FROM schemas '
+                'WHERE name=? AND version=? AND issuerId=?',
+                tuple(schema.getKey())).fetchone()[0]
+            schema = schema._replace(seqId=seqId)
+            self._conn.execute('UPDATE schemas SET value=? WHERE seqId=?',
+                               (self._dump(schema), schema.seqId))
+        return schema
+
+    async def submitPublicKeys(self,
+                               schemaId: ID,
+                               pk: PublicKey,
+                               pkR: RevocationPublicKey = None,
+                               signatureType='CL') -> (
+            PublicKey, RevocationPublicKey):
+        pk = await self._putValueForId(self.PK, schemaId, pk)
+        if pkR:
+            pkR = await self._putValueForId(self.PK_R, schemaId, pkR)
+        return pk, pkR
+
+    async def submitAccumulator(self, schemaId: ID,
+                                accumPK: AccumulatorPublicKey,
+                                accum: Accumulator,
+                                tails: TailsType) -> AccumulatorPublicKey:
+        accumPK = await self._putValueForId(self.ACCUM_PK, schemaId, accumPK)
+        await self._putValueForId(self.ACCUM, schemaId, accum)
+        await self._putValueForId(self.TAILS, schemaId, tails)
+        return accumPK
+
+    async def submitAccumUpdate(self, schemaId: ID, accum: Accumulator,
+                                timestampMs: TimestampType):
+        await self._putValueForId(self.ACCUM, schemaId, accum)
+
+    async def _getValueForId(self, kind, schemaId: ID) -> Any:
+        schema = await self.getSchema(schemaId)
+        row = self._conn.execute(
+            'SELECT value FROM public_values WHERE kind=? AND schemaSeqId=?',
+            (kind, schema.seqId)).fetchone()
+        if not row:
+            raise ValueError(
+                'No value for schema with ID={} and key={}'.format(
+                    schemaId.schemaId, schemaId.schemaKey))
+        return self._load(row[0])
+
+    async def _putValueForId(self, kind, schemaId: ID, value):
+        """
+        Stores the value, numbering keys (namedtuples with a seqId) per
+        kind as PublicRepoInMemory does.
+        """
+        schema = await self.getSchema(schemaId)
+        with self._conn:
+            seqId = None
+            if hasattr(value, 'seqId'):
+                seqId = self._conn.execute(
+                    'SELECT COALESCE(MAX(seqId), 0) + 1 FROM public_values '
+                    'WHERE kind=?', (kind,)).fetchone()[0]
+                value = value._replace(seqId=seqId)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO public_values '
+                '(kind, schemaSeqId, seqId, value) VALUES (?, ?, ?, ?)',
+                (kind, schema.seqId, seqId, self._dump(value)))
+        return value
+
+    @staticmethod
+    def _dump(value) -> bytes:
+        import pickle
+        return pickle.dumps(pack(value), protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _load(data: bytes):
+        import pickle
+        return unpack(pickle.loads(data))
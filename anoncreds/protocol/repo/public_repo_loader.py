@@ -0,0 +1,150 @@
+import asyncio
+
+from anoncreds.protocol.repo.public_repo import PublicRepo
+from anoncreds.protocol.types import ID, PublicKey, RevocationPublicKey, \
+    Schema, TailsType, Accumulator, AccumulatorPublicKey, TimestampType
+
+
+class BatchLoader:
+    """
+    Gathers the keys requested during one event-loop tick and resolves them
+    with a single call to a bulk function.
+
+    If the bulk call fails (or doesn't return a value for every key), every
+    key of the batch is retried with the single lookup, so one bad key does
+    not fail unrelated requests.
+    """
+
+    def __init__(self, bulkFn, singleFn):
+        self._bulkFn = bulkFn
+        self._singleFn = singleFn
+        self._queue = []
+        self.batches = 0
+
+    def load(self, key) -> asyncio.Future:
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        if not self._queue:
+            loop.call_soon(self._dispatch)
+        self._queue.append((key, future))
+        return future
+
+    def _dispatch(self):
+        queue, self._queue = self._queue, []
+        asyncio.ensure_future(self._resolve(queue))
+
+    async def _resolve(self, queue):
+        keys = list(dict.fromkeys(key for key, _ in queue))
+        self.batches += 1
+        try:
+            try:
+                results = list(await self._bulkFn(keys))
+                if len(results) != len(keys):
+                    raise ValueError('Bulk lookup returned {} values for {} '
+                                     'keys'.format(len(results), len(keys)))
+                values = dict(zip(keys, results))
+            except Exception:
+                values = {}
+                for key in keys:
+                    try:
+                        values[key] = await self._singleFn(key)
+                    except Exception as ex:
+                        values[key] = ex
+
+            for key, future in queue:
+                if future.done():
+                    continue
+                value = values[key]
+                if isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
+        finally:
+            # e.g. cancelled: don't leave the callers waiting forever
+            for key, future in queue:
+                if not future.done():
+                    future.set_exception(RuntimeError(
+                        'Lookup of {} was interrupted'.format(key)))
+
+
+class PublicRepoLoader(PublicRepo):
+    """
+    A PublicRepo proxy that coalesces the single lookups made in the same
+    event-loop tick into bulk calls on the wrapped repo.
+    """
+
+    def __init__(self, repo: PublicRepo):
+        self._repo = repo
+        self._schemas = BatchLoader(repo.getSchemas, repo.getSchema)
+        self._pks = {}
+        self._pkRs = {}
+        self._accumPks = BatchLoader(repo.getPublicKeysAccumulator,
+                                     repo.getPublicKeyAccumulator)
+        self._accums = BatchLoader(repo.getAccumulators, repo.getAccumulator)
+
+    # GET
+
+    async def getSchema(self, schemaId: ID) -> Schema:
+        return await self._schemas.load(schemaId)
+
+    async def getPublicKey(self,
+                           schemaId: ID,
+                           signatureType='CL') -> PublicKey:
+        loader = self._loaderFor(self._pks, signatureType,
+                                 self._repo.getPublicKeys,
+                                 self._repo.getPublicKey)
+        return await loader.load(schemaId)
+
+    async def getPublicKeyRevocation(self,
+                                     schemaId: ID,
+                                     signatureType='CL') -> RevocationPublicKey:
+        loader = self._loaderFor(self._pkRs, signatureType,
+                                 self._repo.getPublicKeysRevocation,
+                                 self._repo.getPublicKeyRevocation)
+        return await loader.load(schemaId)
+
+    async def getPublicKeyAccumulator(self,
+                                      schemaId: ID) -> AccumulatorPublicKey:
+        return await self._accumPks.load(schemaId)
+
+    async def getAccumulator(self, schemaId: ID) -> Accumulator:
+        return await self._accums.load(schemaId)
+
+    async def getTails(self, schemaId: ID) -> TailsType:
+        return await self._repo.getTails(schemaId)
+
+    # SUBMIT
+
+    async def submitSchema(self,
+                           schema: Schema) -> Schema:
+        return await self._repo.submitSchema(schema)
+
+    async def submitPublicKeys(self,
+                               schemaId: ID,
+                               pk: PublicKey,
+                               pkR: RevocationPublicKey = None,
+                               signatureType='CL') -> (
+            PublicKey, RevocationPublicKey):
+        return await self._repo.submitPublicKeys(schemaId, pk, pkR,
+                                                 signatureType)
+
+    async def submitAccumulator(self, schemaId: ID,
+                                accumPK: AccumulatorPublicKey,
+                                accum: Accumulator,
+                                tails: TailsType) -> AccumulatorPublicKey:
+        return await self._repo.submitAccumulator(schemaId, accumPK, accum,
+                                                  tails)
+
+    async def submitAccumUpdate(self, schemaId: ID, accum: Accumulator,
+                                timestampMs: TimestampType):
+        await self._repo.submitAccumUpdate(schemaId, accum, timestampMs)
+
+    # HELPER
+
+    @staticmethod
+    def _loaderFor(loaders, signatureType, bulkFn, singleFn) -> BatchLoader:
+        if signatureType not in loaders:
+            loaders[signatureType] = BatchLoader(
+                lambda ids: bulkFn(ids, signatureType),
+                lambda schemaId: singleFn(schemaId, signatureType))
+        return loaders[signatureType]
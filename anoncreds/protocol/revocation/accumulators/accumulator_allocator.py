@@ -0,0 +1,43 @@
+import asyncio
+
+from anoncreds.protocol.types import ID, Accumulator
+from anoncreds.protocol.wallet.wallet import Wallet
+
+
+class AccumulatorAllocator:
+    """
+    Serializes the changes of a schema's accumulator, so that claims can be
+    issued concurrently.
+
+    An index is reserved first (reserve), the claim is signed without
+    holding any lock, and the claim is then added to the accumulator while
+    holding the schema's lock (lock). Issuers sharing a wallet must share
+    the allocator too.
+    """
+
+    def __init__(self, wallet: Wallet):
+        self._wallet = wallet
+        self._locks = {}
+
+    async def lock(self, schemaId: ID) -> asyncio.Lock:
+        """
+        The lock guarding the accumulator of the given schema.
+        """
+        schemaKey = (await self._wallet.getSchema(schemaId)).getKey()
+        return self._locks.setdefault(schemaKey, asyncio.Lock())
+
+    async def reserve(self, schemaId: ID, i=None) -> (int, Accumulator):
+        """
+        Reserves an index in the schema's accumulator.
+
+        :param i: the index to use; the next free one if None
+        :return: the index and the accumulator
+        """
+        async with await self.lock(schemaId):
+            accum = await self._wallet.getAccumulator(schemaId)
+            if accum.isFull():
+                raise ValueError(
+                    "Accumulator is full. New one must be issued.")
+            i = i if i else accum.currentI
+            accum.currentI += 1
+            return i, accum
@@ -1,113 +1,162 @@
-from anoncreds.protocol.globals import PAIRING_GROUP
+from anoncreds.protocol.executor import CryptoExecutor
+from anoncreds.protocol.instrumentation import span
+from anoncreds.protocol.revocation.accumulators.accumulator_allocator import \
+    AccumulatorAllocator
 from anoncreds.protocol.types import NonRevocationClaim, RevocationPublicKey, \
     RevocationSecretKey, \
     Accumulator, TailsType, AccumulatorPublicKey, AccumulatorSecretKey, Witness, \
     ID, TimestampType
-from anoncreds.protocol.utils import currentTimestampMillisec, groupIdentityG1
+from anoncreds.protocol.utils import currentTimestampMillisec, groupIdentityG1, \
+    pairingGroup
 from anoncreds.protocol.wallet.issuer_wallet import IssuerWallet
 from config.config import cmod
 
 
 class NonRevocationClaimIssuer:
-    def __init__(self, wallet: IssuerWallet):
+    def __init__(self, wallet: IssuerWallet, executor: CryptoExecutor = None,
+                 allocator: AccumulatorAllocator = None):
         self._wallet = wallet
+        self._executor = executor or CryptoExecutor()
+        self._allocator = allocator or AccumulatorAllocator(wallet)
 
     async def genRevocationKeys(self) -> (
             RevocationPublicKey, RevocationSecretKey):
-        group = cmod.PairingGroup(
-            PAIRING_GROUP)  # super singular curve, 1024 bits
-
-        h = group.random(cmod.G1)  # random element of the group G
-        h0 = group.random(cmod.G1)
-        h1 = group.random(cmod.G1)
-        h2 = group.random(cmod.G1)
-        g = group.random(cmod.G1)
-        htilde = group.random(cmod.G1)
-        u = group.random(cmod.G1)
-
-        qr = group.order()  # order q_R of the group
-
-        x = group.random(cmod.ZR)  # random(qr)
-        sk = group.random(cmod.ZR)  # random(qr)
-
-        pk = g ** sk
-        y = h ** x
-
-        return (RevocationPublicKey(qr, g, h, h0, h1, h2, htilde, u, pk, y, x),
-                RevocationSecretKey(x, sk))
+        return await self._executor.run(genRevocationKeys)
 
     async def issueAccumulator(self, schemaId, iA, L) \
             -> (
                     Accumulator, TailsType, AccumulatorPublicKey,
                     AccumulatorSecretKey):
         pkR = await self._wallet.getPublicKeyRevocation(schemaId)
-        group = cmod.PairingGroup(PAIRING_GROUP)
-        gamma = group.random(cmod.ZR)
-
-        g = {}
-        gCount = 2 * L
-        for i in range(gCount):
-            if i != L + 1:
-                g[i] = pkR.g ** (gamma ** i)
-        z = cmod.pair(pkR.g, pkR.g) ** (gamma ** (L + 1))
-
-        acc = 1
-        V = set()
+        return await self._executor.run(genAccumulator, pkR, iA, L)
 
-        accPK = AccumulatorPublicKey(z)
-        accSK = AccumulatorSecretKey(gamma)
-        accum = Accumulator(iA, acc, V, L)
-        return accum, g, accPK, accSK
-
-    async def issueNonRevocationClaim(self, schemaId: ID, Ur, iA, i) -> (
+    async def issueNonRevocationClaim(self, schemaId: ID, Ur, iA, i,
+                                      m2=None) -> (
             NonRevocationClaim, Accumulator, TimestampType):
-        accum = await self._wallet.getAccumulator(schemaId)
+        """
+        Issues a non-revocation claim and adds it to the accumulator. The
+        updated accumulator is submitted to the wallet before the lock of
+        the accumulator is released.
+
+        :param m2: the claim's context attribute (the one in the wallet if
+        None)
+        """
         pkR = await self._wallet.getPublicKeyRevocation(schemaId)
         skR = await self._wallet.getSecretKeyRevocation(schemaId)
         g = await self._wallet.getTails(schemaId)
         skAccum = await self._wallet.getSecretKeyAccumulator(schemaId)
-        m2 = await self._wallet.getContextAttr(schemaId)
-
-        if accum.isFull():
-            raise ValueError("Accumulator is full. New one must be issued.")
+        if m2 is None:
+            m2 = await self._wallet.getContextAttr(schemaId)
 
-        # TODO: currently all revo creds are issued sequentially
-        group = cmod.PairingGroup(
-            PAIRING_GROUP)  # super singular curve, 1024 bits
+        i, accum = await self._allocator.reserve(schemaId, i)
+        with span('issuer.sign.nonrevoc'):
+            sigma, c, vrPrimeprime, sigmai, ui = await self._executor.run(
+                signNonRevocationClaim, pkR, skR, skAccum, g, m2, Ur, i)
 
-        i = i if i else accum.currentI
-        accum.currentI += 1
-        vrPrimeprime = group.random(cmod.ZR)
-        c = group.random(cmod.ZR)
+        with span('issuer.witness_update'):
+            async with await self._allocator.lock(schemaId):
+                accum = await self._wallet.getAccumulator(schemaId)
+                omega = groupIdentityG1()
+                for j in accum.V:
+                    omega *= g[accum.L + 1 - j + i]
 
-        m2 = group.init(cmod.ZR, int(m2))
-        sigma = (pkR.h0 * (pkR.h1 ** m2) * Ur * g[i] * (
-            pkR.h2 ** vrPrimeprime)) ** (1 / (skR.x + c))
-        omega = groupIdentityG1()
-        for j in accum.V:
-            omega *= g[accum.L + 1 - j + i]
+                accum.acc *= g[accum.L + 1 - i]
+                accum.V.add(i)
 
-        sigmai = pkR.g ** (1 / (skR.sk + (skAccum.gamma ** i)))
-        ui = pkR.u ** (skAccum.gamma ** i)
+                witness = Witness(sigmai, ui, g[i], omega, accum.V.copy())
 
-        accum.acc *= g[accum.L + 1 - i]
-        accum.V.add(i)
+                ts = currentTimestampMillisec()
+                await self._wallet.submitAccumUpdate(
+                    schemaId=schemaId, accum=accum, timestampMs=ts)
 
-        witness = Witness(sigmai, ui, g[i], omega, accum.V.copy())
-
-        ts = currentTimestampMillisec()
+        group = pairingGroup()
         return (
             NonRevocationClaim(accum.iA, sigma, c, vrPrimeprime, witness, g[i],
                                i,
-                               m2), accum, ts)
+                               group.init(cmod.ZR, int(m2))), accum, ts)
 
     async def revoke(self, schemaId: ID, i) -> (Accumulator, TimestampType):
-        accum = await self._wallet.getAccumulator(schemaId)
-        tails = await self._wallet.getTails(schemaId)
+        """
+        Removes a claim from the accumulator and submits the updated
+        accumulator to the wallet.
+        """
+        async with await self._allocator.lock(schemaId):
+            accum = await self._wallet.getAccumulator(schemaId)
+            tails = await self._wallet.getTails(schemaId)
 
-        accum.V.discard(i)
-        accum.acc /= tails[accum.L + 1 - i]
+            accum.V.discard(i)
+            accum.acc /= tails[accum.L + 1 - i]
 
-        ts = currentTimestampMillisec()
+            ts = currentTimestampMillisec()
+            await self._wallet.submitAccumUpdate(schemaId=schemaId,
+                                                 accum=accum, timestampMs=ts)
 
         return accum, ts
+
+
+def signNonRevocationClaim(pkR: RevocationPublicKey, skR: RevocationSecretKey,
+                           skAccum: AccumulatorSecretKey, g: TailsType, m2,
+                           Ur, i):
+    """
+    The part of non-revocation claim issuance that doesn't depend on the
+    accumulator's state.
+
+    :return: sigma, c, vrPrimeprime, sigmai, ui
+    """
+    group = pairingGroup()
+
+    vrPrimeprime = group.random(cmod.ZR)
+    c = group.random(cmod.ZR)
+
+    m2 = group.init(cmod.ZR, int(m2))
+    sigma = (pkR.h0 * (pkR.h1 ** m2) * Ur * g[i] * (
+        pkR.h2 ** vrPrimeprime)) ** (1 / (skR.x + c))
+
+    sigmai = pkR.g ** (1 / (skR.sk + (skAccum.gamma ** i)))
+    ui = pkR.u ** (skAccum.gamma ** i)
+    return sigma, c, vrPrimeprime, sigmai, ui
+
+
+def genRevocationKeys() -> (RevocationPublicKey, RevocationSecretKey):
+    group = pairingGroup()
+
+    h = group.random(cmod.G1)  # random element of the group G
+    h0 = group.random(cmod.G1)
+    h1 = group.random(cmod.G1)
+    h2 = group.random(cmod.G1)
+    g = group.random(cmod.G1)
+    htilde = group.random(cmod.G1)
+    u = group.random(cmod.G1)
+
+    qr = group.order()  # order q_R of the group
+
+    x = group.random(cmod.ZR)  # random(qr)
+    sk = group.random(cmod.ZR)  # random(qr)
+
+    pk = g ** sk
+    y = h ** x
+
+    return (RevocationPublicKey(qr, g, h, h0, h1, h2, htilde, u, pk, y, x),
+            RevocationSecretKey(x, sk))
+
+
+def genAccumulator(pkR: RevocationPublicKey, iA, L) \
+        -> (Accumulator, TailsType, AccumulatorPublicKey,
+            AccumulatorSecretKey):
+    group = pairingGroup()
+    gamma = group.random(cmod.ZR)
+
+    g = {}
+    gCount = 2 * L
+    for i in range(gCount + 1):
+        if i != L + 1:
+            g[i] = pkR.g ** (gamma ** i)
+    z = cmod.pair(pkR.g, pkR.g) ** (gamma ** (L + 1))
+
+    acc = 1
+    V = set()
+
+    accPK = AccumulatorPublicKey(z)
+    accSK = AccumulatorSecretKey(gamma)
+    accum = Accumulator(iA, acc, V, L)
+    return accum, g, accPK, accSK
@@ -1,11 +1,12 @@
-from anoncreds.protocol.globals import PAIRING_GROUP
+from anoncreds.protocol.executor import CryptoExecutor
 from anoncreds.protocol.revocation.accumulators.non_revocation_common import \
     createTauListValues, \
     createTauListExpectedValues
 from anoncreds.protocol.types import NonRevocationClaim, NonRevocInitProof, \
     NonRevocProofXList, NonRevocProofCList, NonRevocProof, \
-    ID, ClaimInitDataType
-from anoncreds.protocol.utils import int_to_ZR
+    ID, ClaimInitDataType, RevocationPublicKey, Accumulator, \
+    NonRevocPrecomputed
+from anoncreds.protocol.utils import int_to_ZR, pairingGroup
 from anoncreds.protocol.wallet.prover_wallet import ProverWallet
 from config.config import cmod
 
@@ -15,8 +16,7 @@ class NonRevocationClaimInitializer:
         self._wallet = wallet
 
     async def genClaimInitData(self, schemaId: ID) -> ClaimInitDataType:
-        group = cmod.PairingGroup(
-            PAIRING_GROUP)  # super singular curve, 1024 bits
+        group = pairingGroup()
         pkR = await self._wallet.getPublicKeyRevocation(schemaId)
 
         vrPrime = group.random(cmod.ZR)
@@ -36,6 +36,10 @@ class NonRevocationClaimInitializer:
     async def _testWitnessCredential(self, schemaid: ID,
                                      claim: NonRevocationClaim):
         pkR = await self._wallet.getPublicKeyRevocation(schemaid)
+        # the claim's witness is for the accumulator the issuer has just
+        # submitted, not the one cached with an earlier claim
+        if await self._wallet.shouldUpdateAccumulator(schemaId=schemaid):
+            await self._wallet.updateAccumulator(schemaId=schemaid)
         acc = await self._wallet.getAccumulator(schemaid)
         accPk = await self._wallet.getPublicKeyAccumulator(schemaid)
         m2 = int(await self._wallet.getContextAttr(schemaid))
@@ -60,8 +64,9 @@ class NonRevocationClaimInitializer:
 
 
 class NonRevocationProofBuilder:
-    def __init__(self, wallet: ProverWallet):
+    def __init__(self, wallet: ProverWallet, executor: CryptoExecutor = None):
         self._wallet = wallet
+        self._executor = executor or CryptoExecutor()
 
     async def updateNonRevocationClaim(self, schemaId,
                                        c2: NonRevocationClaim, ts=None,
@@ -102,8 +107,9 @@ class NonRevocationProofBuilder:
 
         return c2
 
-    async def initProof(self, schemaId,
-                        c2: NonRevocationClaim) -> NonRevocInitProof:
+    async def initProof(self, schemaId, c2: NonRevocationClaim,
+                        precomputed: NonRevocPrecomputed = None) \
+            -> NonRevocInitProof:
         if not c2:
             return None
 
@@ -111,28 +117,20 @@ class NonRevocationProofBuilder:
 
         pkR = await self._wallet.getPublicKeyRevocation(ID(schemaId=schemaId))
         accum = await self._wallet.getAccumulator(ID(schemaId=schemaId))
-        CList = []
-        TauList = []
-
-        cListParams = self._genCListParams(schemaId, c2)
-        proofCList = self._createCListValues(schemaId, c2, cListParams, pkR)
-        CList.extend(proofCList.asList())
+        return await self._executor.run(initNonRevocProof, c2, pkR, accum,
+                                        precomputed)
 
-        tauListParams = self._genTauListParams(schemaId)
-        proofTauList = createTauListValues(pkR, accum, tauListParams,
-                                           proofCList)
-        TauList.extend(proofTauList.asList())
-
-        return NonRevocInitProof(proofCList, proofTauList, cListParams,
-                                 tauListParams)
+    async def precompute(self, schemaId, c2: NonRevocationClaim) \
+            -> NonRevocPrecomputed:
+        pkR = await self._wallet.getPublicKeyRevocation(ID(schemaId=schemaId))
+        return await self._executor.run(precomputeNonRevocProof, c2, pkR)
 
     async def finalizeProof(self, schemaId, cH,
                             initProof: NonRevocInitProof) -> NonRevocProof:
         if not initProof:
             return None
 
-        group = cmod.PairingGroup(
-            PAIRING_GROUP)  # super singular curve, 1024 bits
+        group = pairingGroup()
         chNum_z = int_to_ZR(cH, group)
         XList = NonRevocProofXList.fromList(
             [x - chNum_z * y for x, y in zip(initProof.TauListParams.asList(),
@@ -140,53 +138,14 @@ class NonRevocationProofBuilder:
         )
         return NonRevocProof(XList, initProof.CList)
 
-    def _genCListParams(self, schemaId,
-                        c2: NonRevocationClaim) -> NonRevocProofXList:
-        group = cmod.PairingGroup(
-            PAIRING_GROUP)  # super singular curve, 1024 bits
-        rho = group.random(cmod.ZR)
-        r = group.random(cmod.ZR)
-        rPrime = group.random(cmod.ZR)
-        rPrimePrime = group.random(cmod.ZR)
-        rPrimePrimePrime = group.random(cmod.ZR)
-        o = group.random(cmod.ZR)
-        oPrime = group.random(cmod.ZR)
-        m = rho * c2.c
-        mPrime = r * rPrimePrime
-        t = o * c2.c
-        tPrime = oPrime * rPrimePrime
-        m2 = group.init(cmod.ZR, int(c2.m2))
-        return NonRevocProofXList(rho=rho, r=r, rPrime=rPrime,
-                                  rPrimePrime=rPrimePrime,
-                                  rPrimePrimePrime=rPrimePrimePrime,
-                                  o=o, oPrime=oPrime, m=m, mPrime=mPrime, t=t,
-                                  tPrime=tPrime, m2=m2, s=c2.v, c=c2.c)
-
-    def _createCListValues(self, schemaId, c2: NonRevocationClaim,
-                           params: NonRevocProofXList,
-                           pkR) -> NonRevocProofCList:
-        E = (pkR.h ** params.rho) * (pkR.htilde ** params.o)
-        D = (pkR.g ** params.r) * (pkR.htilde ** params.oPrime)
-        A = c2.sigma * (pkR.htilde ** params.rho)
-        G = c2.gi * (pkR.htilde ** params.r)
-        W = c2.witness.omega * (pkR.htilde ** params.rPrime)
-        S = c2.witness.sigmai * (pkR.htilde ** params.rPrimePrime)
-        U = c2.witness.ui * (pkR.htilde ** params.rPrimePrimePrime)
-        return NonRevocProofCList(E, D, A, G, W, S, U)
-
-    def _genTauListParams(self, schemaId) -> NonRevocProofXList:
-        group = cmod.PairingGroup(
-            PAIRING_GROUP)  # super singular curve, 1024 bits
-        return NonRevocProofXList(group=group)
-
     async def testProof(self, schemaId, c2: NonRevocationClaim):
         pkR = await self._wallet.getPublicKeyRevocation(ID(schemaId=schemaId))
         accum = await self._wallet.getAccumulator(ID(schemaId=schemaId))
         accumPk = await self._wallet.getPublicKeyAccumulator(
             ID(schemaId=schemaId))
 
-        cListParams = self._genCListParams(schemaId, c2)
-        proofCList = self._createCListValues(schemaId, c2, cListParams, pkR)
+        cListParams = _genCListParams(c2)
+        proofCList = _createCListValues(c2, cListParams, pkR)
         proofTauList = createTauListValues(pkR, accum, cListParams, proofCList)
 
         proofTauListCalc = createTauListExpectedValues(pkR, accum, accumPk,
@@ -196,3 +155,78 @@ class NonRevocationProofBuilder:
             raise ValueError("revocation proof is incorrect")
 
         return True
+
+
+def initNonRevocProof(c2: NonRevocationClaim, pkR: RevocationPublicKey,
+                      accum: Accumulator,
+                      precomputed: NonRevocPrecomputed = None) \
+        -> NonRevocInitProof:
+    if not precomputed:
+        precomputed = precomputeNonRevocProof(c2, pkR)
+
+    proofCList = _completeCListValues(c2, precomputed)
+    proofTauList = createTauListValues(pkR, accum, precomputed.TauListParams,
+                                       proofCList)
+
+    return NonRevocInitProof(proofCList, proofTauList,
+                             precomputed.CListParams,
+                             precomputed.TauListParams)
+
+
+def precomputeNonRevocProof(c2: NonRevocationClaim,
+                            pkR: RevocationPublicKey) -> NonRevocPrecomputed:
+    return _precomputeCListValues(c2, _genCListParams(c2), pkR,
+                                  _genTauListParams())
+
+
+def _genCListParams(c2: NonRevocationClaim) -> NonRevocProofXList:
+    group = pairingGroup()
+    rho = group.random(cmod.ZR)
+    r = group.random(cmod.ZR)
+    rPrime = group.random(cmod.ZR)
+    rPrimePrime = group.random(cmod.ZR)
+    rPrimePrimePrime = group.random(cmod.ZR)
+    o = group.random(cmod.ZR)
+    oPrime = group.random(cmod.ZR)
+    m = rho * c2.c
+    mPrime = r * rPrimePrime
+    t = o * c2.c
+    tPrime = oPrime * rPrimePrime
+    m2 = group.init(cmod.ZR, int(c2.m2))
+    return NonRevocProofXList(rho=rho, r=r, rPrime=rPrime,
+                              rPrimePrime=rPrimePrime,
+                              rPrimePrimePrime=rPrimePrimePrime,
+                              o=o, oPrime=oPrime, m=m, mPrime=mPrime, t=t,
+                              tPrime=tPrime, m2=m2, s=c2.v, c=c2.c)
+
+
+def _createCListValues(c2: NonRevocationClaim, params: NonRevocProofXList,
+                       pkR) -> NonRevocProofCList:
+    return _completeCListValues(c2, _precomputeCListValues(c2, params, pkR))
+
+
+def _precomputeCListValues(c2: NonRevocationClaim, params: NonRevocProofXList,
+                           pkR, tauListParams: NonRevocProofXList = None) \
+        -> NonRevocPrecomputed:
+    E = (pkR.h ** params.rho) * (pkR.htilde ** params.o)
+    D = (pkR.g ** params.r) * (pkR.htilde ** params.oPrime)
+    A = c2.sigma * (pkR.htilde ** params.rho)
+    G = c2.gi * (pkR.htilde ** params.r)
+    S = c2.witness.sigmai * (pkR.htilde ** params.rPrimePrime)
+    U = c2.witness.ui * (pkR.htilde ** params.rPrimePrimePrime)
+    return NonRevocPrecomputed(c2.gi, params, tauListParams, E, D, A, G, S, U,
+                               pkR.htilde ** params.rPrime)
+
+
+def _completeCListValues(c2: NonRevocationClaim,
+                         precomputed: NonRevocPrecomputed) \
+        -> NonRevocProofCList:
+    # omega changes with the accumulator, so W is computed on every proof
+    W = c2.witness.omega * precomputed.htildeRPrime
+    return NonRevocProofCList(precomputed.E, precomputed.D, precomputed.A,
+                              precomputed.G, W, precomputed.S, precomputed.U)
+
+
+def _genTauListParams() -> NonRevocProofXList:
+    group = pairingGroup()
+    return NonRevocProofXList(group=group)
@@ -1,22 +1,42 @@
 from typing import Sequence
 
-from anoncreds.protocol.globals import PAIRING_GROUP
+from anoncreds.protocol.executor import CryptoExecutor
 from anoncreds.protocol.revocation.accumulators.non_revocation_common import \
     createTauListExpectedValues, \
     createTauListValues
-from anoncreds.protocol.types import T, NonRevocProof, ID, ProofRequest
-from anoncreds.protocol.utils import int_to_ZR
+from anoncreds.protocol.types import T, NonRevocProof, ID, ProofRequest, \
+    RevocationPublicKey, Accumulator, AccumulatorPublicKey
+from anoncreds.protocol.utils import int_to_ZR, pairingGroup
 from anoncreds.protocol.wallet.wallet import Wallet
 from config.config import cmod
 
 
 class NonRevocationProofVerifier:
-    def __init__(self, wallet: Wallet):
+    def __init__(self, wallet: Wallet, executor: CryptoExecutor = None):
         self._wallet = wallet
+        self._executor = executor or CryptoExecutor()
 
     async def verifyNonRevocation(self, proofRequest: ProofRequest, schema_seq_no,
-                                  cHash, nonRevocProof: NonRevocProof) \
-            -> Sequence[T]:
+                                  cHash, nonRevocProof: NonRevocProof,
+                                  accum: Accumulator = None) -> Sequence[T]:
+        """
+        :param accum: the accumulator to check the proof against; refreshed
+        if not given
+        """
+        if accum is None:
+            accum = await self.refreshAccumulator(proofRequest, schema_seq_no)
+        pkR = await self._wallet.getPublicKeyRevocation(ID(schemaId=schema_seq_no))
+        accumPk = await self._wallet.getPublicKeyAccumulator(ID(schemaId=schema_seq_no))
+
+        return await self._executor.run(calcNonRevocTHat, pkR, accum, accumPk,
+                                        cHash, nonRevocProof)
+
+    async def refreshAccumulator(self, proofRequest: ProofRequest,
+                                 schema_seq_no) -> Accumulator:
+        """
+        Updates the accumulator the proof is to be checked against, if
+        needed.
+        """
         if await self._wallet.shouldUpdateAccumulator(
                 schemaId=ID(seqId=schema_seq_no),
                 ts=proofRequest.ts,
@@ -24,19 +44,19 @@ class NonRevocationProofVerifier:
             await self._wallet.updateAccumulator(schemaId=ID(schemaId=schema_seq_no),
                                                  ts=proofRequest.ts,
                                                  seqNo=proofRequest.seqNo)
+        return await self._wallet.getAccumulator(ID(schemaId=schema_seq_no))
 
-        pkR = await self._wallet.getPublicKeyRevocation(ID(schemaId=schema_seq_no))
-        accum = await self._wallet.getAccumulator(ID(schemaId=schema_seq_no))
-        accumPk = await self._wallet.getPublicKeyAccumulator(ID(schemaId=schema_seq_no))
 
-        CProof = nonRevocProof.CProof
-        XList = nonRevocProof.XList
+def calcNonRevocTHat(pkR: RevocationPublicKey, accum: Accumulator,
+                     accumPk: AccumulatorPublicKey, cHash,
+                     nonRevocProof: NonRevocProof) -> Sequence[T]:
+    CProof = nonRevocProof.CProof
+    XList = nonRevocProof.XList
 
-        group = cmod.PairingGroup(
-            PAIRING_GROUP)  # super singular curve, 1024 bits
-        THatExpected = createTauListExpectedValues(pkR, accum, accumPk, CProof)
-        THatCalc = createTauListValues(pkR, accum, XList, CProof)
-        chNum_z = int_to_ZR(cHash, group)
+    group = pairingGroup()
+    THatExpected = createTauListExpectedValues(pkR, accum, accumPk, CProof)
+    THatCalc = createTauListValues(pkR, accum, XList, CProof)
+    chNum_z = int_to_ZR(cHash, group)
 
-        return [(x ** chNum_z) * y for x, y in
-                zip(THatExpected.asList(), THatCalc.asList())]
+    return [(x ** chNum_z) * y for x, y in
+            zip(THatExpected.asList(), THatCalc.asList())]
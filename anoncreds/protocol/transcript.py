@@ -0,0 +1,42 @@
+from hashlib import sha256
+
+from anoncreds.protocol.op_counter import countHash
+from anoncreds.protocol.utils import hashEncoding, bytes_to_int
+
+
+class Transcript:
+    """
+    The values the Fiat-Shamir challenge of a proof is computed from. Each
+    value is encoded when it is absorbed, so no list of all of them is
+    kept and converted afterwards.
+
+    The challenge is the hash of the encodings in sorted order, the same as
+    get_hash_as_int gives for the values, so proofs stay compatible with
+    other implementations. It also means values can be absorbed in any
+    order, e.g. by proof items initialized concurrently.
+    """
+
+    __slots__ = ('_group', '_encodings')
+
+    def __init__(self, *values, group=None):
+        self._group = group
+        self._encodings = []
+        self.absorbAll(values)
+
+    def absorb(self, value):
+        self._encodings.append(hashEncoding(value, self._group))
+
+    def absorbAll(self, values):
+        group = self._group
+        self._encodings.extend(hashEncoding(value, group)
+                               for value in values)
+
+    def __len__(self):
+        return len(self._encodings)
+
+    def challenge(self) -> int:
+        countHash()
+        h = sha256()
+        for encoding in sorted(self._encodings):
+            h.update(encoding)
+        return bytes_to_int(h.digest())
@@ -7,7 +7,6 @@ from anoncreds.protocol.utils import toDictWithStrValues, \
     intToArrayBytes, bytesToInt
 from config.config import cmod
 from typing import NamedTuple
-import uuid
 
 class AttribType:
     def __init__(self, name: str, encode: bool):
@@ -68,14 +67,30 @@ class Attribs:
     def __init__(self, credType: AttribDef = None, **vals):
         self.credType = credType if credType else AttribDef([], [])
         self._vals = vals
+        self._encoded = None
+
+    @classmethod
+    def fromEncoded(cls, credType: AttribDef, vals, encoded):
+        """
+        Builds attributes whose encoding is already known, e.g. read
+        back from a repo that stored it at ingestion time.
+        """
+        attribs = cls(credType, **vals)
+        attribs._encoded = dict(encoded)
+        return attribs
 
     def encoded(self):
         """
-        This function will encode all the attributes to 256 bit integers
+        This function will encode all the attributes to 256 bit integers.
+        The encoding is computed once and reused on later calls.
 
         :return:
         """
+        if self._encoded is None:
+            self._encoded = self._encode()
+        return dict(self._encoded)
 
+    def _encode(self):
         encoded = {}
         for i in range(len(self.credType.names)):
             name = self.credType.names[i]
@@ -122,7 +137,7 @@ PublicParams = namedtuple('PublicParams', 'Gamma, rho, g, h')
 
 T = TypeVar('T')
 VType = Set[int]
-TailsType = Dict[int, cmod.integer]
+TailsType = Dict[int, 'cmod.integer']
 TimestampType = int
 
 
@@ -581,6 +596,36 @@ class InitProof(namedtuple('InitProof', 'nonRevocInitProof, primaryInitProof'),
                                              primaryInitProof)
 
 
+class PrimaryPrecomputed(namedtuple('PrimaryPrecomputed',
+                                    'c1, Aprime, ePrime, vPrime, eTilde, '
+                                    'vTilde, AprimeS')):
+    """
+    Request independent part of a primary equality proof for a claim:
+    AprimeS = (Aprime ^ eTilde) * (S ^ vTilde) mod N. Must be used once.
+    """
+
+
+class NonRevocPrecomputed(namedtuple('NonRevocPrecomputed',
+                                     'gi, CListParams, TauListParams, '
+                                     'E, D, A, G, S, U, htildeRPrime')):
+    """
+    Request independent part of a non-revocation proof for a claim: all
+    of the C list but W, which depends on the current witness.
+    Must be used once.
+    """
+
+
+class GePrecomputed(namedtuple('GePrecomputed',
+                               'r, Sr, uTilde, rTilde, TauParts, '
+                               'alphaTilde, SAlpha')):
+    """
+    Predicate independent part of a GE predicate proof for a public key:
+    Sr[i] = S ^ r[i], TauParts[i] = (Z ^ uTilde[i]) * (S ^ rTilde[i]) for
+    i < ITERATIONS, TauParts[DELTA] = S ^ rTilde[DELTA] and
+    SAlpha = S ^ alphaTilde (all mod N). Must be used once.
+    """
+
+
 class PrimaryEqualProof(namedtuple('PrimaryEqualProof',
                                    'e, v, m, m1, m2, Aprime, revealedAttrs'),
                         NamedTupleStrSerializer):
@@ -829,6 +874,8 @@ class ProofRequest:
         self.version = version
         self.nonce = nonce
         self.attributes = attributes
+        # imported here, as it takes longer to import than this module
+        import uuid
         self.verifiableAttributes = \
             {str(uuid.uuid4()): AttributeInfo(name=a) for a in verifiableAttributes} if \
                 isinstance(verifiableAttributes, list) else verifiableAttributes
@@ -4,8 +4,8 @@ import time
 from collections import OrderedDict
 from enum import Enum
 from hashlib import sha256
-from math import sqrt, floor
-from random import randint, sample
+from math import ceil, log
+from random import randint, sample, SystemRandom
 from sys import byteorder
 from typing import Dict, List, Set
 
@@ -14,6 +14,7 @@ import base58
 from anoncreds.protocol.globals import KEYS, PK_R
 from anoncreds.protocol.globals import LARGE_PRIME, LARGE_MASTER_SECRET, \
     LARGE_VPRIME, PAIRING_GROUP
+from anoncreds.protocol.op_counter import countHash, countMultiExp
 from config.config import cmod
 import sys
 
@@ -26,7 +27,21 @@ def randomQR(n):
     return cmod.random(n) ** 2
 
 
-def get_hash_as_int(*args, group: cmod.PairingGroup = None):
+_pairingGroup = None
+
+
+def pairingGroup() -> 'cmod.PairingGroup':
+    """
+    The pairing group all group elements are created in. Keeping them in
+    one group lets charm count the operations on them (see op_counter).
+    """
+    global _pairingGroup
+    if _pairingGroup is None:
+        _pairingGroup = cmod.PairingGroup(PAIRING_GROUP)
+    return _pairingGroup
+
+
+def get_hash_as_int(*args, group: 'cmod.PairingGroup' = None):
     """
     Enumerate over the input tuple and generate a hash using the tuple values
 
@@ -35,18 +50,29 @@ def get_hash_as_int(*args, group: cmod.PairingGroup = None):
     :return:
     """
 
-    group = group if group else cmod.PairingGroup(PAIRING_GROUP)
+    countHash()
     h_challenge = sha256()
 
-    serialedArgs = [group.serialize(arg) if isGroupElement(arg)
-                    else cmod.Conversion.IP2OS(arg)
-                    for arg in args]
+    serialedArgs = [hashEncoding(arg, group) for arg in args]
 
     for arg in sorted(serialedArgs):
         h_challenge.update(arg)
     return bytes_to_int(h_challenge.digest())
 
 
+def hashEncoding(value, group: 'cmod.PairingGroup' = None) -> bytes:
+    """
+    The bytes a group element or integer is hashed as: the serialized
+    element, or the big-endian integer as charm's Conversion.IP2OS writes
+    it (including its length computed from a float logarithm).
+    """
+    if isGroupElement(value):
+        return (group or pairingGroup()).serialize(value)
+    x = int(value)
+    xLen = int(ceil(log(x, 2) / 8.0))
+    return (x % (1 << (8 * xLen))).to_bytes(xLen, 'big')
+
+
 CRYPTO_INT_PREFIX = 'CryptoInt_'
 INT_PREFIX = 'Int_'
 GROUP_PREFIX = 'Group_'
@@ -59,7 +85,7 @@ def serializeToStr(n):
     if isInteger(n):
         return INT_PREFIX + str(n)
     if isGroupElement(n):
-        return GROUP_PREFIX + cmod.PairingGroup(PAIRING_GROUP).serialize(
+        return GROUP_PREFIX + pairingGroup().serialize(
             n).decode()
     return n
 
@@ -75,7 +101,7 @@ def deserializeFromStr(n: str):
 
     if isStr(n) and n.startswith(GROUP_PREFIX):
         n = n[len(GROUP_PREFIX):].encode()
-        res = cmod.PairingGroup(PAIRING_GROUP).deserialize(n)
+        res = pairingGroup().deserialize(n)
         # A fix for Identity element as serialized/deserialized not correctly
         if str(res) == '[0, 0]':
             return groupIdentityG1()
@@ -157,7 +183,75 @@ def int_to_ZR(intHash, group):
 
 
 def groupIdentityG1():
-    return cmod.PairingGroup(PAIRING_GROUP).init(cmod.G1, 0)
+    return pairingGroup().init(cmod.G1, 0)
+
+
+def batchInverse(values, N):
+    """
+    Inverts all the values mod N with a single modular inversion
+    (Montgomery's trick).
+    """
+    if not values:
+        return []
+    prefix = [values[0] % N]
+    for value in values[1:]:
+        prefix.append(prefix[-1] * value % N)
+    inv = prefix[-1] ** -1
+    inverses = [None] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = inv * prefix[i - 1] % N
+        inv = inv * values[i] % N
+    inverses[0] = inv
+    return inverses
+
+
+# window of multiExp, in bits
+_MULTI_EXP_WINDOW = 5
+
+
+def multiExp(bases, exps, N):
+    """
+    The product of bases[i] ** exps[i] mod N.
+
+    The exponentiations share their squarings (interleaved fixed windows),
+    which makes the product of a few powers with exponents of similar
+    sizes two to three times as fast as separate exponentiations, on any
+    backend. Counted as one modexp per base (see op_counter).
+    """
+    powers = []
+    for base, exp in zip(bases, exps):
+        base, exp = base % N, int(exp)
+        if exp < 0:
+            base, exp = base ** -1, -exp
+        if exp:
+            powers.append((base, exp))
+    if len(powers) < 2:
+        countMultiExp(len(bases) - len(powers), 0)
+        return powers[0][0] ** powers[0][1] if powers else 1 % N
+
+    w = _MULTI_EXP_WINDOW
+    mask = (1 << w) - 1
+    tables = []
+    for base, _ in powers:
+        table = [None, base]
+        for _ in range(2, 1 << w):
+            table.append(table[-1] * base % N)
+        tables.append(table)
+    muls = len(tables) * ((1 << w) - 2)
+
+    res = 1 % N
+    windows = (max(exp.bit_length() for _, exp in powers) + w - 1) // w
+    for i in range(windows - 1, -1, -1):
+        for _ in range(w):
+            res = res * res % N
+        shift = i * w
+        for table, (_, exp) in zip(tables, powers):
+            digit = (exp >> shift) & mask
+            if digit:
+                res = res * table[digit] % N
+                muls += 1
+    countMultiExp(len(bases), muls + windows * w)
+    return res
 
 
 def get_values_of_dicts(*args):
@@ -221,20 +315,115 @@ def flattenDict(attrs):
 
 
 def largestSquareLessThan(x: int):
-    sqrtx = int(floor(sqrt(x)))
-    return sqrtx
+    """
+    The integer square root of x, exact for any size (unlike math.sqrt).
+    """
+    if x < 0:
+        raise ValueError('square root of negative number {}'.format(x))
+    if x < 2:
+        return x
+    r = 1 << ((x.bit_length() + 1) // 2)
+    while True:
+        s = (r + x // r) // 2
+        if s >= r:
+            return r
+        r = s
+
+
+# below this, fourSquares searches for the squares instead
+_FOUR_SQUARES_SEARCH_LIMIT = 1 << 16
+
+_systemRandom = SystemRandom()
 
 
 def fourSquares(delta: int):
-    u1 = largestSquareLessThan(delta)
-    u2 = largestSquareLessThan(delta - (u1 ** 2))
-    u3 = largestSquareLessThan(delta - (u1 ** 2) - (u2 ** 2))
-    u4 = largestSquareLessThan(delta - (u1 ** 2) - (u2 ** 2) - (u3 ** 2))
-    if (u1 ** 2) + (u2 ** 2) + (u3 ** 2) + (u4 ** 2) == delta:
-        return {'0': u1, '1': u2, '2': u3, '3': u4}
+    """
+    Four integers whose squares sum to delta (Lagrange).
+
+    Small deltas are searched for. For the others, as in Rabin and
+    Shallit's randomized algorithm, random x, y are picked until
+    delta - x^2 - y^2 is a prime p = 1 (mod 4), which is a sum of two
+    squares found from a square root of -1 mod p. A pick succeeds with
+    probability about 1 / ln(delta), so the expected time is polynomial
+    in the size of delta.
+
+    :return: {'0': u1, '1': u2, '2': u3, '3': u4}
+    :raises ValueError: if delta is negative
+    """
+    if delta < 0:
+        raise ValueError(
+            "Cannot get the four squares for negative delta {0}".format(
+                delta))
+    # delta = 4^v * n, with n not divisible by 4
+    n, v = delta, 0
+    while n and n % 4 == 0:
+        n //= 4
+        v += 1
+    if n < _FOUR_SQUARES_SEARCH_LIMIT:
+        u = _searchFourSquares(n)
     else:
-        raise Exception(
-            "Cannot get the four squares for delta {0}".format(delta))
+        u = _randomFourSquares(n)
+    return {str(i): x << v for i, x in enumerate(u)}
+
+
+def _searchFourSquares(n):
+    for u1 in range(largestSquareLessThan(n), -1, -1):
+        r1 = n - u1 * u1
+        for u2 in range(min(u1, largestSquareLessThan(r1)), -1, -1):
+            r2 = r1 - u2 * u2
+            for u3 in range(min(u2, largestSquareLessThan(r2)), -1, -1):
+                r3 = r2 - u3 * u3
+                u4 = largestSquareLessThan(r3)
+                if u4 * u4 == r3:
+                    return u1, u2, u3, u4
+    raise ValueError("Cannot get the four squares for delta {0}".format(n))
+
+
+def _randomFourSquares(n):
+    # n - x^2 - y^2 = 1 (mod 4) needs x, y even if n = 1 (mod 4), one of
+    # them odd if n = 2 and both odd if n = 3
+    xParity, yParity = [(0, 0), (1, 0), (1, 1)][n % 4 - 1]
+    while True:
+        x = _randomWithParity(largestSquareLessThan(n), xParity)
+        y = _randomWithParity(largestSquareLessThan(n - x * x), yParity)
+        p = n - x * x - y * y
+        if p == 1:
+            return x, y, 1, 0
+        if p % 4 == 1 and cmod.isPrime(p):
+            z, w = _twoSquares(p)
+            if z is not None:
+                return x, y, z, w
+
+
+def _randomWithParity(upper, parity):
+    """
+    A random integer in [0, upper] with the parity, if there is one.
+    """
+    x = _systemRandom.randint(0, upper)
+    if x % 2 != parity:
+        x = x + 1 if x < upper else x - 1
+    return max(x, 0)
+
+
+def _twoSquares(p):
+    """
+    z, w with z^2 + w^2 = p for a prime p = 1 (mod 4) (Hermite-Serret),
+    or None, None if the square root of -1 wasn't found this time or p
+    isn't a sum of two squares (isPrime is probabilistic, so p may be
+    composite).
+    """
+    c = _systemRandom.randint(2, p - 2)
+    s = pow(c, (p - 1) // 4, p)
+    if s * s % p != p - 1:
+        # c is a quadratic residue, half of them are
+        return None, None
+    a, b = p, s
+    while b * b > p:
+        a, b = b, a % b
+    w = largestSquareLessThan(p - b * b)
+    if b * b + w * w != p:
+        return None, None
+    return b, w
 
 
 def strToCryptoInteger(n):
@@ -293,7 +482,7 @@ class SerFmt(Enum):
 
 SerFuncs = {
     SerFmt.py3Int: int,
-    SerFmt.default: cmod.integer,
+    SerFmt.default: lambda n: cmod.integer(n),
     SerFmt.base58: base58encode,
 }
 
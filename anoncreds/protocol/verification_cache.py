@@ -0,0 +1,138 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from anoncreds.protocol.cache import LRUCache
+from anoncreds.protocol.types import FullProof, ProofRequest, Accumulator
+
+
+class ProofResultCache:
+    """
+    Remembers the verdicts of verified proofs, so that a proof received
+    again (for example from a retrying gateway) isn't verified twice.
+
+    Entries are keyed by a digest of the nonce, the whole proof (a proof
+    with the same challenge but other revealed values must not hit) and
+    the state of the accumulators the proof is checked against, so a
+    revocation invalidates the cached verdicts.
+    """
+
+    def __init__(self, maxSize=10000, ttl=None, timer=time.monotonic):
+        self._cache = LRUCache(maxSize, ttl, timer)
+
+    @staticmethod
+    def key(proofRequest: ProofRequest, proof: FullProof, accums) -> str:
+        """
+        :param accums: accumulators used for the non-revocation proofs,
+        by schema seq no
+        """
+        data = {
+            'nonce': str(proofRequest.nonce),
+            'proof': proofDigest(proof),
+            'accums': {str(seqNo): _accumState(accum)
+                       for seqNo, accum in accums.items()}
+        }
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key):
+        """
+        :return: a (found, verdict) pair
+        """
+        return self._cache.get(key)
+
+    def put(self, key, verdict: bool):
+        self._cache.put(key, verdict)
+
+    @property
+    def stats(self):
+        return self._cache.stats
+
+
+def proofDigest(proof: FullProof) -> str:
+    return hashlib.sha256(
+        json.dumps(proof.toStrDict(), sort_keys=True).encode()).hexdigest()
+
+
+def _accumState(accum: Accumulator):
+    return [accum.iA, str(accum.acc), sorted(accum.V)]
+
+
+class NonceReplayFilter:
+    """
+    Rejects nonces seen during the last window seconds.
+
+    Nonces are kept in time buckets of window / buckets seconds; whole
+    buckets are dropped once they're out of the window, or when more than
+    maxNonces nonces are kept (the oldest first), which bounds the memory
+    used under load at the cost of a shorter effective window.
+
+    If acceptRetries is set, a nonce seen within the window is accepted
+    again with the very proof it was first seen with (the digest of the
+    proof, see proofDigest), so that a gateway retrying a request gets a
+    verdict instead of an error. Any other proof with the nonce is still
+    rejected.
+    """
+
+    def __init__(self, window=600.0, buckets=10, maxNonces=1000000,
+                 timer=time.monotonic, acceptRetries=False):
+        if window <= 0 or buckets < 1:
+            raise ValueError('window and buckets must be positive')
+        self.window = window
+        self.maxNonces = maxNonces
+        self.acceptRetries = acceptRetries
+        self._bucketLength = window / buckets
+        self._timer = timer
+        self._buckets = OrderedDict()
+        self._size = 0
+        self.rejected = 0
+
+    def add(self, nonce, digest=None) -> bool:
+        """
+        Records a nonce.
+
+        :param digest: digest of the proof presented with the nonce, only
+        used if retries are accepted
+        :return: False if the nonce has been seen within the window (with
+        another proof, if retries are accepted)
+        """
+        self._expire()
+        nonce = str(nonce)
+        if self._seen(nonce):
+            if self.acceptRetries and digest is not None and \
+                    self._digest(nonce) == digest:
+                return True
+            self.rejected += 1
+            return False
+
+        bucket = int(self._timer() // self._bucketLength)
+        self._buckets.setdefault(bucket, {})[nonce] = digest
+        self._size += 1
+        while self._size > self.maxNonces and len(self._buckets) > 1:
+            self._drop()
+        return True
+
+    def __contains__(self, nonce):
+        self._expire()
+        return self._seen(str(nonce))
+
+    def __len__(self):
+        return self._size
+
+    def _seen(self, nonce):
+        return any(nonce in nonces for nonces in self._buckets.values())
+
+    def _digest(self, nonce):
+        for nonces in self._buckets.values():
+            if nonce in nonces:
+                return nonces[nonce]
+
+    def _expire(self):
+        oldest = int((self._timer() - self.window) // self._bucketLength)
+        while self._buckets and next(iter(self._buckets)) < oldest:
+            self._drop()
+
+    def _drop(self):
+        _, nonces = self._buckets.popitem(last=False)
+        self._size -= len(nonces)
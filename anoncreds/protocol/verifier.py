@@ -1,21 +1,32 @@
-from functools import reduce
+import asyncio
 
+from anoncreds.protocol.exception import NonceReplayError
+from anoncreds.protocol.executor import CryptoExecutor
 from anoncreds.protocol.globals import LARGE_NONCE
+from anoncreds.protocol.instrumentation import span, traced
 from anoncreds.protocol.primary.primary_proof_verifier import \
     PrimaryProofVerifier
+from anoncreds.protocol.proof_validation import prevalidateProof
 from anoncreds.protocol.revocation.accumulators.non_revocation_proof_verifier import \
     NonRevocationProofVerifier
-from anoncreds.protocol.types import FullProof, ProofRequest
-from anoncreds.protocol.utils import get_hash_as_int, isCryptoInteger
+from anoncreds.protocol.types import FullProof, ProofRequest, ID
+from anoncreds.protocol.transcript import Transcript
+from anoncreds.protocol.verification_cache import ProofResultCache, \
+    NonceReplayFilter, proofDigest
 from anoncreds.protocol.wallet.wallet import Wallet
 from config.config import cmod
 
 
 class Verifier:
-    def __init__(self, wallet: Wallet):
+    def __init__(self, wallet: Wallet, executor: CryptoExecutor = None,
+                 resultCache: ProofResultCache = None,
+                 nonceFilter: NonceReplayFilter = None):
         self.wallet = wallet
-        self._primaryVerifier = PrimaryProofVerifier(wallet)
-        self._nonRevocVerifier = NonRevocationProofVerifier(wallet)
+        self._primaryVerifier = PrimaryProofVerifier(wallet, executor)
+        self._nonRevocVerifier = NonRevocationProofVerifier(wallet, executor)
+        self._resultCache = resultCache
+        self._nonceFilter = nonceFilter
+        self._inFlight = {}
 
     @property
     def verifierId(self):
@@ -24,6 +35,7 @@ class Verifier:
     def generateNonce(self):
         return cmod.integer(cmod.randomBits(LARGE_NONCE))
 
+    @traced('verifier.verify')
     async def verify(self, proofRequest: ProofRequest, proof: FullProof):
         """
         Verifies a proof from the prover.
@@ -32,35 +44,114 @@ class Verifier:
         attributes, predicates, timestamps for non-revocation)
         :param proof: a proof
         :return: True if verified successfully and false otherwise.
+        :raises NonceReplayError: if a nonce filter is set and has already
+        seen the nonce (unless it accepts retries and the nonce came with
+        this very proof)
+        :raises MalformedProofError: if the proof's structure is invalid
         """
 
-        if proofRequest.verifiableAttributes.keys() != proof.requestedProof.revealed_attrs.keys():
-            raise ValueError('Received attributes ={} do not correspond to requested={}'.format(
-                proof.requestedProof.revealed_attrs.keys(), proofRequest.verifiableAttributes.keys()))
+        checkRequestedProof(proofRequest, proof)
+        with span('verifier.prevalidate'):
+            await prevalidateProof(self.wallet, proofRequest, proof)
 
-        if proofRequest.predicates.keys() != proof.requestedProof.predicates.keys():
-            raise ValueError('Received predicates ={} do not correspond to requested={}'.format(
-                proof.requestedProof.predicates.keys(), proofRequest.predicates.keys()))
+        # before the cached verdicts, so that they can't be replayed
+        self._checkNonce(proofRequest, proof)
+        if self._resultCache is None:
+            return await self._verify(proofRequest, proof)
 
-        TauList = []
+        accums = {}
+        for proofItem in proof.proofs.values():
+            if proofItem.proof.nonRevocProof:
+                accums[proofItem.schema_seq_no] = \
+                    await self._nonRevocVerifier.refreshAccumulator(
+                        proofRequest, proofItem.schema_seq_no)
+        key = self._resultCache.key(proofRequest, proof, accums)
+
+        found, verdict = self._resultCache.get(key)
+        if found:
+            return verdict
+        # the same proof is already being verified
+        if key in self._inFlight:
+            return await asyncio.shield(self._inFlight[key])
+
+        future = asyncio.ensure_future(
+            self._verify(proofRequest, proof, accums))
+        self._inFlight[key] = future
+        try:
+            verdict = await asyncio.shield(future)
+        finally:
+            del self._inFlight[key]
+        self._resultCache.put(key, verdict)
+        return verdict
+
+    def _checkNonce(self, proofRequest: ProofRequest, proof: FullProof):
+        if self._nonceFilter is None:
+            return
+        digest = proofDigest(proof) if self._nonceFilter.acceptRetries \
+            else None
+        if not self._nonceFilter.add(proofRequest.nonce, digest):
+            raise NonceReplayError(
+                'Nonce {} has already been used'.format(proofRequest.nonce))
+
+    async def _verify(self, proofRequest: ProofRequest, proof: FullProof,
+                      accums=None):
+        """
+        :param accums: accumulators to check the non-revocation proofs
+        against, by schema seq no; refreshed if not given
+        """
+        await self._prefetch(proof)
+        accums = accums or {}
+
+        transcript = Transcript(proofRequest.nonce)
         for (uuid, proofItem) in proof.proofs.items():
             if proofItem.proof.nonRevocProof:
-                TauList += await self._nonRevocVerifier.verifyNonRevocation(
-                    proofRequest, proofItem.schema_seq_no, proof.aggregatedProof.cHash,
-                    proofItem.proof.nonRevocProof)
+                with span('verifier.tau.nonrevoc'):
+                    transcript.absorbAll(
+                        await self._nonRevocVerifier.verifyNonRevocation(
+                            proofRequest, proofItem.schema_seq_no,
+                            proof.aggregatedProof.cHash,
+                            proofItem.proof.nonRevocProof,
+                            accums.get(proofItem.schema_seq_no)))
+            if proofItem.proof.primaryProof:
+                with span('verifier.tau.primary'):
+                    transcript.absorbAll(await self._primaryVerifier.verify(
+                        proofItem.schema_seq_no, proof.aggregatedProof.cHash,
+                        proofItem.proof.primaryProof))
+
+        with span('verifier.hash'):
+            return isCHashValid(proof, transcript)
+
+    async def _prefetch(self, proof: FullProof):
+        # request everything the proof items need at once, so that a
+        # batching repo can serve them with a few bulk calls (accumulators
+        # are refreshed by the non-revocation verifier itself)
+        fetches = []
+        for proofItem in proof.proofs.values():
+            schemaId = ID(schemaId=proofItem.schema_seq_no)
             if proofItem.proof.primaryProof:
-                TauList += await self._primaryVerifier.verify(proofItem.schema_seq_no,
-                                                              proof.aggregatedProof.cHash,
-                                                              proofItem.proof.primaryProof)
+                fetches.append(self.wallet.getSchema(schemaId))
+                fetches.append(self.wallet.getPublicKey(schemaId))
+            if proofItem.proof.nonRevocProof:
+                fetches.append(self.wallet.getPublicKeyRevocation(schemaId))
+                fetches.append(self.wallet.getPublicKeyAccumulator(schemaId))
+        await asyncio.gather(*fetches)
+
 
-        CHver = self._get_hash(proof.aggregatedProof.CList, self._prepare_collection(TauList),
-                               cmod.integer(proofRequest.nonce))
+def checkRequestedProof(proofRequest: ProofRequest, proof: FullProof):
+    if proofRequest.verifiableAttributes.keys() != proof.requestedProof.revealed_attrs.keys():
+        raise ValueError('Received attributes ={} do not correspond to requested={}'.format(
+            proof.requestedProof.revealed_attrs.keys(), proofRequest.verifiableAttributes.keys()))
 
-        return CHver == proof.aggregatedProof.cHash
+    if proofRequest.predicates.keys() != proof.requestedProof.predicates.keys():
+        raise ValueError('Received predicates ={} do not correspond to requested={}'.format(
+            proof.requestedProof.predicates.keys(), proofRequest.predicates.keys()))
 
-    def _prepare_collection(self, values):
-        return [cmod.toInt(el) if isCryptoInteger(el) else el for el in values]
 
-    def _get_hash(self, CList, TauList, nonce):
-        return get_hash_as_int(nonce,
-                               *reduce(lambda x, y: x + y, [TauList, CList]))
+def isCHashValid(proof: FullProof, transcript: Transcript) -> bool:
+    """
+    Recomputes the challenge from the nonce and the T-hat values absorbed
+    by the transcript, and the C list of the proof, and compares it with
+    the one in the proof.
+    """
+    transcript.absorbAll(proof.aggregatedProof.CList)
+    return transcript.challenge() == proof.aggregatedProof.cHash
@@ -0,0 +1,252 @@
+import asyncio
+import time
+import zlib
+from collections import namedtuple
+
+from anoncreds.protocol.codec import pack, unpack
+from anoncreds.protocol.exception import PoolBusyError
+from anoncreds.protocol.primary.primary_proof_verifier import calcPrimaryTHat
+from anoncreds.protocol.proof_validation import prevalidateProof
+from anoncreds.protocol.revocation.accumulators.non_revocation_proof_verifier import \
+    calcNonRevocTHat
+from anoncreds.protocol.transcript import Transcript
+from anoncreds.protocol.types import FullProof, ProofRequest, ID
+from anoncreds.protocol.verifier import checkRequestedProof, isCHashValid
+from anoncreds.protocol.wallet.wallet import Wallet
+
+WorkerMetrics = namedtuple('WorkerMetrics',
+                           'requests, failures, keyShipments, pending, '
+                           'busyTime, restarts, spilled')
+
+# keys cached by the current worker process, by schema seq no:
+# (attrNames, pk) and (pkR, accumPk)
+_primaryKeys = {}
+_revocKeys = {}
+
+
+def _verifyInWorker(packedArgs):
+    primaryKeys, revocKeys, accums, nonce, proof = unpack(packedArgs)
+    _primaryKeys.update(primaryKeys)
+    _revocKeys.update(revocKeys)
+
+    cHash = proof.aggregatedProof.cHash
+    transcript = Transcript(nonce)
+    for proofItem in proof.proofs.values():
+        seqNo = proofItem.schema_seq_no
+        if proofItem.proof.nonRevocProof:
+            pkR, accumPk = _revocKeys[seqNo]
+            transcript.absorbAll(calcNonRevocTHat(
+                pkR, accums[seqNo], accumPk, cHash,
+                proofItem.proof.nonRevocProof))
+        if proofItem.proof.primaryProof:
+            attrNames, pk = _primaryKeys[seqNo]
+            transcript.absorbAll(calcPrimaryTHat(
+                pk, attrNames, cHash, proofItem.proof.primaryProof))
+
+    return isCHashValid(proof, transcript)
+
+
+def _newProcess():
+    # imported here rather than with the module, as concurrent.futures
+    # (with multiprocessing) takes longer to import than the whole protocol
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=1)
+
+
+class _Worker:
+    def __init__(self, maxPending):
+        self.executor = _newProcess()
+        self.semaphore = asyncio.Semaphore(maxPending)
+        self.primaryKnown = set()
+        self.revocKnown = set()
+        # bumped when the process is replaced, with all the keys it knew
+        self.generation = 0
+        self.requests = 0
+        self.failures = 0
+        self.keyShipments = 0
+        self.pending = 0
+        self.busyTime = 0.0
+        self.restarts = 0
+        # requests taken over from a busy worker
+        self.spilled = 0
+
+    def restart(self, executor):
+        """
+        Replaces the executor if it is still the given (broken) one; the
+        requests it broke all call this, but only the first one restarts.
+        """
+        if self.executor is not executor:
+            return
+        executor.shutdown(wait=False)
+        self.executor = _newProcess()
+        self.primaryKnown.clear()
+        self.revocKnown.clear()
+        self.generation += 1
+        self.restarts += 1
+
+    @property
+    def metrics(self):
+        return WorkerMetrics(self.requests, self.failures, self.keyShipments,
+                             self.pending, self.busyTime, self.restarts,
+                             self.spilled)
+
+
+class VerifierPool:
+    """
+    Verifies proofs in a set of worker processes, each one keeping the
+    public keys of the schemas it has seen.
+
+    Proofs are routed to a worker by their schemas, so the keys of a schema
+    are usually sent to (and deserialized by) one worker only once. When
+    that worker already runs maxPending verifications, the proof goes to
+    the least loaded worker instead, which gets the keys too, so that a busy
+    schema can use every core. Accumulators change over time, so they are
+    refreshed through the wallet and sent with every request.
+
+    Every worker runs at most maxPending verifications at a time; once
+    maxQueue more requests wait for the worker a proof is routed to, new
+    ones are rejected with PoolBusyError (no limit if maxQueue is None).
+
+    A worker process that dies (e.g. killed when out of memory) is replaced
+    by a new one, and the requests it was running are retried once.
+    """
+
+    def __init__(self, wallet: Wallet, workers=2, maxPending=2,
+                 maxQueue=None):
+        if workers < 1:
+            raise ValueError('At least one worker is needed')
+        self.wallet = wallet
+        self.maxPending = maxPending
+        self.maxQueue = maxQueue
+        self._workers = [_Worker(maxPending) for _ in range(workers)]
+
+    @property
+    def metrics(self):
+        return [w.metrics for w in self._workers]
+
+    def workerFor(self, proof: FullProof) -> int:
+        """
+        Index of the worker the proof is routed to when it isn't busy.
+        """
+        seqNos = sorted(str(proofItem.schema_seq_no)
+                        for proofItem in proof.proofs.values())
+        return zlib.crc32(','.join(seqNos).encode()) % len(self._workers)
+
+    async def verify(self, proofRequest: ProofRequest, proof: FullProof):
+        """
+        Verifies a proof from the prover, the same way Verifier.verify does.
+
+        :param proofRequest: description of a proof to be presented (revealed
+        attributes, predicates, timestamps for non-revocation)
+        :param proof: a proof
+        :return: True if verified successfully and false otherwise.
+        :raises MalformedProofError: if the proof's structure is invalid
+        """
+        checkRequestedProof(proofRequest, proof)
+        await prevalidateProof(self.wallet, proofRequest, proof)
+
+        worker = self._pickWorker(proof)
+        if self.maxQueue is not None and \
+                worker.pending >= self.maxPending + self.maxQueue:
+            raise PoolBusyError('Worker queue is full')
+
+        # loaded with the workers' executors
+        from concurrent.futures.process import BrokenProcessPool
+
+        worker.pending += 1
+        try:
+            for attempt in range(2):
+                generation = worker.generation
+                primaryKeys, revocKeys, accums = \
+                    await self._collectKeys(worker, proofRequest, proof)
+                try:
+                    res = await self._run(worker, generation, primaryKeys,
+                                          revocKeys, accums, proofRequest,
+                                          proof)
+                except BrokenProcessPool:
+                    if attempt:
+                        raise
+                else:
+                    break
+        finally:
+            worker.pending -= 1
+
+        worker.requests += 1
+        return res
+
+    def _pickWorker(self, proof: FullProof) -> _Worker:
+        preferred = self._workers[self.workerFor(proof)]
+        if preferred.pending < self.maxPending:
+            return preferred
+        leastLoaded = min(self._workers, key=lambda w: w.pending)
+        if leastLoaded.pending >= preferred.pending:
+            return preferred
+        leastLoaded.spilled += 1
+        return leastLoaded
+
+    async def _run(self, worker: _Worker, generation, primaryKeys, revocKeys,
+                   accums, proofRequest: ProofRequest, proof: FullProof):
+        from concurrent.futures.process import BrokenProcessPool
+
+        async with worker.semaphore:
+            if worker.generation != generation:
+                # restarted while waiting: the new process has no keys
+                raise BrokenProcessPool('Worker restarted')
+            executor = worker.executor
+            packedArgs = pack((primaryKeys, revocKeys, accums,
+                               proofRequest.nonce, proof))
+            loop = asyncio.get_event_loop()
+            start = time.perf_counter()
+            try:
+                res = await loop.run_in_executor(executor, _verifyInWorker,
+                                                 packedArgs)
+            except BrokenProcessPool:
+                worker.failures += 1
+                worker.restart(executor)
+                raise
+            except Exception:
+                worker.failures += 1
+                raise
+            finally:
+                worker.busyTime += time.perf_counter() - start
+
+        # the worker has the keys now; marking them only after it is done
+        # means concurrent requests may send them again, but never miss them
+        if worker.generation == generation:
+            if primaryKeys or revocKeys:
+                worker.keyShipments += 1
+            worker.primaryKnown.update(primaryKeys.keys())
+            worker.revocKnown.update(revocKeys.keys())
+        return res
+
+    async def _collectKeys(self, worker: _Worker, proofRequest: ProofRequest,
+                           proof: FullProof):
+        primaryKeys = {}
+        revocKeys = {}
+        accums = {}
+        for proofItem in proof.proofs.values():
+            seqNo = proofItem.schema_seq_no
+            schemaId = ID(schemaId=seqNo)
+            if proofItem.proof.primaryProof and \
+                    seqNo not in worker.primaryKnown:
+                schema, pk = await asyncio.gather(
+                    self.wallet.getSchema(schemaId),
+                    self.wallet.getPublicKey(schemaId))
+                primaryKeys[seqNo] = (schema.attrNames, pk)
+            if proofItem.proof.nonRevocProof:
+                if await self.wallet.shouldUpdateAccumulator(
+                        schemaId=schemaId, ts=proofRequest.ts,
+                        seqNo=proofRequest.seqNo):
+                    await self.wallet.updateAccumulator(
+                        schemaId=schemaId, ts=proofRequest.ts,
+                        seqNo=proofRequest.seqNo)
+                accums[seqNo] = await self.wallet.getAccumulator(schemaId)
+                if seqNo not in worker.revocKnown:
+                    revocKeys[seqNo] = await asyncio.gather(
+                        self.wallet.getPublicKeyRevocation(schemaId),
+                        self.wallet.getPublicKeyAccumulator(schemaId))
+        return primaryKeys, revocKeys, accums
+
+    def shutdown(self, wait=True):
+        for worker in self._workers:
+            worker.executor.shutdown(wait=wait)
@@ -5,7 +5,14 @@ from anoncreds.protocol.types import Schema, PublicKey, SecretKey, ID, \
     RevocationPublicKey, AccumulatorPublicKey, Accumulator, TailsType, \
     RevocationSecretKey, AccumulatorSecretKey, \
     TimestampType
-from anoncreds.protocol.wallet.wallet import Wallet, WalletInMemory
+from anoncreds.protocol.wallet.wallet import Wallet, WalletInMemory, \
+    PK, PK_R, ACCUM, ACCUM_PK, TAILS
+
+# names of the per-schema values an IssuerWalletInMemory keeps in a SchemaSlot
+SK = 'sk'
+SK_R = 'skR'
+ACCUM_SK = 'accumSk'
+M2 = 'm2'
 
 
 class IssuerWallet(Wallet):
@@ -75,13 +82,6 @@ class IssuerWalletInMemory(IssuerWallet, WalletInMemory):
     def __init__(self, schemaId, repo: PublicRepo):
         WalletInMemory.__init__(self, schemaId, repo)
 
-        # other dicts with key=schemaKey
-        self._sks = {}
-        self._skRs = {}
-        self._accumSks = {}
-        self._m2s = {}
-        self._attributes = {}
-
     # SUBMIT
 
     async def submitSchema(self,
@@ -95,16 +95,16 @@ class IssuerWalletInMemory(IssuerWallet, WalletInMemory):
                                pkR: RevocationPublicKey = None) -> (
             PublicKey, RevocationPublicKey):
         pk, pkR = await self._repo.submitPublicKeys(schemaId, pk, pkR)
-        await self._cacheValueForId(self._pks, schemaId, pk)
+        await self._cacheValueForId(PK, schemaId, pk)
         if pkR:
-            await  self._cacheValueForId(self._pkRs, schemaId, pkR)
+            await  self._cacheValueForId(PK_R, schemaId, pkR)
         return pk, pkR
 
     async def submitSecretKeys(self, schemaId: ID, sk: SecretKey,
                                skR: RevocationSecretKey = None):
-        await  self._cacheValueForId(self._sks, schemaId, sk)
+        await  self._cacheValueForId(SK, schemaId, sk)
         if skR:
-            await  self._cacheValueForId(self._skRs, schemaId, skR)
+            await  self._cacheValueForId(SK_R, schemaId, skR)
 
     async def submitAccumPublic(self, schemaId: ID,
                                 accumPK: AccumulatorPublicKey,
@@ -112,35 +112,35 @@ class IssuerWalletInMemory(IssuerWallet, WalletInMemory):
                                 tails: TailsType) -> AccumulatorPublicKey:
         accumPK = await self._repo.submitAccumulator(schemaId, accumPK, accum,
                                                      tails)
-        await self._cacheValueForId(self._accums, schemaId, accum)
-        await self._cacheValueForId(self._accumPks, schemaId, accumPK)
-        await self._cacheValueForId(self._tails, schemaId, tails)
+        await self._cacheValueForId(ACCUM, schemaId, accum)
+        await self._cacheValueForId(ACCUM_PK, schemaId, accumPK)
+        await self._cacheValueForId(TAILS, schemaId, tails)
         return accumPK
 
     async def submitAccumSecret(self, schemaId: ID,
                                 accumSK: AccumulatorSecretKey):
-        await self._cacheValueForId(self._accumSks, schemaId, accumSK)
+        await self._cacheValueForId(ACCUM_SK, schemaId, accumSK)
 
     async def submitAccumUpdate(self, schemaId: ID, accum: Accumulator,
                                 timestampMs: TimestampType):
         await self._repo.submitAccumUpdate(schemaId, accum, timestampMs)
-        await self._cacheValueForId(self._accums, schemaId, accum)
+        await self._cacheValueForId(ACCUM, schemaId, accum)
 
     async def submitContextAttr(self, schemaId: ID, m2):
-        await self._cacheValueForId(self._m2s, schemaId, m2)
+        await self._cacheValueForId(M2, schemaId, m2)
 
     # GET
 
     async def getSecretKey(self, schemaId: ID) -> SecretKey:
-        return await self._getValueForId(self._sks, schemaId)
+        return await self._getValueForId(SK, schemaId)
 
     async def getSecretKeyRevocation(self,
                                      schemaId: ID) -> RevocationSecretKey:
-        return await self._getValueForId(self._skRs, schemaId)
+        return await self._getValueForId(SK_R, schemaId)
 
     async def getSecretKeyAccumulator(self,
                                       schemaId: ID) -> AccumulatorSecretKey:
-        return await self._getValueForId(self._accumSks, schemaId)
+        return await self._getValueForId(ACCUM_SK, schemaId)
 
     async def getContextAttr(self, schemaId: ID):
-        return await self._getValueForId(self._m2s, schemaId)
+        return await self._getValueForId(M2, schemaId)
@@ -7,6 +7,15 @@ from anoncreds.protocol.types import ID, \
 from anoncreds.protocol.wallet.wallet import Wallet, WalletInMemory
 from typing import Dict, Sequence, Any
 
+# names of the per-schema values a ProverWalletInMemory keeps in a SchemaSlot
+CLAIM_ATTRS = 'claimAttrs'
+M1 = 'm1'
+M2 = 'm2'
+C1 = 'c1'
+C2 = 'c2'
+PRIMARY_INIT_DATA = 'primaryInitData'
+NON_REVOC_INIT_DATA = 'nonRevocInitData'
+
 
 class ProverWallet(Wallet):
     def __init__(self, schemaId, repo: PublicRepo):
@@ -86,79 +95,66 @@ class ProverWalletInMemory(ProverWallet, WalletInMemory):
     def __init__(self, schemaId, repo: PublicRepo):
         WalletInMemory.__init__(self, schemaId, repo)
 
-        self._claims = {}
-
-        # other dicts with key=schemaKey
-        self._m1s = {}
-        self._m2s = {}
-
-        self._c1s = {}
-        self._c2s = {}
-
-        self._primaryInitData = {}
-        self._nonRevocInitData = {}
-
     # SUBMIT
 
     async def submitClaimAttributes(self, schemaId: ID, claims: Dict[str, ClaimAttributeValues]):
-        await self._cacheValueForId(self._claims, schemaId, claims)
+        await self._cacheValueForId(CLAIM_ATTRS, schemaId, claims)
 
     async def submitPrimaryClaim(self, schemaId: ID, claim: PrimaryClaim):
-        await self._cacheValueForId(self._c1s, schemaId, claim)
+        await self._cacheValueForId(C1, schemaId, claim)
 
     async def submitNonRevocClaim(self, schemaId: ID,
                                   claim: NonRevocationClaim):
-        await self._cacheValueForId(self._c2s, schemaId, claim)
+        await self._cacheValueForId(C2, schemaId, claim)
 
     async def submitMasterSecret(self, ms, schemaId: ID):
-        await self._cacheValueForId(self._m1s, schemaId, ms)
+        await self._cacheValueForId(M1, schemaId, ms)
 
     async def submitPrimaryClaimInitData(self, schemaId: ID,
                                          claimInitData: ClaimInitDataType):
-        await self._cacheValueForId(self._primaryInitData, schemaId,
+        await self._cacheValueForId(PRIMARY_INIT_DATA, schemaId,
                                     claimInitData)
 
     async def submitNonRevocClaimInitData(self, schemaId: ID,
                                           claimInitData: ClaimInitDataType):
-        await self._cacheValueForId(self._nonRevocInitData, schemaId,
+        await self._cacheValueForId(NON_REVOC_INIT_DATA, schemaId,
                                     claimInitData)
 
     async def submitContextAttr(self, schemaId: ID, m2):
-        await self._cacheValueForId(self._m2s, schemaId, m2)
+        await self._cacheValueForId(M2, schemaId, m2)
 
     # GET
 
     async def getMasterSecret(self, schemaId: ID):
-        return await self._getValueForId(self._m1s, schemaId)
+        return await self._getValueForId(M1, schemaId)
 
     async def getClaimAttributes(self, schemaId: ID):
-        return await self._getValueForId(self._claims, schemaId)
+        return await self._getValueForId(CLAIM_ATTRS, schemaId)
 
     async def getClaimSignature(self, schemaId: ID) -> Claims:
-        c1 = await self._getValueForId(self._c1s, schemaId)
-        c2 = None if not self._c2s else await self._getValueForId(self._c2s,
-                                                                  schemaId)
+        c1 = await self._getValueForId(C1, schemaId)
+        c2 = (await self._getSlot(schemaId)).values.get(C2)
         return Claims(c1, c2)
 
     async def getAllClaimsAttributes(self) -> ClaimsPair:
         res = dict()
-        for schemaKey in self._claims.keys():
-            res[schemaKey] = await self.getClaimAttributes(ID(schemaKey))
+        for slot in self._slotsWith(CLAIM_ATTRS):
+            res[slot.key] = slot.values[CLAIM_ATTRS]
         return res
 
     async def getAllClaimsSignatures(self) -> ClaimsPair:
         res = ClaimsPair()
-        for schemaKey in self._c1s.keys():
-            res[schemaKey] = await self.getClaimSignature(ID(schemaKey))
+        for slot in self._slotsWith(C1):
+            res[slot.key] = Claims(slot.values[C1], slot.values.get(C2))
         return res
 
     async def getPrimaryClaimInitData(self,
                                       schemaId: ID) -> ClaimInitDataType:
-        return await self._getValueForId(self._primaryInitData, schemaId)
+        return await self._getValueForId(PRIMARY_INIT_DATA, schemaId)
 
     async def getNonRevocClaimInitData(self,
                                        schemaId: ID) -> ClaimInitDataType:
-        return await self._getValueForId(self._nonRevocInitData, schemaId)
+        return await self._getValueForId(NON_REVOC_INIT_DATA, schemaId)
 
     async def getContextAttr(self, schemaId: ID):
-        return await self._getValueForId(self._m2s, schemaId)
+        return await self._getValueForId(M2, schemaId)
@@ -1,9 +1,10 @@
 from abc import abstractmethod
-from typing import Any, Dict, Sequence
+from typing import Any, Optional, Sequence
 
+from anoncreds.protocol.instrumentation import span
 from anoncreds.protocol.repo.public_repo import PublicRepo
-from anoncreds.protocol.types import Schema, SchemaKey, \
-    PublicKey, ID, \
+from anoncreds.protocol.types import Schema, \
+    PublicKey, ID, SchemaKey, \
     RevocationPublicKey, AccumulatorPublicKey, Accumulator, TailsType
 
 
@@ -58,66 +59,84 @@ class Wallet:
         raise NotImplementedError
 
 
+# names of the per-schema values a WalletInMemory keeps in a SchemaSlot
+PK = 'pk'
+PK_R = 'pkR'
+ACCUM = 'accum'
+ACCUM_PK = 'accumPk'
+TAILS = 'tails'
+
+
+class SchemaSlot:
+    """
+    Everything a wallet keeps for one schema.
+
+    A slot is created once per schema and every ID that resolved to that
+    schema is interned to it, so later lookups skip schema resolution.
+    """
+
+    __slots__ = ('schema', 'key', 'values')
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.key = schema.getKey()
+        self.values = {}
+
+
 class WalletInMemory(Wallet):
     def __init__(self, schemaId, repo: PublicRepo):
         Wallet.__init__(self, schemaId, repo)
 
-        # schema dicts
-        self._schemasByKey = {}
-        self._schemasById = {}
+        # slots by schema key and seqId
+        self._slotsByKey = {}
+        self._slotsById = {}
 
-        # other dicts with key=schemaKey
-        self._pks = {}
-        self._pkRs = {}
-        self._accums = {}
-        self._accumPks = {}
-        self._tails = {}
+        # interned handles: the (schemaKey, schemaId) of every ID seen so
+        # far, mapped to its slot; at most three per schema
+        self._handles = {}
 
     # GET
 
     async def getSchema(self, schemaId: ID) -> Schema:
-        if schemaId.schemaKey and schemaId.schemaKey in self._schemasByKey:
-            return self._schemasByKey[schemaId.schemaKey]
-        if schemaId.schemaId and schemaId.schemaId in self._schemasById:
-            return self._schemasById[schemaId.schemaId]
-
-        schema = await self._repo.getSchema(schemaId)
-        if not schema:
-            raise ValueError('No schema with ID={} and key={}'.format(
-                schemaId.schemaId, schemaId.schemaKey))
-
-        self._cacheSchema(schema)
-
-        return schema
+        return (await self._getSlot(schemaId)).schema
 
     async def getAllSchemas(self) -> Sequence[Schema]:
-        return self._schemasByKey.values()
+        return [slot.schema for slot in self._slotsByKey.values()]
+
+    def cachedSchema(self, schemaKey: SchemaKey) -> Optional[Schema]:
+        """
+        The schema with the key if the wallet already has it, without
+        asking the repo.
+        """
+        slot = self._slotsByKey.get(schemaKey)
+        return slot.schema if slot else None
 
     async def getPublicKey(self, schemaId: ID) -> PublicKey:
-        return await self._getValueForId(self._pks, schemaId,
+        return await self._getValueForId(PK, schemaId,
                                          self._repo.getPublicKey)
 
     async def getPublicKeyRevocation(self,
                                      schemaId: ID) -> RevocationPublicKey:
-        return await self._getValueForId(self._pkRs, schemaId,
+        return await self._getValueForId(PK_R, schemaId,
                                          self._repo.getPublicKeyRevocation)
 
     async def getPublicKeyAccumulator(self,
                                       schemaId: ID) -> AccumulatorPublicKey:
-        return await self._getValueForId(self._accumPks, schemaId,
+        return await self._getValueForId(ACCUM_PK, schemaId,
                                          self._repo.getPublicKeyAccumulator)
 
     async def getAccumulator(self, schemaId: ID) -> Accumulator:
-        return await self._getValueForId(self._accums, schemaId,
+        return await self._getValueForId(ACCUM, schemaId,
                                          self._repo.getAccumulator)
 
     async def getTails(self, schemaId: ID) -> TailsType:
-        return await self._getValueForId(self._tails, schemaId,
+        return await self._getValueForId(TAILS, schemaId,
                                          self._repo.getTails)
 
     async def updateAccumulator(self, schemaId: ID, ts=None, seqNo=None):
-        acc = await self._repo.getAccumulator(schemaId)
-        await self._cacheValueForId(self._accums, schemaId, acc)
+        with span('repo.getAccumulator'):
+            acc = await self._repo.getAccumulator(schemaId)
+        await self._cacheValueForId(ACCUM, schemaId, acc)
 
     async def shouldUpdateAccumulator(self, schemaId: ID, ts=None,
                                       seqNo=None):
@@ -126,36 +145,69 @@ class WalletInMemory(Wallet):
 
     # HELPER
 
-    async def _getValueForId(self, dictionary: Dict[SchemaKey, Any],
+    async def _getSlot(self, schemaId: ID) -> SchemaSlot:
+        handle = (schemaId.schemaKey, schemaId.schemaId)
+        slot = self._handles.get(handle)
+        if slot:
+            return slot
+
+        if schemaId.schemaKey:
+            slot = self._slotsByKey.get(schemaId.schemaKey)
+        if not slot and schemaId.schemaId:
+            slot = self._slotsById.get(schemaId.schemaId)
+
+        if not slot:
+            with span('repo.getSchema'):
+                schema = await self._repo.getSchema(schemaId)
+            if not schema:
+                raise ValueError('No schema with ID={} and key={}'.format(
+                    schemaId.schemaId, schemaId.schemaKey))
+            slot = self._cacheSchema(schema)
+
+        # only IDs naming the schema right are interned, so that made up
+        # IDs can't grow the handles
+        if schemaId.schemaKey in (None, slot.key) and \
+                schemaId.schemaId in (None, slot.schema.seqId):
+            self._handles[handle] = slot
+        return slot
+
+    async def _getValueForId(self, name: str,
                              schemaId: ID,
                              getFromRepo=None) -> Any:
-        schema = await self.getSchema(schemaId)
-        schemaKey = schema.getKey()
-
-        if schemaKey in dictionary:
-            return dictionary[schemaKey]
+        slot = await self._getSlot(schemaId)
+        if name in slot.values:
+            return slot.values[name]
 
         value = None
         if getFromRepo:
-            schemaId = schemaId._replace(schemaKey=schemaKey,
-                                         schemaId=schema.seqId)
-            value = await getFromRepo(schemaId)
+            schemaId = schemaId._replace(schemaKey=slot.key,
+                                         schemaId=slot.schema.seqId)
+            with span('repo.' + getFromRepo.__name__):
+                value = await getFromRepo(schemaId)
 
         if not value:
             raise ValueError(
                 'No value for schema with ID={} and key={}'.format(
                     schemaId.schemaId, schemaId.schemaKey))
 
-        dictionary[schemaKey] = value
+        slot.values[name] = value
         return value
 
-    async def _cacheValueForId(self, dictionary: Dict[SchemaKey, Any],
-                               schemaId: ID, value: Any):
-        schema = await self.getSchema(schemaId)
-        schemaKey = schema.getKey()
-        dictionary[schemaKey] = value
-
-    def _cacheSchema(self, schema: Schema):
-        self._schemasByKey[schema.getKey()] = schema
+    async def _cacheValueForId(self, name: str, schemaId: ID, value: Any):
+        slot = await self._getSlot(schemaId)
+        slot.values[name] = value
+
+    def _slotsWith(self, name: str) -> Sequence[SchemaSlot]:
+        return [slot for slot in self._slotsByKey.values()
+                if name in slot.values]
+
+    def _cacheSchema(self, schema: Schema) -> SchemaSlot:
+        slot = self._slotsByKey.get(schema.getKey())
+        if slot:
+            slot.schema = schema
+        else:
+            slot = SchemaSlot(schema)
+            self._slotsByKey[slot.key] = slot
         if schema.seqId:
-            self._schemasById[schema.seqId] = schema
+            self._slotsById[schema.seqId] = slot
+        return slot
@@ -1,38 +1,21 @@
+import asyncio
+
 import pytest
 
+from anoncreds.bench.fixtures import primes, GVT, XYZCorp
 from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.key_bundle import exportKeyBundle, importKeys, \
+    importAccumulator
 from anoncreds.protocol.prover import Prover
 from anoncreds.protocol.repo.attributes_repo import AttributeRepoInMemory
 from anoncreds.protocol.repo.public_repo import PublicRepoInMemory
-from anoncreds.protocol.types import AttribDef, AttribType, ID, ProofRequest
+from anoncreds.protocol.types import ID, ProofRequest
 from anoncreds.protocol.verifier import Verifier
 from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
 from anoncreds.protocol.wallet.prover_wallet import ProverWalletInMemory
 from anoncreds.protocol.wallet.wallet import WalletInMemory
-from config.config import cmod
 
 #
-primes = {
-    "prime1":
-        (cmod.integer(
-            157329491389375793912190594961134932804032426403110797476730107804356484516061051345332763141806005838436304922612495876180233509449197495032194146432047460167589034147716097417880503952139805241591622353828629383332869425029086898452227895418829799945650973848983901459733426212735979668835984691928193677469),
-         cmod.integer(
-             151323892648373196579515752826519683836764873607632072057591837216698622729557534035138587276594156320800768525825023728398410073692081011811496168877166664537052088207068061172594879398773872352920912390983199416927388688319207946493810449203702100559271439586753256728900713990097168484829574000438573295723))
-    , "prime2":
-        (cmod.integer(
-            150619677884468353208058156632953891431975271416620955614548039937246769610622017033385394658879484186852231469238992217246264205570458379437126692055331206248530723117202131739966737760399755490935589223401123762051823602343810554978803032803606907761937587101969193241921351011430750970746500680609001799529),
-         cmod.integer(
-             171590857568436644992359347719703764048501078398666061921719064395827496970696879481740311141148273607392657321103691543916274965279072000206208571551864201305434022165176563363954921183576230072812635744629337290242954699427160362586102068962285076213200828451838142959637006048439307273563604553818326766703))
-}
-
-GVT = AttribDef('gvt',
-                [AttribType('name', encode=True),
-                 AttribType('age', encode=False),
-                 AttribType('height', encode=False),
-                 AttribType('sex', encode=True)])
-XYZCorp = AttribDef('xyz',
-                    [AttribType('status', encode=True),
-                     AttribType('period', encode=False)])
 # NASEMP = GVT + XYZCorp
 #
 iA1 = 100
@@ -66,6 +49,42 @@ def primes2():
     return dict(p_prime=P_PRIME2, q_prime=Q_PRIME2)
 
 
+# ############ session scope
+#
+# the keys and accumulators are generated once and imported by the tests
+
+def _genKeyBundle(attrDef, schemaName, primes, iA):
+    async def gen():
+        issuer = Issuer(IssuerWalletInMemory('issuer', PublicRepoInMemory()),
+                        AttributeRepoInMemory())
+        schema = await issuer.genSchema(schemaName, "1.0",
+                                        attrDef.attribNames())
+        schemaId = ID(schema.getKey())
+        await issuer.genKeys(schemaId, **primes)
+        await issuer.issueAccumulator(schemaId=schemaId, iA=iA, L=L)
+        return await exportKeyBundle(issuer.wallet, schemaId)
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(gen())
+    finally:
+        loop.close()
+
+
+@pytest.fixture(scope="session")
+def keyBundleGvt():
+    P_PRIME1, Q_PRIME1 = primes.get("prime1")
+    return _genKeyBundle(GVT, "GVT", dict(p_prime=P_PRIME1, q_prime=Q_PRIME1),
+                         iA1)
+
+
+@pytest.fixture(scope="session")
+def keyBundleXyz():
+    P_PRIME2, Q_PRIME2 = primes.get("prime2")
+    return _genKeyBundle(XYZCorp, "XYZCorp",
+                         dict(p_prime=P_PRIME2, q_prime=Q_PRIME2), iA2)
+
+
 @pytest.fixture(scope="function")
 def attrRepo():
     return AttributeRepoInMemory()
@@ -144,27 +163,29 @@ def schemaXyzId(schemaXyz):
 
 
 @pytest.fixture(scope="function")
-def keysGvt(primes1, issuerGvt, schemaGvtId, event_loop):
-    return event_loop.run_until_complete(issuerGvt.genKeys(schemaGvtId,
-                                                           **primes1))
+def keysGvt(keyBundleGvt, issuerGvt, schemaGvtId, event_loop):
+    return event_loop.run_until_complete(
+        importKeys(issuerGvt.wallet, schemaGvtId, keyBundleGvt))
 
 
 @pytest.fixture(scope="function")
-def keysXyz(primes2, issuerXyz, schemaXyzId, event_loop):
-    return event_loop.run_until_complete(issuerXyz.genKeys(schemaXyzId,
-                                                           **primes2))
+def keysXyz(keyBundleXyz, issuerXyz, schemaXyzId, event_loop):
+    return event_loop.run_until_complete(
+        importKeys(issuerXyz.wallet, schemaXyzId, keyBundleXyz))
 
 
 @pytest.fixture(scope="function")
-def issueAccumulatorGvt(schemaGvtId, issuerGvt, keysGvt, event_loop):
+def issueAccumulatorGvt(schemaGvtId, issuerGvt, keysGvt, keyBundleGvt,
+                        event_loop):
     event_loop.run_until_complete(
-        issuerGvt.issueAccumulator(schemaId=schemaGvtId, iA=iA1, L=L))
+        importAccumulator(issuerGvt.wallet, schemaGvtId, keyBundleGvt))
 
 
 @pytest.fixture(scope="function")
-def issueAccumulatorXyz(schemaXyzId, issuerXyz, keysXyz, event_loop):
+def issueAccumulatorXyz(schemaXyzId, issuerXyz, keysXyz, keyBundleXyz,
+                        event_loop):
     event_loop.run_until_complete(
-        issuerXyz.issueAccumulator(schemaId=schemaXyzId, iA=iA2, L=L))
+        importAccumulator(issuerXyz.wallet, schemaXyzId, keyBundleXyz))
 
 
 @pytest.fixture(scope="function")
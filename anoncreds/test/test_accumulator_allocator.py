@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from anoncreds.protocol.executor import CryptoExecutor, THREAD
+from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.revocation.accumulators.accumulator_allocator import \
+    AccumulatorAllocator
+from anoncreds.protocol.revocation.accumulators.non_revocation_claim_issuer import \
+    NonRevocationClaimIssuer
+from anoncreds.protocol.types import ID, Accumulator, AccumulatorPublicKey
+from anoncreds.protocol.utils import pairingGroup
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
+from anoncreds.test.conftest import GVT
+from config.config import cmod
+
+
+class YieldingIssuerWallet(IssuerWalletInMemory):
+    """
+    Gives control back to the loop on accumulator access, like a wallet
+    backed by real storage would.
+    """
+
+    async def getAccumulator(self, schemaId: ID):
+        await asyncio.sleep(0)
+        return await super().getAccumulator(schemaId)
+
+    async def submitAccumUpdate(self, schemaId: ID, accum, timestampMs):
+        await asyncio.sleep(0)
+        await super().submitAccumUpdate(schemaId, accum, timestampMs)
+
+
+@pytest.fixture(scope="function")
+def yieldingIssuer(publicRepo, attrRepo):
+    return Issuer(YieldingIssuerWallet('issuer1', publicRepo), attrRepo)
+
+
+@pytest.fixture(scope="function")
+def yieldingSchemaId(yieldingIssuer, event_loop):
+    schema = event_loop.run_until_complete(
+        yieldingIssuer.genSchema('GVT', '1.0', GVT.attribNames()))
+    return ID(schema.getKey())
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testConcurrentReservationsAreUnique(yieldingIssuer,
+                                              yieldingSchemaId):
+    wallet = yieldingIssuer.wallet
+    await wallet.submitAccumPublic(yieldingSchemaId,
+                                   AccumulatorPublicKey(z=1),
+                                   Accumulator(1, 1, set(), 5000), {})
+    allocator = AccumulatorAllocator(wallet)
+
+    res = await asyncio.gather(
+        *[allocator.reserve(yieldingSchemaId) for _ in range(3000)])
+    assert sorted(i for i, _ in res) == list(range(1, 3001))
+    assert (await wallet.getAccumulator(yieldingSchemaId)).currentI == 3001
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testFullAccumulatorRejected(yieldingIssuer, yieldingSchemaId):
+    wallet = yieldingIssuer.wallet
+    await wallet.submitAccumPublic(yieldingSchemaId,
+                                   AccumulatorPublicKey(z=1),
+                                   Accumulator(1, 1, set(), 3), {})
+    allocator = AccumulatorAllocator(wallet)
+
+    res = await asyncio.gather(
+        *[allocator.reserve(yieldingSchemaId) for _ in range(5)],
+        return_exceptions=True)
+    assert sorted(i for i, _ in res[:3]) == [1, 2, 3]
+    assert all(isinstance(r, ValueError) for r in res[3:])
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testConcurrentIssuanceKeepsAccumulatorConsistent(
+        yieldingIssuer, yieldingSchemaId, primes1, publicRepo):
+    count = 30
+    wallet = yieldingIssuer.wallet
+    await yieldingIssuer.genKeys(yieldingSchemaId, **primes1)
+    await yieldingIssuer.issueAccumulator(yieldingSchemaId, iA=1, L=count)
+
+    executor = CryptoExecutor(THREAD, maxWorkers=4)
+    nonRevocIssuer = NonRevocationClaimIssuer(wallet, executor)
+    group = pairingGroup()
+    try:
+        res = await asyncio.gather(
+            *[nonRevocIssuer.issueNonRevocationClaim(
+                yieldingSchemaId, group.random(cmod.G1), None, None, m2=k)
+                for k in range(count)])
+    finally:
+        executor.shutdown()
+
+    pkR = await wallet.getPublicKeyRevocation(yieldingSchemaId)
+    tails = await wallet.getTails(yieldingSchemaId)
+    accumPk = await publicRepo.getPublicKeyAccumulator(yieldingSchemaId)
+    accum = await wallet.getAccumulator(yieldingSchemaId)
+
+    claims = [claim for claim, _, _ in res]
+    assert sorted(c.i for c in claims) == list(range(1, count + 1))
+    assert accum.V == set(range(1, count + 1))
+
+    expectedAcc = 1
+    for j in accum.V:
+        expectedAcc *= tails[accum.L + 1 - j]
+    assert accum.acc == expectedAcc
+
+    # every witness matches the accumulator it was added to
+    for claim in claims:
+        acc = 1
+        for j in claim.witness.V:
+            acc *= tails[accum.L + 1 - j]
+        assert cmod.pair(claim.gi, acc) / \
+               cmod.pair(pkR.g, claim.witness.omega) == accumPk.z
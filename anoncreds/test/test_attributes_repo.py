@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.repo.attributes_ingest import readCsv, readJsonl, \
+    ingestAttributes
+from anoncreds.protocol.repo.attributes_repo import AttributeRepoInMemory, \
+    AttributeRepoSqlite
+from anoncreds.protocol.types import ProofRequest, AttributeInfo, \
+    PredicateGE, SchemaKey, ID
+from anoncreds.test.conftest import GVT, proverId1, presentProofAndVerify
+
+GVT_KEY = SchemaKey('GVT', '1.0', 'issuer1')
+
+
+@pytest.fixture(scope="function")
+def gvtCsv(tmpdir):
+    path = tmpdir.join('gvt.csv')
+    path.write('userId,name,age,height,sex\n'
+               '{},Alex,28,175,male\n'
+               '333,Jason,42,180,male\n'.format(proverId1))
+    return str(path)
+
+
+@pytest.fixture(scope="function")
+def gvtJsonl(tmpdir):
+    path = tmpdir.join('gvt.jsonl')
+    path.write('\n'.join(json.dumps(row) for row in [
+        {'userId': proverId1, 'name': 'Alex', 'age': 28, 'height': 175,
+         'sex': 'male'},
+        {'userId': 333, 'name': 'Jason', 'age': 42, 'height': 180,
+         'sex': 'male'}]))
+    return str(path)
+
+
+def testCsvAndJsonlIngestAlike(gvtCsv, gvtJsonl):
+    fromCsv = AttributeRepoInMemory()
+    fromJsonl = AttributeRepoInMemory()
+    assert ingestAttributes(fromCsv, GVT_KEY, GVT, readCsv(gvtCsv),
+                            chunkSize=1) == 2
+    assert ingestAttributes(fromJsonl, GVT_KEY, GVT, readJsonl(gvtJsonl)) == 2
+
+    expected = GVT.attribs(name='Alex', age=28, height=175, sex='male')
+    assert fromCsv.getAttributes(GVT_KEY, proverId1) == expected
+    assert fromJsonl.getAttributes(GVT_KEY, proverId1) == expected
+    assert fromCsv.getAttributes(GVT_KEY, 333).encoded() == \
+           fromJsonl.getAttributes(GVT_KEY, 333).encoded()
+
+
+def testIngestRejectsUnknownAttributes(tmpdir):
+    path = tmpdir.join('bad.jsonl')
+    path.write(json.dumps({'userId': 1, 'name': 'Alex', 'weight': 70}))
+    with pytest.raises(ValueError):
+        ingestAttributes(AttributeRepoInMemory(), GVT_KEY, GVT,
+                         readJsonl(str(path)))
+
+
+def testSqliteRepoKeepsEncoding(tmpdir, gvtCsv):
+    path = str(tmpdir.join('attrs.db'))
+    repo = AttributeRepoSqlite(path)
+    ingestAttributes(repo, GVT_KEY, GVT, readCsv(gvtCsv))
+    repo.close()
+
+    repo = AttributeRepoSqlite(path)
+    attrs = repo.getAttributes(GVT_KEY, proverId1)
+    expected = GVT.attribs(name='Alex', age=28, height=175, sex='male')
+    assert attrs == expected
+    assert attrs.encoded() == expected.encoded()
+    assert repo.getAttributes(GVT_KEY, 'unknown') is None
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testClaimFromSqliteRepo(issuerWallet1, prover1, verifier, primes1,
+                                  gvtJsonl):
+    repo = AttributeRepoSqlite()
+    issuer = Issuer(issuerWallet1, repo)
+    schema = await issuer.genSchema('GVT', '1.0', GVT.attribNames())
+    schemaId = ID(schema.getKey())
+    await issuer.genKeys(schemaId, **primes1)
+    await issuer.issueAccumulator(schemaId=schemaId, iA=100, L=5)
+    ingestAttributes(repo, schema.getKey(), GVT, readJsonl(gvtJsonl))
+
+    claimsReq = await prover1.createClaimRequest(schemaId)
+    signature, claims = await issuer.issueClaim(schemaId, claimsReq)
+    await prover1.processClaim(schemaId, claims, signature)
+
+    proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                verifiableAttributes={
+                                    'uuid': AttributeInfo(name='name')},
+                                predicates={
+                                    'predicate_uuid': PredicateGE('age', 18)})
+    assert await presentProofAndVerify(verifier, proofRequest, prover1)
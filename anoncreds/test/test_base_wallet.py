@@ -1,4 +1,7 @@
-from anoncreds.protocol.wallet.wallet import Wallet
+import pytest
+
+from anoncreds.protocol.types import ID
+from anoncreds.protocol.wallet.wallet import Wallet, WalletInMemory
 
 
 def test_wallet_name(publicRepo):
@@ -6,3 +9,67 @@ def test_wallet_name(publicRepo):
     wallet = Wallet(walletName, publicRepo)
     assert wallet.name == walletName
     assert wallet.walletId == wallet.name
+
+
+class CountingRepo:
+    def __init__(self, repo):
+        self._repo = repo
+        self.schemaCalls = 0
+
+    def __getattr__(self, item):
+        return getattr(self._repo, item)
+
+    async def getSchema(self, schemaId):
+        self.schemaCalls += 1
+        return await self._repo.getSchema(schemaId)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def test_schema_resolved_once_per_wallet(publicRepo, schemaGvt, keysGvt):
+    repo = CountingRepo(publicRepo)
+    wallet = WalletInMemory('verifier1', repo)
+
+    byKey = ID(schemaKey=schemaGvt.getKey())
+    bySeqId = ID(schemaId=schemaGvt.seqId)
+    pk = await wallet.getPublicKey(byKey)
+    assert await wallet.getPublicKey(bySeqId) is pk
+    assert await wallet.getPublicKey(byKey) is pk
+    assert await wallet.getSchema(bySeqId) == schemaGvt
+    assert repo.schemaCalls == 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def test_handles_keyed_on_schema_key_and_id(publicRepo, schemaGvt,
+                                                  keysGvt):
+    wallet = WalletInMemory('verifier1', publicRepo)
+    assert wallet.cachedSchema(schemaGvt.getKey()) is None
+
+    for seqId in range(1, 50):
+        await wallet.getSchema(ID(schemaKey=schemaGvt.getKey(),
+                                  schemaId=schemaGvt.seqId, seqId=seqId))
+    await wallet.getSchema(ID(schemaKey=schemaGvt.getKey()))
+    await wallet.getSchema(ID(schemaId=schemaGvt.seqId))
+    await wallet.getSchema(ID(schemaKey=schemaGvt.getKey(),
+                              schemaId=schemaGvt.seqId + 1000))
+    assert len(wallet._handles) == 3
+    assert wallet.cachedSchema(schemaGvt.getKey()) == schemaGvt
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def test_claims_kept_per_schema(prover1, claimsProver1Gvt, schemaGvtId,
+                                      schemaXyzId, keysXyz):
+    assert await prover1.wallet.getClaimSignature(schemaGvtId) == \
+           claimsProver1Gvt
+    assert list((await prover1.wallet.getAllClaimsSignatures()).keys()) == \
+           [schemaGvtId.schemaKey]
+    with pytest.raises(ValueError):
+        await prover1.wallet.getClaimSignature(schemaXyzId)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+def test_issuer_finds_generated_schema(issuerGvt, schemaGvt, schemaXyz):
+    assert issuerGvt.isSchemaExists(schemaGvt.getKey()) == schemaGvt
+    assert issuerGvt.isSchemaExists(schemaXyz.getKey()) is None
@@ -0,0 +1,51 @@
+import pickle
+from collections import OrderedDict
+
+import pytest
+
+from anoncreds.bench.backends import produce, verifyArtifacts, failures, \
+    formatReport, main, QUICK_SUITE, OK, UNAVAILABLE
+from anoncreds.protocol.codec import pack, unpack
+from config.config import selectedBackend
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testSavedProofsVerify(tmpdir):
+    path = str(tmpdir.join('flows'))
+    times = await produce(QUICK_SUITE[:1], 1, path)
+    assert times['integer.modexp'] > 0
+    assert times['primary-a2p1c1.verify'] > 0
+    assert await verifyArtifacts(path) == {'primary-a2p1c1': OK}
+
+    with open(path, 'rb') as f:
+        flows = unpack(pickle.load(f))
+    flows['primary-a2p1c1']['proofRequest'].nonce += 1
+    with open(path, 'wb') as f:
+        pickle.dump(pack(flows), f)
+    assert await verifyArtifacts(path) == {'primary-a2p1c1': 'not verified'}
+
+
+def testReportFailures():
+    report = OrderedDict([
+        ('times', OrderedDict([('a', {'pairing': 0.02}),
+                               ('b', {'pairing': 0.01})])),
+        ('crossVerification', OrderedDict([
+            ('a', {'b': {'primary': OK, 'revocation': 'not verified'}}),
+            ('b', {'a': {'primary': OK, 'revocation': OK}})])),
+        (UNAVAILABLE, {'c': 'ImportError: No module named c'})])
+    assert failures(report) == [('a', 'b', 'revocation', 'not verified')]
+    text = formatReport(report)
+    assert 'revocation proof of a on b: not verified' in text
+    assert '0.50' in text
+    assert 'c unavailable' in text
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+def testMainRunsBackendsInProcesses(tmpdir, capsys):
+    output = str(tmpdir.join('report.json'))
+    assert main(['--backends', selectedBackend(), 'unknown', '--quick',
+                 '--repeat', '1', '--output', output]) == 0
+    out = capsys.readouterr().out
+    assert 'revocation-a2p1c1L5.verify' in out
+    assert 'unknown unavailable' in out
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from anoncreds.bench.compare import compareMetrics, runSuite, main, \
+    REGRESSED, IMPROVED, OK, NEW, MISSING
+from anoncreds.bench.phases import SweepPoint, PRIMARY
+
+
+def statuses(comparisons):
+    return {c.metric: c.status for c in comparisons}
+
+
+def testOpCountsHaveNoTolerance():
+    res = compareMetrics({'p.verify.modexp': 30, 'p.verify.pairing': 21},
+                         {'p.verify.modexp': 31, 'p.verify.pairing': 20})
+    assert statuses(res) == {'p.verify.modexp': REGRESSED,
+                             'p.verify.pairing': IMPROVED}
+
+
+def testTimesWithinTolerance():
+    res = compareMetrics({'p.verify.seconds': 0.1, 'p.issueClaim.seconds': 0.1},
+                         {'p.verify.seconds': 0.12,
+                          'p.issueClaim.seconds': 0.13},
+                         timeTolerance=0.25,
+                         tolerances=[('*.issueClaim.*', 0.2)])
+    assert statuses(res) == {'p.verify.seconds': OK,
+                             'p.issueClaim.seconds': REGRESSED}
+
+
+def testNewAndMissingMetricsDontRegress():
+    res = compareMetrics({'p.verify.modexp': 30}, {'p.verify.hash': 1})
+    assert statuses(res) == {'p.verify.modexp': MISSING,
+                             'p.verify.hash': NEW}
+
+
+def testMainExitsWithOneOnRegression(tmpdir, capsys):
+    baseline = str(tmpdir.join('baseline.json'))
+    current = str(tmpdir.join('current.json'))
+    with open(baseline, 'w') as f:
+        json.dump({'metrics': {'p.verify.modexp': 30}}, f)
+    with open(current, 'w') as f:
+        json.dump({'metrics': {'p.verify.modexp': 32}}, f)
+
+    assert main(['--baseline', baseline, '--current', current]) == 1
+    out = capsys.readouterr().out
+    assert 'p.verify.modexp' in out and REGRESSED in out
+    assert main(['--baseline', baseline, '--current', current,
+                 '--ops-tolerance', '0.1']) == 0
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testSuiteOpCountsAreStable():
+    point = SweepPoint(PRIMARY, 2, 1, 1, None)
+    first = await runSuite(1, [point], times=False)
+    second = await runSuite(1, [point], times=True)
+    assert first['primary-a2p1c1.verify.modexp'] > 0
+    assert second['primary-a2p1c1.verify.seconds'] > 0
+    assert all(c.status == OK for c in compareMetrics(
+        first, {m: v for m, v in second.items() if m in first}))
@@ -0,0 +1,19 @@
+import random
+
+from anoncreds.bench.four_squares import measure, greedyFourSquares, main
+
+
+def testGreedyFailsWhereFourSquaresDoesnt():
+    assert greedyFourSquares(23) is None
+    assert greedyFourSquares(85) == [9, 2, 0, 0]
+    res = measure(64, 20, random.Random(1))
+    assert res['count'] == 20
+    assert res['greedyFailures'] > 0
+    assert 0 < res['p50'] <= res['max']
+
+
+def testMain(capsys):
+    main(['--bits', '8', '256', '--count', '5'])
+    out = capsys.readouterr().out
+    assert 'greedy failed' in out
+    assert '256' in out
@@ -0,0 +1,26 @@
+import pytest
+
+from anoncreds.bench.phases import sweepPoints, measure, SweepPoint, \
+    PRIMARY, REVOCATION
+
+
+def testSweepSkipsImpossiblePoints():
+    points = sweepPoints([PRIMARY, REVOCATION], attrs=[2, 4],
+                         predicates=[0, 3], claims=[1], Ls=[5, 100])
+    assert SweepPoint(PRIMARY, 2, 3, 1, None) not in points
+    assert SweepPoint(PRIMARY, 4, 3, 1, None) in points
+    # L is swept for the revocation flow only
+    assert len([p for p in points if p.flow == PRIMARY]) == 3
+    assert len([p for p in points if p.flow == REVOCATION]) == 6
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testMeasureReportsEveryPhase():
+    res = await measure(SweepPoint(REVOCATION, 3, 1, 2, 5), repeat=1)
+    assert res['claims'] == 2
+    assert set(res['phases']) == {'genKeys', 'issueAccumulator',
+                                  'issueClaim', 'processClaim',
+                                  'presentProof', 'verify'}
+    assert res['phases']['genKeys']['n'] == 2
+    assert res['phases']['verify']['p50'] > 0
@@ -0,0 +1,25 @@
+import pytest
+
+from anoncreds.bench.simulator import Workload, simulate, ISSUE, PROOF, \
+    REVOKE, VERIFY, MEMORY, SQLITE
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+@pytest.mark.parametrize('repo', [MEMORY, SQLITE])
+async def testSimulationReportsEveryOperation(repo):
+    mix = {ISSUE: 1, PROOF: 1, REVOKE: 1, VERIFY: 1}
+    report = await simulate(Workload(issuers=1, provers=2, verifiers=1,
+                                     ops=8, concurrency=2, mix=mix, repo=repo,
+                                     L=10, seed=3))
+    operations = report['operations']
+    assert sum(res['count'] for res in operations.values()) == 8
+    for op, res in operations.items():
+        assert res['p50'] <= res['p95'] <= res['p99']
+        # nothing failed unexpectedly
+        assert set(res['outcomes']) <= {
+            'issued', 'presented', 'revoked', 'verified', 'rejected',
+            'no claims', 'no proofs', 'revoked meanwhile'}
+    assert report['setupRepoCalls']['submitPublicKeys'] == 1
+    if PROOF in operations:
+        assert operations[PROOF]['repoCalls']
@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+
+from anoncreds.protocol.cache import LRUCache
+from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.repo.attributes_repo import AttributeRepoInMemory
+from anoncreds.protocol.repo.caching_public_repo import CachingPublicRepo, \
+    SCHEMAS, PUBLIC_KEYS, ACCUMULATORS
+from anoncreds.protocol.repo.public_repo import PublicRepoInMemory
+from anoncreds.protocol.types import ID, Schema, AccumulatorPublicKey
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+from anoncreds.test.conftest import GVT
+
+
+class SlowCountingRepo(PublicRepoInMemory):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def getPublicKey(self, schemaId: ID, signatureType='CL'):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return await super().getPublicKey(schemaId, signatureType)
+
+
+class BlockingAccumulatorRepo(PublicRepoInMemory):
+    def __init__(self):
+        super().__init__()
+        self.fetching = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def getAccumulator(self, schemaId: ID):
+        accum = await super().getAccumulator(schemaId)
+        self.fetching.set()
+        await self.release.wait()
+        return accum
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def slowRepo():
+    return SlowCountingRepo()
+
+
+@pytest.fixture(scope="function")
+def gvtKeysInSlowRepo(slowRepo, primes1, event_loop):
+    issuer = Issuer(IssuerWalletInMemory('issuer1', slowRepo),
+                    AttributeRepoInMemory())
+    schema = event_loop.run_until_complete(
+        issuer.genSchema('GVT', '1.0', GVT.attribNames()))
+    event_loop.run_until_complete(
+        issuer.genKeys(ID(schema.getKey()), **primes1))
+    return schema
+
+
+def testLRUCacheEvictsLeastRecentlyUsed():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == (True, 1)
+    cache.put('c', 3)
+
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.get('c') == (True, 3)
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 1
+
+
+def testLRUCacheExpiresEntries():
+    timer = FakeTimer()
+    cache = LRUCache(10, ttl=5, timer=timer)
+    cache.put('a', 1)
+    timer.now = 4
+    assert cache.get('a') == (True, 1)
+    timer.now = 5
+    assert cache.get('a') == (False, None)
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testSchemaCachedByKeyAndSeqId(publicRepo):
+    repo = CachingPublicRepo(publicRepo)
+    schema = await repo.submitSchema(Schema('GVT', '1.0', ['name'], 'issuer1'))
+
+    assert await repo.getSchema(ID(schemaKey=schema.getKey())) == schema
+    assert await repo.getSchema(ID(schemaId=schema.seqId)) == schema
+    assert repo.stats[SCHEMAS].hits == 2
+    assert repo.stats[SCHEMAS].misses == 0
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testConcurrentMissesAreCoalesced(slowRepo, gvtKeysInSlowRepo):
+    repo = CachingPublicRepo(slowRepo)
+    schemaId = ID(gvtKeysInSlowRepo.getKey())
+
+    pks = await asyncio.gather(
+        *[repo.getPublicKey(schemaId) for _ in range(10)])
+
+    assert slowRepo.calls == 1
+    assert all(pk == pks[0] for pk in pks)
+    assert repo.stats[PUBLIC_KEYS].misses == 10
+    assert repo.stats[PUBLIC_KEYS].coalesced == 9
+
+    await repo.getPublicKey(schemaId)
+    assert slowRepo.calls == 1
+    assert repo.stats[PUBLIC_KEYS].hits == 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testFailedFetchIsNotCached(publicRepo):
+    repo = CachingPublicRepo(publicRepo)
+    schema = await repo.submitSchema(Schema('GVT', '1.0', ['name'], 'issuer1'))
+
+    with pytest.raises(ValueError):
+        await repo.getPublicKey(ID(schema.getKey()))
+    with pytest.raises(ValueError):
+        await repo.getPublicKey(ID(schema.getKey()))
+    assert repo.stats[PUBLIC_KEYS].size == 0
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testAccumulatorExpiresAfterTtl(publicRepo, primes1):
+    timer = FakeTimer()
+    repo = CachingPublicRepo(publicRepo, accumulatorTtl=10, timer=timer)
+    issuer = Issuer(IssuerWalletInMemory('issuer1', repo),
+                    AttributeRepoInMemory())
+    schema = await issuer.genSchema('GVT', '1.0', GVT.attribNames())
+    schemaId = ID(schema.getKey())
+    await issuer.genKeys(schemaId, **primes1)
+    await issuer.issueAccumulator(schemaId, iA=100, L=5)
+
+    verifierWallet = WalletInMemory('verifier1', repo)
+    await verifierWallet.getAccumulator(schemaId)
+    assert repo.stats[ACCUMULATORS].hits == 1
+
+    timer.now = 10
+    await verifierWallet.updateAccumulator(schemaId)
+    assert repo.stats[ACCUMULATORS].expirations == 1
+    assert repo.stats[ACCUMULATORS].size == 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testFetchedAccumulatorDoesntOverwriteSubmittedOne():
+    publicRepo = BlockingAccumulatorRepo()
+    repo = CachingPublicRepo(publicRepo)
+    schema = await repo.submitSchema(Schema('GVT', '1.0', ['name'], 'issuer1'))
+    schemaId = ID(schema.getKey())
+    await publicRepo.submitAccumulator(schemaId, AccumulatorPublicKey(1),
+                                       'old', 'tails')
+
+    fetch = asyncio.ensure_future(repo.getAccumulator(schemaId))
+    await publicRepo.fetching.wait()
+    # a revocation is submitted while the old accumulator is being fetched
+    await repo.submitAccumUpdate(schemaId, 'new', 1)
+    assert await repo.getAccumulator(schemaId) == 'new'
+
+    publicRepo.release.set()
+    assert await fetch == 'old'
+    assert await repo.getAccumulator(schemaId) == 'new'
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from config import config
+from config.config import cmod, selectBackend, registerBackend, \
+    selectedBackend, BACKEND_ENV
+
+PROTOCOL_MODULES = ['anoncreds.protocol.issuer', 'anoncreds.protocol.prover',
+                    'anoncreds.protocol.verifier',
+                    'anoncreds.protocol.verifier_pool']
+
+
+def runPython(code, **env):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path
+                                                      if p), **env)
+    return subprocess.run([sys.executable, '-c', code], env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True)
+
+
+# imported on first use only, as each takes milliseconds to import
+DEFERRED_MODULES = ['charm', 'gmpy2', 'multiprocessing',
+                    'concurrent.futures.process', 'sqlite3', 'pickle', 'uuid']
+
+
+def testImportingProtocolIsCheap():
+    # the protocol's API is async, so its callers have asyncio loaded
+    # anyway: the protocol modules are timed on top of it, against the
+    # import of asyncio itself
+    res = runPython('''
+import sys, time
+start = time.perf_counter()
+import asyncio
+asyncioTime = time.perf_counter() - start
+start = time.perf_counter()
+import {}
+protocolTime = time.perf_counter() - start
+print(protocolTime, asyncioTime)
+print(' '.join(m for m in {!r} if m in sys.modules or
+               any(n.startswith(m + '.') for n in sys.modules)))
+'''.format(', '.join(PROTOCOL_MODULES), DEFERRED_MODULES))
+    assert res.returncode == 0, res.stderr
+    times, loaded = res.stdout.split('\n', 1)
+    assert loaded.strip() == ''
+    protocolTime, asyncioTime = map(float, times.split())
+    assert protocolTime < 2 * asyncioTime
+
+
+def testBackendFromEnvironment():
+    res = runPython('from config.config import cmod\ncmod.integer',
+                    **{BACKEND_ENV: 'unknown'})
+    assert res.returncode != 0
+    assert 'Unknown crypto backend unknown' in res.stderr
+
+    res = runPython('from config.config import cmod\nprint(cmod.integer(7))',
+                    **{BACKEND_ENV: 'charm'})
+    assert res.returncode == 0, res.stderr
+    assert res.stdout.strip() == '7'
+
+
+def testSelectBackend():
+    assert cmod.integer(7) == 7
+    selectBackend(selectedBackend())
+    with pytest.raises(ValueError):
+        selectBackend('unknown')
+
+    registerBackend('other', 'config.config-crypto-example1')
+    try:
+        # another one is already in use
+        with pytest.raises(RuntimeError):
+            selectBackend('other')
+    finally:
+        del config._backends['other']
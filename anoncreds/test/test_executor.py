@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from anoncreds.protocol.codec import pack, unpack
+from anoncreds.protocol.executor import CryptoExecutor, THREAD, PROCESS
+from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.prover import Prover
+from anoncreds.protocol.repo.attributes_repo import AttributeRepoInMemory
+from anoncreds.protocol.types import ID, ProofRequest, AttributeInfo, \
+    PredicateGE
+from anoncreds.protocol.verifier import Verifier
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
+from anoncreds.protocol.wallet.prover_wallet import ProverWalletInMemory
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+from anoncreds.test.conftest import GVT, presentProofAndVerify
+
+
+@pytest.fixture(scope="module", params=[THREAD, PROCESS])
+def executor(request):
+    executor = CryptoExecutor(request.param, maxWorkers=2)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPackKeepsTypesAndValues(publicRepo, keysGvt, schemaGvtId,
+                                      issueAccumulatorGvt):
+    pk = await publicRepo.getPublicKey(schemaGvtId)
+    pkR = await publicRepo.getPublicKeyRevocation(schemaGvtId)
+    accum = await publicRepo.getAccumulator(schemaGvtId)
+
+    assert unpack(pack(pk)) == pk
+    assert unpack(pack(pkR)) == pkR
+    assert unpack(pack(accum)) == accum
+    assert unpack(pack({1: [pk.N, (pk.S, 2)]})) == {1: [pk.N, (pk.S, 2)]}
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testProofWithExecutor(executor, publicRepo, primes1):
+    attrRepo = AttributeRepoInMemory()
+    issuer = Issuer(IssuerWalletInMemory('issuer1', publicRepo), attrRepo,
+                    executor)
+    prover = Prover(ProverWalletInMemory('prover1', publicRepo), executor)
+    verifier = Verifier(WalletInMemory('verifier1', publicRepo), executor)
+
+    schema = await issuer.genSchema('GVT', '1.0', GVT.attribNames())
+    schemaId = ID(schema.getKey())
+    await issuer.genKeys(schemaId, **primes1)
+    await issuer.issueAccumulator(schemaId=schemaId, iA=100, L=5)
+    attrRepo.addAttributes(schema.getKey(), prover.proverId,
+                           GVT.attribs(name='Alex', age=28, height=175,
+                                       sex='male'))
+
+    claimsReq = await prover.createClaimRequest(schemaId)
+    signature, claims = await issuer.issueClaim(schemaId, claimsReq)
+    await prover.processClaim(schemaId, claims, signature)
+
+    proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                verifiableAttributes={
+                                    'uuid': AttributeInfo(name='name')},
+                                predicates={
+                                    'predicate_uuid': PredicateGE('age', 18)})
+    assert await presentProofAndVerify(verifier, proofRequest, prover)
+
+
+def testUnknownModeRejected():
+    with pytest.raises(ValueError):
+        CryptoExecutor('gpu')
+
+
+class TrackingExecutor(CryptoExecutor):
+    def __init__(self):
+        super().__init__(THREAD, maxWorkers=2)
+        self.inFlight = 0
+        self.maxInFlight = 0
+
+    async def run(self, fn, *args):
+        self.inFlight += 1
+        self.maxInFlight = max(self.maxInFlight, self.inFlight)
+        try:
+            # give the other claims a chance to start
+            await asyncio.sleep(0.01)
+            return await super().run(fn, *args)
+        finally:
+            self.inFlight -= 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testClaimsInitializedConcurrently(prover1, allClaims, verifier):
+    executor = TrackingExecutor()
+    prover = Prover(prover1.wallet, executor)
+    try:
+        proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                    verifiableAttributes={
+                                        'uuid1': AttributeInfo(name='name'),
+                                        'uuid2': AttributeInfo(name='status')},
+                                    predicates={
+                                        'predicate_uuid': PredicateGE('age',
+                                                                      18)})
+        assert await presentProofAndVerify(verifier, proofRequest, prover)
+    finally:
+        executor.shutdown()
+    assert executor.maxInFlight == 2
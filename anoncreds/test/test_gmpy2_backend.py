@@ -0,0 +1,84 @@
+import importlib
+import random
+
+import pytest
+
+gmpy2 = pytest.importorskip('gmpy2')
+charmInteger = pytest.importorskip('charm.core.math.integer')
+charmConversion = pytest.importorskip('charm.toolbox.conversion').Conversion
+
+backend = importlib.import_module('config.config-crypto-gmpy2')
+integer = backend.integer
+C = charmInteger.integer
+
+N = int(gmpy2.next_prime(random.getrandbits(1024)))
+
+
+def values(n=50, bits=1000):
+    rnd = random.Random(5)
+    return [rnd.getrandbits(bits) for _ in range(n)] + [0, 1, 255, 256]
+
+
+def testArithmeticAsCharm():
+    def same(g, c):
+        # charm leaves some products unreduced
+        return str(g) == str(c % C(N))
+
+    for a, b in zip(values(), reversed(values())):
+        ga, gb = integer(a) % N, integer(b) % N
+        ca, cb = C(a) % C(N), C(b) % C(N)
+        assert same(ga * gb * ga, ca * cb * ca)
+        if a and b:
+            assert same(ga / gb, ca / cb)
+            assert same(ga ** -1, ca ** -1)
+        assert same(ga - gb, ca - cb)
+        assert same(ga ** b, ca ** C(b))
+        assert str(1 % integer(N)) == str(1 % C(N))
+        assert str(integer(a) - 30) == str(C(a) - 30)
+
+
+def testMixedModuliRejected():
+    with pytest.raises(ValueError):
+        (integer(5) % 7) * (integer(5) % 11)
+    assert (integer(5) % 7) != integer(5)
+    assert (integer(5) % 7) == 5
+
+
+def testSerializationAsCharm():
+    for a in values(bits=1100) + [-v for v in values(bits=1100)]:
+        for g, c in [(integer(a), C(a)), (integer(abs(a)) % N,
+                                          C(abs(a)) % C(N))]:
+            assert backend.serialize(g) == charmInteger.serialize(c)
+            assert backend.deserialize(charmInteger.serialize(c)) == g
+            if a:
+                # charm loses the modulus of a serialized 0
+                assert str(charmInteger.deserialize(
+                    backend.serialize(g))) == str(c)
+
+
+def testBytesConversionAsCharm():
+    rnd = random.Random(7)
+    for _ in range(200):
+        data = bytes(rnd.getrandbits(8) for _ in range(32))
+        assert int(backend.Conversion.bytes2integer(data)) == \
+            int(charmConversion.bytes2integer(data))
+        n = int.from_bytes(data, 'big') or 1
+        assert backend.Conversion.IP2OS(integer(n)) == \
+            charmConversion.IP2OS(C(n))
+
+
+def testPrimes():
+    p = backend.randomPrime(128)
+    assert backend.isPrime(p)
+    assert len(bin(int(p))) - 2 == 128
+    assert not backend.isPrime(integer(int(p) * 3))
+
+
+def testOperationsCounted():
+    a = integer(3) % N
+    backend.InitBenchmark()
+    backend.StartBenchmark(['Exp', 'Mul', 'Div'])
+    (a ** 5) * a / a
+    a ** -1
+    backend.EndBenchmark()
+    assert backend.GetGeneralBenchmarks() == {'Exp': 2, 'Mul': 1, 'Div': 1}
@@ -0,0 +1,79 @@
+import pytest
+
+from anoncreds.bench.fixtures import setupGvt, gvtProofRequest
+from anoncreds.protocol.instrumentation import MetricsCollector, \
+    Instrumentation, setInstrumentation, getInstrumentation, span
+
+
+@pytest.fixture(scope="function")
+def collector():
+    collector = MetricsCollector()
+    setInstrumentation(collector)
+    yield collector
+    setInstrumentation(None)
+
+
+def testNoopByDefault():
+    assert type(getInstrumentation()) is Instrumentation
+    with span('prover.present_proof') as s:
+        assert s is None
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPhasesReported(collector):
+    _, prover, verifier, _ = await setupGvt()
+    proofRequest = gvtProofRequest(verifier)
+    assert await verifier.verify(proofRequest,
+                                 await prover.presentProof(proofRequest))
+
+    names = set(collector.histograms)
+    assert {'issuer.gen_keys', 'issuer.gen_keys.primary',
+            'issuer.issue_accumulator', 'issuer.issue_claim',
+            'issuer.sign.primary', 'issuer.sign.nonrevoc',
+            'issuer.witness_update', 'prover.process_claim',
+            'prover.present_proof', 'prover.init_proof.primary',
+            'prover.init_proof.nonrevoc', 'prover.hash',
+            'prover.finalize_proof.primary', 'verifier.verify',
+            'verifier.tau.primary', 'verifier.tau.nonrevoc',
+            'verifier.hash', 'repo.getPublicKey',
+            'repo.getAccumulator'} <= names
+
+    parents = {record.name: record.parent for record in collector.spans}
+    assert parents['prover.init_proof.nonrevoc'] == 'prover.present_proof'
+    assert parents['verifier.tau.primary'] == 'verifier.verify'
+    assert parents['verifier.verify'] is None
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def testOpenMetricsExport():
+    timer = FakeTimer()
+    collector = MetricsCollector(buckets=[0.1, 1.0], timer=timer)
+    with collector.span('verifier.verify'):
+        timer.now += 0.5
+    collector.observe('verifier.verify', 2.0)
+    collector.observe('repo.getSchema', 0.05)
+
+    assert collector.exportOpenMetrics() == \
+        '# TYPE anoncreds_phase_seconds histogram\n' \
+        '# UNIT anoncreds_phase_seconds seconds\n' \
+        '# HELP anoncreds_phase_seconds Duration of protocol phases.\n' \
+        'anoncreds_phase_seconds_bucket{phase="repo.getSchema",le="0.1"} 1\n' \
+        'anoncreds_phase_seconds_bucket{phase="repo.getSchema",le="1.0"} 1\n' \
+        'anoncreds_phase_seconds_bucket{phase="repo.getSchema",le="+Inf"} 1\n' \
+        'anoncreds_phase_seconds_count{phase="repo.getSchema"} 1\n' \
+        'anoncreds_phase_seconds_sum{phase="repo.getSchema"} 0.05\n' \
+        'anoncreds_phase_seconds_bucket{phase="verifier.verify",le="0.1"} 0\n' \
+        'anoncreds_phase_seconds_bucket{phase="verifier.verify",le="1.0"} 1\n' \
+        'anoncreds_phase_seconds_bucket{phase="verifier.verify",le="+Inf"} 2\n' \
+        'anoncreds_phase_seconds_count{phase="verifier.verify"} 2\n' \
+        'anoncreds_phase_seconds_sum{phase="verifier.verify"} 2.5\n' \
+        '# EOF\n'
+    assert collector.spans[0].duration == 0.5
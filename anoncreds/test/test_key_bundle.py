@@ -0,0 +1,88 @@
+import pytest
+
+from anoncreds.protocol.issuer import Issuer
+from anoncreds.protocol.key_bundle import exportKeyBundle, importKeyBundle, \
+    saveKeyBundle, loadKeyBundle, importKeys
+from anoncreds.protocol.prover import Prover
+from anoncreds.protocol.repo.attributes_repo import AttributeRepoInMemory
+from anoncreds.protocol.repo.public_repo import PublicRepoInMemory
+from anoncreds.protocol.types import ID, ProofRequest, AttributeInfo, \
+    PredicateGE
+from anoncreds.protocol.verifier import Verifier
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
+from anoncreds.protocol.wallet.prover_wallet import ProverWalletInMemory
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+from anoncreds.test.conftest import GVT
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+def testSaveLoadRoundtrip(keyBundleGvt, tmpdir):
+    path = str(tmpdir.join('gvt.keys'))
+    saveKeyBundle(keyBundleGvt, path)
+    assert loadKeyBundle(path) == keyBundleGvt
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+def testLoadRejectsOtherFiles(tmpdir):
+    path = tmpdir.join('other')
+    path.write_binary(b'not a bundle')
+    with pytest.raises(ValueError):
+        loadKeyBundle(str(path))
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testExportWithoutAccumulator(issuerGvt, schemaGvtId, keysGvt,
+                                       keyBundleGvt):
+    bundle = await exportKeyBundle(issuerGvt.wallet, schemaGvtId)
+    assert bundle.sk == keyBundleGvt.sk
+    assert bundle.accum is None and bundle.tails is None
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testImportKeysReturnsPublicKeys(keyBundleGvt):
+    wallet = IssuerWalletInMemory('issuer1', PublicRepoInMemory())
+    schema = await wallet.submitSchema(keyBundleGvt.schema)
+    schemaId = ID(schema.getKey(), schemaId=schema.seqId)
+
+    pk, pkR = await importKeys(wallet, schemaId, keyBundleGvt)
+    assert pk == await wallet.getPublicKey(schemaId)
+    assert pkR == await wallet.getPublicKeyRevocation(schemaId)
+    assert pk.N == keyBundleGvt.pk.N
+    assert pkR.h == keyBundleGvt.pkR.h
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testLoadedBundleIssuesVerifiableClaims(keyBundleGvt, tmpdir):
+    path = str(tmpdir.join('gvt.keys'))
+    saveKeyBundle(keyBundleGvt, path)
+
+    publicRepo = PublicRepoInMemory()
+    attrRepo = AttributeRepoInMemory()
+    issuer = Issuer(IssuerWalletInMemory('issuer1', publicRepo), attrRepo)
+    schema = await importKeyBundle(issuer.wallet, loadKeyBundle(path))
+    schemaId = ID(schema.getKey())
+    assert (await issuer.wallet.getAccumulator(schemaId)).currentI == 1
+
+    prover = Prover(ProverWalletInMemory('prover1', publicRepo))
+    attrRepo.addAttributes(schema.getKey(), prover.proverId,
+                           GVT.attribs(name='Alex', age=28, height=175,
+                                       sex='male'))
+    claimsReq = await prover.createClaimRequest(schemaId)
+    signature, claims = await issuer.issueClaim(schemaId, claimsReq)
+    await prover.processClaim(schemaId, claims, signature)
+
+    # the bundle's own accumulator is left untouched
+    assert keyBundleGvt.accum.currentI == 1
+    assert not keyBundleGvt.accum.V
+
+    verifier = Verifier(WalletInMemory('verifier1', publicRepo))
+    proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                verifiableAttributes={
+                                    'uuid': AttributeInfo(name='name')},
+                                predicates={
+                                    'predicate_uuid': PredicateGE('age', 18)})
+    proof = await prover.presentProof(proofRequest)
+    assert await verifier.verify(proofRequest, proof)
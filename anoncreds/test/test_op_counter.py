@@ -0,0 +1,104 @@
+import pytest
+
+from anoncreds.protocol.op_counter import countOps
+from anoncreds.protocol.primary.primary_proof_verifier import \
+    calcPrimaryTHat
+from anoncreds.protocol.types import ProofRequest, AttributeInfo, PredicateGE
+from anoncreds.protocol.utils import multiExp
+from anoncreds.test.conftest import primes
+from config.config import cmod
+
+# operations needed for a GVT proof with one revealed attribute and one
+# predicate, with revocation
+PRESENT_PROOF_BUDGET = {'modexp': 33, 'modmul': 48, 'pairing': 13,
+                        'G1.exp': 19, 'GT.exp': 13, 'hash': 1}
+VERIFY_BUDGET = {'modexp': 30, 'modmul': 42, 'pairing': 21,
+                 'G1.exp': 14, 'GT.exp': 17, 'hash': 1}
+
+
+def assertWithinBudget(ops, budget):
+    for op, limit in budget.items():
+        assert ops[op] <= limit, '{} {}s, {} expected at most'.format(
+            ops[op], op, limit)
+
+
+@pytest.fixture(scope="function")
+def proofRequest(verifier):
+    return ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                        verifiableAttributes={
+                            'uuid': AttributeInfo(name='name')},
+                        predicates={'predicate_uuid': PredicateGE('age', 18)})
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPresentProofAndVerifyWithinBudget(prover1, verifier,
+                                                proofRequest,
+                                                claimsProver1Gvt):
+    with countOps() as ops:
+        proof = await prover1.presentProof(proofRequest)
+    assertWithinBudget(ops, PRESENT_PROOF_BUDGET)
+
+    with countOps() as ops:
+        assert await verifier.verify(proofRequest, proof)
+    assertWithinBudget(ops, VERIFY_BUDGET)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPrimaryVerificationModExps(prover1, verifier, proofRequest,
+                                         claimsProver1Gvt, schemaGvtId):
+    proof = await prover1.presentProof(proofRequest)
+    proofInfo, = proof.proofs.values()
+    pk = await verifier.wallet.getPublicKey(schemaGvtId)
+    attrNames = (await verifier.wallet.getSchema(schemaGvtId)).attrNames
+
+    with countOps() as ops:
+        calcPrimaryTHat(pk, attrNames, proof.aggregatedProof.cHash,
+                        proofInfo.proof.primaryProof)
+
+    # one per attribute, Aprime, S, Z, Rms and Rctxt, one inversion, and
+    # per predicate 3 for each T[i], 3 for T[DELTA], 5 for Q
+    assert ops['modexp'] == len(attrNames) + 6 + 20
+
+
+def testMultiExpCountedAsModExps():
+    N = cmod.integer(primes['prime1'][0] * primes['prime1'][1])
+    bases = [cmod.integer(x) % N for x in [2, 3, 5]]
+    with countOps() as ops:
+        multiExp(bases, [2 ** 600 + 1, 7, 0], N)
+    assert ops == {'modexp': 3}
+
+
+def testCountingCantBeNested():
+    with countOps():
+        with pytest.raises(RuntimeError):
+            with countOps():
+                pass
+    # and is possible again afterwards
+    with countOps() as ops:
+        pass
+    assert not ops
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPredicatesOnOneAttributeShareModExps(prover1, verifier,
+                                                   claimsProver1Gvt):
+    async def presentProofOps(predicates):
+        proofRequest = ProofRequest(
+            "proof1", "1.0", verifier.generateNonce(),
+            predicates={'predicate_uuid{}'.format(n): p
+                        for n, p in enumerate(predicates)})
+        with countOps() as ops:
+            proof = await prover1.presentProof(proofRequest)
+        assert await verifier.verify(proofRequest, proof)
+        return ops['modexp']
+
+    separate = await presentProofOps([PredicateGE('age', 18),
+                                      PredicateGE('height', 170)])
+    shared = await presentProofOps([PredicateGE('age', 18),
+                                    PredicateGE('age', 21)])
+    # S^r[DELTA], S^rTilde[DELTA] and Z^mTilde once for both, and
+    # Z^delta replaced by Z^3
+    assert shared == separate - 3
@@ -0,0 +1,66 @@
+import pytest
+
+from anoncreds.protocol.globals import LARGE_E_START, ITERATIONS, DELTA
+from anoncreds.protocol.primary.primary_proof_common import calcTeq, calcTge
+from anoncreds.protocol.primary.primary_proof_verifier import \
+    calcPrimaryTHat
+from anoncreds.protocol.types import ProofRequest, AttributeInfo, \
+    PredicateGE
+from config.config import cmod
+
+
+def calcPrimaryTHatDirectly(pk, attrNames, cHash, primaryProof):
+    # the verification equations as written in the protocol
+    cH = cmod.integer(cHash)
+    proof = primaryProof.eqProof
+    unrevealedAttrNames = set(attrNames) - set(proof.revealedAttrs.keys())
+    T1 = calcTeq(pk, proof.Aprime, proof.e, proof.v, proof.m, proof.m1,
+                 proof.m2, unrevealedAttrNames)
+    Rar = 1 % pk.N
+    for attrName in proof.revealedAttrs.keys():
+        Rar *= pk.R[str(attrName)] ** proof.revealedAttrs[str(attrName)]
+    Rar *= proof.Aprime ** (2 ** LARGE_E_START)
+    THat = [T1 * ((pk.Z / Rar) ** (-1 * cH) % pk.N) % pk.N]
+
+    for proof in primaryProof.geProofs:
+        TauList = calcTge(pk, proof.u, proof.r, proof.mj, proof.alpha,
+                          proof.T)
+        for i in range(0, ITERATIONS):
+            TauList[i] = TauList[i] * \
+                         (proof.T[str(i)] ** (-1 * cH) % pk.N) % pk.N
+        TauList[ITERATIONS] = TauList[ITERATIONS] * (
+            (proof.T[DELTA] * (pk.Z ** proof.predicate.value)) **
+            (-1 * cH)) % pk.N
+        TauList[ITERATIONS + 1] = TauList[ITERATIONS + 1] * (
+            proof.T[DELTA] ** (-1 * cH)) % pk.N
+        THat += TauList
+    return THat
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testTHatMatchesVerificationEquations(prover1, verifier,
+                                               claimsProver1Gvt, schemaGvtId):
+    proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                verifiableAttributes={
+                                    'uuid': AttributeInfo(name='name')},
+                                predicates={
+                                    'predicate_uuid1': PredicateGE('age', 18),
+                                    'predicate_uuid2': PredicateGE('height',
+                                                                   170)})
+    proof = await prover1.presentProof(proofRequest)
+    proofInfo, = proof.proofs.values()
+    primaryProof = proofInfo.proof.primaryProof
+    pk = await verifier.wallet.getPublicKey(schemaGvtId)
+    attrNames = (await verifier.wallet.getSchema(schemaGvtId)).attrNames
+    cHash = proof.aggregatedProof.cHash
+
+    assert calcPrimaryTHat(pk, attrNames, cHash, primaryProof) == \
+           calcPrimaryTHatDirectly(pk, attrNames, cHash, primaryProof)
+
+    # an overstated predicate makes the merged exponent of Z negative
+    geProofs = [geProof._replace(predicate=PredicateGE(
+        geProof.predicate.attrName, 1000)) for geProof in primaryProof.geProofs]
+    primaryProof = primaryProof._replace(geProofs=geProofs)
+    assert calcPrimaryTHat(pk, attrNames, cHash, primaryProof) == \
+           calcPrimaryTHatDirectly(pk, attrNames, cHash, primaryProof)
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+
+import pytest
+
+from anoncreds.protocol.proof_precomputation import ProofPrecomputationPool, \
+    PredicatePrecomputationCache
+from anoncreds.protocol.prover import Prover
+from anoncreds.protocol.types import ProofRequest, AttributeInfo, PredicateGE, \
+    ID
+from anoncreds.test.conftest import presentProofAndVerify
+
+
+@pytest.fixture(scope="function")
+def proofRequest(verifier):
+    return ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                        verifiableAttributes={
+                            'uuid1': AttributeInfo(name='name'),
+                            'uuid2': AttributeInfo(name='status')},
+                        predicates={'predicate_uuid': PredicateGE('age', 18)})
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testProofWithPrecomputedCommitments(prover1, allClaims, verifier,
+                                              schemaGvtId, schemaXyzId,
+                                              proofRequest):
+    pool = ProofPrecomputationPool(prover1.wallet, size=2)
+    await pool.fill()
+    gvtSeqId = (await prover1.wallet.getSchema(schemaGvtId)).seqId
+    xyzSeqId = (await prover1.wallet.getSchema(schemaXyzId)).seqId
+    assert pool.available(gvtSeqId) == 2
+    assert pool.available(xyzSeqId) == 2
+
+    prover = Prover(prover1.wallet, precomputation=pool)
+    assert await presentProofAndVerify(verifier, proofRequest, prover)
+    assert pool.hits == 2
+    assert pool.available(gvtSeqId) == 1
+
+    # every entry is used once only
+    proofRequest.nonce = verifier.generateNonce()
+    assert await presentProofAndVerify(verifier, proofRequest, prover)
+    proofRequest.nonce = verifier.generateNonce()
+    assert await presentProofAndVerify(verifier, proofRequest, prover)
+    assert pool.hits == 4
+    assert pool.misses == 2
+    assert pool.available(gvtSeqId) == 0
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testStaleEntriesDropped(prover1, claimsProver1Gvt, schemaGvtId):
+    pool = ProofPrecomputationPool(prover1.wallet)
+    await pool.fill()
+    seqId = (await prover1.wallet.getSchema(schemaGvtId)).seqId
+    claims = await prover1.wallet.getClaimSignature(ID(schemaId=seqId))
+
+    # a reissued claim has another A
+    newClaims = claims._replace(
+        primaryClaim=claims.primaryClaim._replace(A=claims.primaryClaim.A ** 2))
+    assert pool.take(seqId, newClaims) == (None, None)
+    assert pool.available(seqId) == 0
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testBackgroundRefillSurvivesFailedFill(prover1, claimsProver1Gvt,
+                                                 schemaGvtId, caplog):
+    pool = ProofPrecomputationPool(prover1.wallet)
+    seqId = (await prover1.wallet.getSchema(schemaGvtId)).seqId
+    claims = await prover1.wallet.getClaimSignature(ID(schemaId=seqId))
+    fill = pool.fill
+    fills = []
+
+    async def failingOnce():
+        fills.append(None)
+        if len(fills) == 1:
+            raise ValueError('repo unavailable')
+        await fill()
+
+    pool.fill = failingOnce
+    with caplog.at_level(logging.ERROR):
+        pool.start()
+        try:
+            while not fills:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
+            assert 'repo unavailable' in caplog.text
+            assert pool.available(seqId) == 0
+
+            # taking an entry asks for another fill
+            assert pool.take(seqId, claims) == (None, None)
+            while not pool.available(seqId):
+                await asyncio.sleep(0.01)
+            assert pool.take(seqId, claims) != (None, None)
+        finally:
+            await pool.stop()
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testBackgroundRefill(prover1, claimsProver1Gvt, schemaGvtId):
+    pool = ProofPrecomputationPool(prover1.wallet)
+    seqId = (await prover1.wallet.getSchema(schemaGvtId)).seqId
+    claims = await prover1.wallet.getClaimSignature(ID(schemaId=seqId))
+    pool.start()
+    try:
+        while not pool.available(seqId):
+            await asyncio.sleep(0.01)
+        assert pool.take(seqId, claims) != (None, None)
+        assert pool.available(seqId) == 0
+        # refilled after the entry is used
+        while not pool.available(seqId):
+            await asyncio.sleep(0.01)
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testProofWithPrecomputedPredicates(prover1, allClaims, verifier,
+                                             schemaGvtId):
+    cache = PredicatePrecomputationCache(prover1.wallet, size=2)
+    await cache.fill()
+    seqId = (await prover1.wallet.getSchema(schemaGvtId)).seqId
+    assert cache.available(seqId) == 2
+
+    prover = Prover(prover1.wallet, predicatePrecomputation=cache)
+    proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                verifiableAttributes={
+                                    'uuid1': AttributeInfo(name='name')},
+                                predicates={
+                                    'predicate_uuid1': PredicateGE('age', 18),
+                                    'predicate_uuid2': PredicateGE('height',
+                                                                   170),
+                                    'predicate_uuid3': PredicateGE('period',
+                                                                   5)})
+    assert await presentProofAndVerify(verifier, proofRequest, prover)
+    # two GVT predicates and one XYZ predicate
+    assert cache.available(seqId) == 0
+    assert cache.hits == 3
+    assert cache.misses == 0
+
+    # not enough entries left: the rest is computed on the spot
+    proofRequest.nonce = verifier.generateNonce()
+    assert await presentProofAndVerify(verifier, proofRequest, prover)
+    assert cache.hits == 4
+    assert cache.misses == 2
@@ -0,0 +1,104 @@
+import pytest
+
+from anoncreds.protocol.exception import MalformedProofError
+from anoncreds.protocol.proof_validation import E_BITS, prevalidateProof
+from anoncreds.protocol.types import ProofRequest, AttributeInfo, PredicateGE
+from config.config import cmod
+
+
+@pytest.fixture(scope="function")
+def proofRequest(verifier):
+    return ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                        verifiableAttributes={
+                            'uuid': AttributeInfo(name='name')},
+                        predicates={'predicate_uuid': PredicateGE('age', 18)})
+
+
+@pytest.fixture(scope="function")
+def proof(proofRequest, prover1, claimsProver1Gvt, event_loop):
+    return event_loop.run_until_complete(prover1.presentProof(proofRequest))
+
+
+def replacePrimary(proof, eqProof=None, geProof=None):
+    (key, proofInfo), = proof.proofs.items()
+    primaryProof = proofInfo.proof.primaryProof
+    primaryProof = primaryProof._replace(
+        eqProof=eqProof or primaryProof.eqProof,
+        geProofs=[geProof] if geProof else primaryProof.geProofs)
+    proofInfo = proofInfo._replace(
+        proof=proofInfo.proof._replace(primaryProof=primaryProof))
+    return proof._replace(proofs={key: proofInfo})
+
+
+def primaryOf(proof):
+    proofInfo, = proof.proofs.values()
+    return proofInfo.proof.primaryProof
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testHonestProofPasses(verifier, proofRequest, proof):
+    await prevalidateProof(verifier.wallet, proofRequest, proof,
+                           checkSubgroups=True)
+    assert await verifier.verify(proofRequest, proof)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testOversizedResponseRejected(verifier, proofRequest, proof):
+    eqProof = primaryOf(proof).eqProof
+    proof = replacePrimary(proof, eqProof=eqProof._replace(
+        e=eqProof.e + cmod.integer(2) ** E_BITS))
+    with pytest.raises(MalformedProofError):
+        await verifier.verify(proofRequest, proof)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPredicateForAnotherValueRejected(verifier, proofRequest, proof):
+    geProof = primaryOf(proof).geProofs[0]
+    proof = replacePrimary(proof, geProof=geProof._replace(
+        mj=geProof.mj + 1))
+    with pytest.raises(MalformedProofError):
+        await verifier.verify(proofRequest, proof)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testWeakerPredicateRejected(verifier, proofRequest, proof):
+    geProof = primaryOf(proof).geProofs[0]
+    proof = replacePrimary(proof, geProof=geProof._replace(
+        predicate=PredicateGE('age', 17)))
+    with pytest.raises(MalformedProofError):
+        await verifier.verify(proofRequest, proof)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testRevealedValueMismatchRejected(verifier, proofRequest, proof):
+    revealed = dict(proof.requestedProof.revealed_attrs)
+    seqNo, raw, encoded = revealed['uuid']
+    revealed['uuid'] = [seqNo, 'Bob', str(int(encoded) + 1)]
+    proof = proof._replace(requestedProof=proof.requestedProof._replace(
+        revealed_attrs=revealed))
+    with pytest.raises(MalformedProofError):
+        await verifier.verify(proofRequest, proof)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testUnreducedValueRejected(verifier, proofRequest, proof):
+    eqProof = primaryOf(proof).eqProof
+    proof = replacePrimary(proof, eqProof=eqProof._replace(
+        Aprime=cmod.integer(int(eqProof.Aprime))))
+    with pytest.raises(MalformedProofError):
+        await verifier.verify(proofRequest, proof)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testShortCListRejected(verifier, proofRequest, proof):
+    proof = proof._replace(aggregatedProof=proof.aggregatedProof._replace(
+        CList=proof.aggregatedProof.CList[:-1]))
+    with pytest.raises(MalformedProofError):
+        await verifier.verify(proofRequest, proof)
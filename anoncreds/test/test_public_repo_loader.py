@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from anoncreds.protocol.repo.public_repo_loader import PublicRepoLoader, \
+    BatchLoader
+from anoncreds.protocol.types import ProofRequest, AttributeInfo, ID
+from anoncreds.protocol.verifier import Verifier
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+from anoncreds.test.conftest import presentProofAndVerify
+
+
+class BulkCountingRepo:
+    def __init__(self, repo):
+        self._repo = repo
+        self.bulkCalls = []
+        self.singleCalls = 0
+
+    def __getattr__(self, item):
+        return getattr(self._repo, item)
+
+    async def getPublicKeys(self, schemaIds, signatureType='CL'):
+        self.bulkCalls.append(list(schemaIds))
+        return await self._repo.getPublicKeys(schemaIds, signatureType)
+
+    async def getPublicKey(self, schemaId, signatureType='CL'):
+        self.singleCalls += 1
+        return await self._repo.getPublicKey(schemaId, signatureType)
+
+
+@pytest.mark.asyncio
+async def testBatchLoaderCoalescesAndDedupes():
+    calls = []
+
+    async def bulk(keys):
+        calls.append(keys)
+        return [key * 2 for key in keys]
+
+    async def single(key):
+        raise AssertionError('single lookup should not be used')
+
+    loader = BatchLoader(bulk, single)
+    values = await asyncio.gather(*[loader.load(k) for k in (1, 2, 1, 3)])
+
+    assert values == [2, 4, 2, 6]
+    assert calls == [[1, 2, 3]]
+    assert loader.batches == 1
+
+
+@pytest.mark.asyncio
+async def testBatchLoaderIsolatesFailures():
+    async def bulk(keys):
+        raise ValueError('bulk failed')
+
+    async def single(key):
+        if key == 'bad':
+            raise ValueError('no value for key')
+        return key
+
+    loader = BatchLoader(bulk, single)
+    results = await asyncio.gather(loader.load('good'), loader.load('bad'),
+                                   return_exceptions=True)
+
+    assert results[0] == 'good'
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def testBatchLoaderRetriesShortBulkResults():
+    async def bulk(keys):
+        return [key * 2 for key in keys[1:]]
+
+    async def single(key):
+        return key * 3
+
+    loader = BatchLoader(bulk, single)
+    values = await asyncio.wait_for(
+        asyncio.gather(*[loader.load(k) for k in (1, 2, 3)]), 1)
+
+    assert values == [3, 6, 9]
+
+
+@pytest.mark.asyncio
+async def testBatchLoaderFailsLookupsWhenInterrupted():
+    async def bulk(keys):
+        raise asyncio.CancelledError()
+
+    async def single(key):
+        raise AssertionError('single lookup should not be used')
+
+    loader = BatchLoader(bulk, single)
+    results = await asyncio.wait_for(
+        asyncio.gather(loader.load(1), loader.load(2),
+                       return_exceptions=True), 1)
+
+    assert all(isinstance(res, RuntimeError) for res in results)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testConcurrentPublicKeyLookupsUseOneBulkCall(publicRepo, keysGvt,
+                                                       keysXyz, schemaGvtId,
+                                                       schemaXyzId):
+    repo = BulkCountingRepo(publicRepo)
+    loader = PublicRepoLoader(repo)
+
+    pkGvt, pkXyz, _ = await asyncio.gather(loader.getPublicKey(schemaGvtId),
+                                           loader.getPublicKey(schemaXyzId),
+                                           loader.getPublicKey(schemaGvtId))
+
+    assert repo.bulkCalls == [[schemaGvtId, schemaXyzId]]
+    assert repo.singleCalls == 0
+    assert pkGvt == await publicRepo.getPublicKey(schemaGvtId)
+    assert pkXyz == await publicRepo.getPublicKey(schemaXyzId)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testProofVerifiedThroughLoader(prover1, publicRepo, claimsProver1):
+    verifier = Verifier(WalletInMemory('verifier1',
+                                       PublicRepoLoader(publicRepo)))
+    proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                verifiableAttributes={
+                                    'uuid1': AttributeInfo(name='name'),
+                                    'uuid2': AttributeInfo(name='status')},
+                                predicates={})
+
+    assert await presentProofAndVerify(verifier, proofRequest, prover1)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testMissingSchemaFailsOnlyItsOwnLookup(publicRepo, schemaGvtId):
+    loader = PublicRepoLoader(publicRepo)
+    results = await asyncio.gather(loader.getSchema(schemaGvtId),
+                                   loader.getSchema(ID(schemaId=12345)),
+                                   return_exceptions=True)
+
+    assert results[0].getKey() == schemaGvtId.schemaKey
+    assert isinstance(results[1], Exception)
@@ -0,0 +1,61 @@
+import pytest
+
+from anoncreds.protocol.key_bundle import importKeyBundle
+from anoncreds.protocol.repo.public_repo import PublicRepoSqlite
+from anoncreds.protocol.types import ID
+from anoncreds.protocol.wallet.issuer_wallet import IssuerWalletInMemory
+from anoncreds.protocol.wallet.wallet import WalletInMemory
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testValuesSurviveReopening(keyBundleGvt, tmpdir):
+    path = str(tmpdir.join('public.db'))
+    repo = PublicRepoSqlite(path)
+    schema = await importKeyBundle(IssuerWalletInMemory('issuer', repo),
+                                   keyBundleGvt)
+    repo.close()
+
+    repo = PublicRepoSqlite(path)
+    byKey = ID(schema.getKey())
+    bySeqId = ID(schemaId=schema.seqId)
+    assert await repo.getSchema(byKey) == schema
+    assert await repo.getSchema(bySeqId) == schema
+    pk = await repo.getPublicKey(bySeqId)
+    assert pk == keyBundleGvt.pk._replace(seqId=1)
+    assert await repo.getPublicKeyRevocation(byKey) == \
+        keyBundleGvt.pkR._replace(seqId=1)
+    assert await repo.getAccumulator(byKey) == keyBundleGvt.accum
+    assert await repo.getTails(byKey) == keyBundleGvt.tails
+    with pytest.raises(KeyError):
+        await repo.getSchema(ID(schemaId=schema.seqId + 1))
+    repo.close()
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testWalletFetchesFromSqliteRepo(keyBundleGvt):
+    repo = PublicRepoSqlite()
+    schema = await importKeyBundle(IssuerWalletInMemory('issuer', repo),
+                                   keyBundleGvt)
+    wallet = WalletInMemory('verifier1', repo)
+    schemaId = ID(schemaId=schema.seqId)
+    assert (await wallet.getPublicKey(schemaId)).N == keyBundleGvt.pk.N
+    assert (await wallet.getPublicKeyAccumulator(schemaId)).z == \
+        keyBundleGvt.accumPk.z
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testResubmittedSchemaKeepsValues(keyBundleGvt):
+    repo = PublicRepoSqlite()
+    schema = await importKeyBundle(IssuerWalletInMemory('issuer', repo),
+                                   keyBundleGvt)
+
+    resubmitted = await repo.submitSchema(schema._replace(seqId=None))
+    assert resubmitted == schema
+    schemaId = ID(schemaId=schema.seqId)
+    assert await repo.getSchema(schemaId) == schema
+    assert (await repo.getPublicKey(schemaId)).N == keyBundleGvt.pk.N
+    assert await repo.getAccumulator(ID(schema.getKey())) == \
+        keyBundleGvt.accum
@@ -1,6 +1,9 @@
+import random
+
 import pytest
 
 from anoncreds.protocol.primary.primary_proof_builder import fourSquares
+from anoncreds.protocol.utils import _twoSquares
 
 
 def testQuadEquationLagranges():
@@ -16,3 +19,35 @@ def testQuadEquationLagrangesNegativeInt():
     delta = -5
     with pytest.raises(ValueError):
         u = fourSquares(delta)
+
+
+def assertFourSquares(delta):
+    u = fourSquares(delta)
+    assert sorted(u) == ['0', '1', '2', '3']
+    assert sum(x ** 2 for x in u.values()) == delta
+
+
+def testQuadEquationLagrangesWhereGreedyFails():
+    # greedily 23 - 16 - 4 - 1 - 1 leaves 1, but 23 = 9 + 9 + 4 + 1
+    for delta in [0, 1, 23, 4 ** 40 * 7, 2 ** 600]:
+        assertFourSquares(delta)
+
+
+def testQuadEquationLagrangesSmallDeltas():
+    for delta in range(5000):
+        assertFourSquares(delta)
+
+
+def testQuadEquationLagrangesLargeDeltas():
+    rnd = random.Random(48)
+    for bits in [17, 64, 256, 257, 1024]:
+        for _ in range(10):
+            assertFourSquares(rnd.getrandbits(bits))
+
+
+def testTwoSquaresOfCompositesValidOrNone():
+    # isPrime may pass a composite, for which no pair must be made up
+    for p in [21, 45, 65, 3 * 7 * 11 * 19 * 5, 5 * 13 * 17 * 29]:
+        for _ in range(50):
+            z, w = _twoSquares(p)
+            assert z is None or z * z + w * w == p
@@ -1,5 +1,6 @@
 import pytest
 
+from anoncreds.protocol.globals import DELTA
 from anoncreds.protocol.types import ProofRequest, PredicateGE, Claims, \
     ProofClaims, AttributeInfo
 from anoncreds.test.conftest import presentProofAndVerify
@@ -129,6 +130,32 @@ async def testMultipleGePredicateNegative(prover1, verifier, claimsProver1Gvt):
         await presentProofAndVerify(verifier, proofRequest, prover1)
 
 
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testMultipleGePredicatesOnOneAttribute(prover1, verifier,
+                                                 claimsProver1Gvt):
+    proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                verifiableAttributes={'attr_uuid': AttributeInfo(name='name')},
+                                predicates={'predicate_uuid1': PredicateGE('age', 18),
+                                            'predicate_uuid2': PredicateGE('age', 28),
+                                            'predicate_uuid3': PredicateGE('height', 170),
+                                            'predicate_uuid4': PredicateGE('age', 21)})
+    proof = await prover1.presentProof(proofRequest)
+    assert await verifier.verify(proofRequest, proof)
+
+    proofInfo, = proof.proofs.values()
+    geProofs = {p.predicate.value: p for p in
+                proofInfo.proof.primaryProof.geProofs}
+    # the age predicates share the randomness of T[DELTA]
+    assert geProofs[18].r[DELTA] == geProofs[21].r[DELTA] == \
+        geProofs[28].r[DELTA]
+    assert geProofs[18].r[DELTA] != geProofs[170].r[DELTA]
+
+    proofRequest.predicates['predicate_uuid5'] = PredicateGE('age', 29)
+    with pytest.raises(ValueError):
+        await presentProofAndVerify(verifier, proofRequest, prover1)
+
+
 @pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
 @pytest.mark.asyncio
 async def testNonceShouldBeSame(prover1, verifier, claimsProver1Gvt, nonce,
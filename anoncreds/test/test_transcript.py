@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from anoncreds.protocol.op_counter import countOps
+from anoncreds.protocol.primary.primary_proof_verifier import \
+    calcPrimaryTHat
+from anoncreds.protocol.revocation.accumulators.non_revocation_proof_verifier import \
+    calcNonRevocTHat
+from anoncreds.protocol.transcript import Transcript
+from anoncreds.protocol.types import ProofRequest, AttributeInfo, PredicateGE
+from anoncreds.protocol.utils import get_hash_as_int, pairingGroup
+from anoncreds.protocol.verifier import isCHashValid
+from anoncreds.test.conftest import primes
+from config.config import cmod
+
+
+def testChallengeAsGetHashAsInt():
+    group = pairingGroup()
+    P_PRIME1, Q_PRIME1 = primes.get("prime1")
+    N = P_PRIME1 * Q_PRIME1
+    values = [cmod.integer(P_PRIME1) % N, Q_PRIME1, 1, 256,
+              group.random(cmod.G1),
+              cmod.pair(group.random(cmod.G1), group.random(cmod.G1)),
+              cmod.integer(2 ** 1000 - 1)]
+
+    shuffled = list(values)
+    random.Random(50).shuffle(shuffled)
+    transcript = Transcript(shuffled[0])
+    for value in shuffled[1:4]:
+        transcript.absorb(value)
+    transcript.absorbAll(shuffled[4:])
+
+    assert len(transcript) == len(values)
+    expected = get_hash_as_int(*values)
+    with countOps() as ops:
+        assert transcript.challenge() == expected
+    assert ops['hash'] == 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testCHashValidWhateverTheOrder(prover1, verifier, claimsProver1Gvt,
+                                         schemaGvtId):
+    proofRequest = ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                                verifiableAttributes={
+                                    'uuid': AttributeInfo(name='name')},
+                                predicates={
+                                    'predicate_uuid': PredicateGE('age', 18)})
+    proof = await prover1.presentProof(proofRequest)
+    proofInfo, = proof.proofs.values()
+    cHash = proof.aggregatedProof.cHash
+    wallet = verifier.wallet
+    THat = calcNonRevocTHat(
+        await wallet.getPublicKeyRevocation(schemaGvtId),
+        await wallet.getAccumulator(schemaGvtId),
+        await wallet.getPublicKeyAccumulator(schemaGvtId), cHash,
+        proofInfo.proof.nonRevocProof)
+    THat += calcPrimaryTHat(await wallet.getPublicKey(schemaGvtId),
+                            (await wallet.getSchema(schemaGvtId)).attrNames,
+                            cHash, proofInfo.proof.primaryProof)
+
+    transcript = Transcript(*reversed(THat))
+    transcript.absorb(proofRequest.nonce)
+    assert isCHashValid(proof, transcript)
+
+    transcript = Transcript(proofRequest.nonce, *THat[1:])
+    assert not isCHashValid(proof, transcript)
@@ -1,10 +1,11 @@
+import random
 from collections import OrderedDict
 
 import pytest
 
-from anoncreds.protocol.globals import PAIRING_GROUP
 from anoncreds.protocol.utils import toDictWithStrValues, \
-    deserializeFromStr, serializeToStr, fromDictWithStrValues, get_hash_as_int, intToArrayBytes, bytesToInt
+    deserializeFromStr, serializeToStr, fromDictWithStrValues, get_hash_as_int, intToArrayBytes, bytesToInt, \
+    batchInverse, pairingGroup, multiExp
 from anoncreds.test.conftest import primes
 from config.config import cmod
 
@@ -31,26 +32,26 @@ def testCryptoIntModSerializeToFromStr():
 
 @pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
 def testGroupElementSerializeToFromStr():
-    value = cmod.PairingGroup(PAIRING_GROUP).random(cmod.G1)
+    value = pairingGroup().random(cmod.G1)
     assert value == deserializeFromStr(serializeToStr(value))
 
 
 @pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
 def testGroupElementZRIdentitySerializeToFromStr():
-    elem = cmod.PairingGroup(PAIRING_GROUP).init(cmod.ZR, 555)
+    elem = pairingGroup().init(cmod.ZR, 555)
     identity = elem / elem
     assert identity == deserializeFromStr(serializeToStr(identity))
 
 
 def testGroupElementG1IdentitySerializeToFromStr():
-    elem = cmod.PairingGroup(PAIRING_GROUP).random(cmod.G1)
-    identity = cmod.PairingGroup(PAIRING_GROUP).init(cmod.G1, elem / elem)
+    elem = pairingGroup().random(cmod.G1)
+    identity = pairingGroup().init(cmod.G1, elem / elem)
     assert identity == deserializeFromStr(serializeToStr(identity))
 
 
 @pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
 def testToFromDictWithStrValues():
-    group = cmod.PairingGroup(PAIRING_GROUP)
+    group = pairingGroup()
     dictionary = OrderedDict((
         ('43', '43'),
         ('3', 3),
@@ -70,7 +71,7 @@ def testToFromDictWithStrValuesInteKeys():
 
 @pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
 def testToFromDictWithStrValuesLists():
-    group = cmod.PairingGroup(PAIRING_GROUP)
+    group = pairingGroup()
     dictionary = OrderedDict((
         ('47', []),
         ('7',
@@ -92,7 +93,7 @@ def testToFromDictWithStrValuesSets():
 
 
 def testToFromDictWithStrValuesSubDicts():
-    group = cmod.PairingGroup(PAIRING_GROUP)
+    group = pairingGroup()
     dictionary = OrderedDict((
         ('4', {'aaa', 'bbb'}),
         ('2', OrderedDict((
@@ -110,7 +111,7 @@ def testToFromDictWithStrValuesSubDicts():
 
 @pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
 def testToFromDictWithStrValuesMixed():
-    group = cmod.PairingGroup(PAIRING_GROUP)
+    group = pairingGroup()
     dictionary = OrderedDict((
         ('4', {'aaa', 'bbb'}),
         ('2', OrderedDict((
@@ -176,7 +177,7 @@ def testGetHashInteger():
 
 
 def testGetHashGroup():
-    group = cmod.PairingGroup(PAIRING_GROUP)
+    group = pairingGroup()
     input = [group.random(cmod.G1),
              group.random(cmod.G1),
              group.random(cmod.G1)]
@@ -185,7 +186,7 @@ def testGetHashGroup():
 
 
 def testGetHashMixed():
-    group = cmod.PairingGroup(PAIRING_GROUP)
+    group = pairingGroup()
     P_PRIME1, Q_PRIME1 = primes.get("prime1")
     input = [P_PRIME1, Q_PRIME1,
              group.random(cmod.G1), group.random(cmod.G1),
@@ -213,4 +214,29 @@ def testBytesToInt():
 
 def testIntToArrayBytesAndBack():
     val = cmod.integer(1606507817390189252221968804450207070282033)
-    assert val == bytesToInt(intToArrayBytes(val))
\ No newline at end of file
+    assert val == bytesToInt(intToArrayBytes(val))
+
+
+def testBatchInverse():
+    N = cmod.integer(primes['prime1'][0] * primes['prime1'][1])
+    values = [cmod.integer(x) % N for x in [2, 3, 12345, 2 ** 300 + 1]]
+    inverses = batchInverse(values, N)
+    assert inverses == [x ** -1 for x in values]
+    assert batchInverse([], N) == []
+
+
+def testMultiExpAsPowers():
+    N = cmod.integer(primes['prime1'][0] * primes['prime1'][1])
+    rnd = random.Random(11)
+    for count in range(0, 6):
+        bases = [cmod.integer(rnd.getrandbits(1000)) % N
+                 for _ in range(count)]
+        exps = [rnd.getrandbits(rnd.choice([0, 3, 600, 900]))
+                for _ in range(count)]
+        if count == 3:
+            exps[0] = -exps[0] or -1
+        expected = 1 % N
+        for base, exp in zip(bases, exps):
+            expected = expected * base ** exp % N
+        assert multiExp(bases, [cmod.integer(e) for e in exps], N) == \
+            expected
@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+
+from anoncreds.protocol.exception import NonceReplayError
+from anoncreds.protocol.types import ProofRequest, AttributeInfo, PredicateGE
+from anoncreds.protocol.verification_cache import ProofResultCache, \
+    NonceReplayFilter
+from anoncreds.protocol.verifier import Verifier
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def cachingVerifier(verifier):
+    # behind a gateway that retries requests
+    return Verifier(verifier.wallet, resultCache=ProofResultCache(),
+                    nonceFilter=NonceReplayFilter(acceptRetries=True))
+
+
+@pytest.fixture(scope="function")
+def proofRequest(verifier):
+    return ProofRequest("proof1", "1.0", verifier.generateNonce(),
+                        verifiableAttributes={
+                            'uuid': AttributeInfo(name='name')},
+                        predicates={'predicate_uuid': PredicateGE('age', 18)})
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testRepeatedProofServedFromCache(cachingVerifier, proofRequest,
+                                           prover1, claimsProver1Gvt):
+    proof = await prover1.presentProof(proofRequest)
+
+    assert await cachingVerifier.verify(proofRequest, proof)
+    assert await cachingVerifier.verify(proofRequest, proof)
+    assert cachingVerifier._resultCache.stats.hits == 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testConcurrentDuplicatesVerifiedOnce(cachingVerifier, proofRequest,
+                                               prover1, claimsProver1Gvt):
+    proof = await prover1.presentProof(proofRequest)
+
+    assert await asyncio.gather(
+        *[cachingVerifier.verify(proofRequest, proof) for _ in range(3)]) \
+           == [True, True, True]
+    assert len(cachingVerifier._resultCache._cache) == 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testReusedNonceRejected(cachingVerifier, proofRequest, prover1,
+                                  claimsProver1Gvt):
+    proof1 = await prover1.presentProof(proofRequest)
+    proof2 = await prover1.presentProof(proofRequest)
+
+    assert await cachingVerifier.verify(proofRequest, proof1)
+    with pytest.raises(NonceReplayError):
+        await cachingVerifier.verify(proofRequest, proof2)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testReplayRejectedBeforeCache(verifier, proofRequest, prover1,
+                                        claimsProver1Gvt):
+    strictVerifier = Verifier(verifier.wallet, resultCache=ProofResultCache(),
+                              nonceFilter=NonceReplayFilter())
+    proof = await prover1.presentProof(proofRequest)
+
+    assert await strictVerifier.verify(proofRequest, proof)
+    with pytest.raises(NonceReplayError):
+        await strictVerifier.verify(proofRequest, proof)
+    assert strictVerifier._resultCache.stats.hits == 0
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testAccumulatorRefreshedOnce(cachingVerifier, proofRequest,
+                                       prover1, claimsProver1Gvt):
+    proof = await prover1.presentProof(proofRequest)
+    nonRevocVerifier = cachingVerifier._nonRevocVerifier
+    refreshAccumulator = nonRevocVerifier.refreshAccumulator
+    refreshes = []
+
+    async def countingRefresh(*args):
+        refreshes.append(args)
+        return await refreshAccumulator(*args)
+
+    nonRevocVerifier.refreshAccumulator = countingRefresh
+    assert await cachingVerifier.verify(proofRequest, proof)
+    assert len(refreshes) == 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testRevocationInvalidatesCachedVerdict(verifier, proofRequest,
+                                                 prover1, claimsProver1Gvt,
+                                                 issuerGvt, schemaGvtId):
+    # without a nonce filter, which would reject the proof sent again
+    cachingVerifier = Verifier(verifier.wallet,
+                               resultCache=ProofResultCache())
+    proof = await prover1.presentProof(proofRequest)
+    assert await cachingVerifier.verify(proofRequest, proof)
+
+    await issuerGvt.revoke(schemaGvtId, 1)
+    assert not await cachingVerifier.verify(proofRequest, proof)
+    assert cachingVerifier._resultCache.stats.hits == 0
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testKeyCoversWholeProof(proofRequest, prover1, claimsProver1Gvt):
+    proof = await prover1.presentProof(proofRequest)
+    revealed = dict(proof.requestedProof.revealed_attrs)
+    revealed['uuid'] = revealed['uuid'][:1] + ['Bob', '123']
+    forged = proof._replace(requestedProof=proof.requestedProof._replace(
+        revealed_attrs=revealed))
+
+    assert ProofResultCache.key(proofRequest, proof, {}) != \
+           ProofResultCache.key(proofRequest, forged, {})
+
+
+def testNonceFilterForgetsOldNonces():
+    timer = FakeTimer()
+    nonceFilter = NonceReplayFilter(window=10, buckets=5, timer=timer)
+    assert nonceFilter.add(1)
+    assert not nonceFilter.add(1)
+
+    timer.now = 9
+    assert not nonceFilter.add(1)
+    assert nonceFilter.add(2)
+
+    timer.now = 12.5
+    assert 1 not in nonceFilter
+    assert 2 in nonceFilter
+    assert nonceFilter.add(1)
+    assert nonceFilter.rejected == 2
+
+
+def testNonceFilterAcceptsExactRetries():
+    timer = FakeTimer()
+    nonceFilter = NonceReplayFilter(window=10, buckets=5, timer=timer,
+                                    acceptRetries=True)
+    assert nonceFilter.add(1, 'proof1')
+    assert nonceFilter.add(1, 'proof1')
+    assert not nonceFilter.add(1, 'proof2')
+    assert not nonceFilter.add(1)
+    assert len(nonceFilter) == 1
+
+    timer.now = 12.5
+    assert nonceFilter.add(1, 'proof2')
+
+    strictFilter = NonceReplayFilter()
+    assert strictFilter.add(1, 'proof1')
+    assert not strictFilter.add(1, 'proof1')
+
+
+def testNonceFilterBounded():
+    timer = FakeTimer()
+    nonceFilter = NonceReplayFilter(window=10, buckets=5, maxNonces=4,
+                                    timer=timer)
+    for i in range(6):
+        timer.now = i
+        assert nonceFilter.add(i)
+    assert len(nonceFilter) <= 4
+    assert 5 in nonceFilter
+    assert 0 not in nonceFilter
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import signal
+
+import pytest
+
+from anoncreds.bench.fixtures import setupGvt, gvtProofRequest
+from anoncreds.protocol.exception import PoolBusyError
+from anoncreds.protocol.verifier_pool import VerifierPool
+
+
+@pytest.fixture(scope="function")
+def gvtSetup(event_loop):
+    return event_loop.run_until_complete(setupGvt())
+
+
+@pytest.fixture(scope="function")
+def pool(gvtSetup):
+    _, _, verifier, _ = gvtSetup
+    pool = VerifierPool(verifier.wallet, workers=2, maxPending=1)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPoolVerifiesProof(gvtSetup, pool):
+    _, prover, verifier, _ = gvtSetup
+    proofRequest = gvtProofRequest(verifier)
+    proof = await prover.presentProof(proofRequest)
+
+    assert await pool.verify(proofRequest, proof)
+    assert await pool.verify(proofRequest, proof)
+
+    # same schema, same worker: keys are sent once
+    metrics = pool.metrics[pool.workerFor(proof)]
+    assert metrics.requests == 2
+    assert metrics.keyShipments == 1
+    assert metrics.pending == 0
+    assert sum(m.requests for m in pool.metrics) == 2
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testBusySchemaSpillsToOtherWorker(gvtSetup, pool):
+    _, prover, verifier, _ = gvtSetup
+    proofRequest = gvtProofRequest(verifier)
+    proof = await prover.presentProof(proofRequest)
+
+    assert await asyncio.gather(
+        *[pool.verify(proofRequest, proof) for _ in range(4)]) == [True] * 4
+
+    preferred = pool.metrics[pool.workerFor(proof)]
+    other = pool.metrics[1 - pool.workerFor(proof)]
+    assert preferred.spilled == 0
+    assert other.spilled > 0
+    assert other.requests == other.spilled
+    assert preferred.requests + other.requests == 4
+    # the worker taking over got the keys too
+    assert other.keyShipments >= 1
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPoolRejectsWrongNonce(gvtSetup, pool):
+    _, prover, verifier, _ = gvtSetup
+    proofRequest = gvtProofRequest(verifier)
+    proof = await prover.presentProof(proofRequest)
+
+    proofRequest.nonce = verifier.generateNonce()
+    assert not await pool.verify(proofRequest, proof)
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPoolShedsLoad(gvtSetup):
+    _, prover, verifier, _ = gvtSetup
+    proofRequest = gvtProofRequest(verifier)
+    proof = await prover.presentProof(proofRequest)
+
+    pool = VerifierPool(verifier.wallet, workers=1, maxPending=1, maxQueue=0)
+    try:
+        res = await asyncio.gather(
+            *[pool.verify(proofRequest, proof) for _ in range(3)],
+            return_exceptions=True)
+    finally:
+        pool.shutdown()
+    assert res[0] is True
+    assert all(isinstance(r, PoolBusyError) for r in res[1:])
+
+
+@pytest.mark.skipif('sys.platform == "win32"', reason='SOV-86')
+@pytest.mark.asyncio
+async def testPoolReplacesDeadWorker(gvtSetup, pool):
+    _, prover, verifier, _ = gvtSetup
+    proofRequest = gvtProofRequest(verifier)
+    proof = await prover.presentProof(proofRequest)
+    assert await pool.verify(proofRequest, proof)
+
+    worker = pool._workers[pool.workerFor(proof)]
+    for pid in list(worker.executor._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    # the request that finds the process dead is retried on a new one, which
+    # gets the keys again
+    assert await pool.verify(proofRequest, proof)
+    assert await pool.verify(proofRequest, proof)
+    metrics = pool.metrics[pool.workerFor(proof)]
+    assert metrics.restarts == 1
+    assert metrics.requests == 3
+    assert metrics.keyShipments == 2
@@ -7,6 +7,11 @@ dynamically.
 from charm.core.math.integer import integer, random, randomBits, isPrime, \
     randomPrime, serialize, deserialize, toInt
 
+# integer operation counters, used by anoncreds.protocol.op_counter
+# noinspection PyUnresolvedReferences
+from charm.core.math.integer import InitBenchmark, StartBenchmark, \
+    EndBenchmark, GetGeneralBenchmarks
+
 # noinspection PyUnresolvedReferences
 from charm.toolbox.conversion import Conversion
 
@@ -0,0 +1,292 @@
+"""
+EXPERIMENTAL: a crypto configuration doing the integer (RSA group)
+arithmetic with gmpy2 and the pairings with charm. Select it with
+ANONCREDS_CRYPTO_BACKEND=gmpy2.
+
+integer mirrors charm's integer: a value with an optional modulus, the
+arithmetic of two integers with a modulus being done modulo it; x % N
+gives x with modulus N. Serialization and conversion to bytes are the
+same as charm's, so both backends hash and serialize the same values the
+same way.
+
+It is not faster than charm: both exponentiate with GMP, and the
+products of powers are done the same way on both (see
+anoncreds.protocol.utils.multiExp). It is kept as an experimental
+alternative, e.g. where charm's integer module can't be built, and may
+change or go away; charm remains the default.
+
+Install gmpy2 with the gmpy2 extra: pip install anoncreds-dev[gmpy2].
+"""
+import base64
+import math
+import secrets
+
+import gmpy2
+from gmpy2 import mpz
+
+# noinspection PyUnresolvedReferences
+from charm.toolbox.conversion import Conversion as _CharmConversion
+
+# noinspection PyUnresolvedReferences
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, pair, pc_element
+
+_PRIME_REPS = 40
+
+# operation counters (see anoncreds.protocol.op_counter)
+_counts = None
+_started = None
+_ended = None
+
+
+class integer:
+    __slots__ = ('v', 'm')
+
+    def __init__(self, value=0, modulus=0):
+        if isinstance(value, (bytes, bytearray)):
+            # charm reads the bytes up to the first zero byte
+            value = int.from_bytes(bytes(value).split(b'\x00', 1)[0], 'big')
+        elif isinstance(value, integer):
+            value = value.v
+        m = mpz(modulus.v if isinstance(modulus, integer) else modulus)
+        self.m = m
+        self.v = mpz(value) % m if m else mpz(value)
+
+    @classmethod
+    def _make(cls, v, m):
+        res = cls.__new__(cls)
+        res.v = v
+        res.m = m
+        return res
+
+    def _modulus(self, other):
+        if isinstance(other, int):
+            return self.m
+        if self.m != other.m:
+            raise ValueError('invalid operation - integers with different '
+                             'or no modulus')
+        return self.m
+
+    # arithmetic
+
+    def __mul__(self, other):
+        if not isinstance(other, (integer, int)):
+            return NotImplemented
+        m = self._modulus(other)
+        if _counts is not None:
+            _count('Mul')
+        v = self.v * (other.v if isinstance(other, integer) else other)
+        return integer._make(v % m if m else v, m)
+
+    __rmul__ = __mul__
+
+    def __add__(self, other):
+        if not isinstance(other, (integer, int)):
+            return NotImplemented
+        m = self._modulus(other)
+        v = self.v + (other.v if isinstance(other, integer) else other)
+        return integer._make(v % m if m else v, m)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if not isinstance(other, (integer, int)):
+            return NotImplemented
+        m = self._modulus(other)
+        v = self.v - (other.v if isinstance(other, integer) else other)
+        return integer._make(v % m if m else v, m)
+
+    def __rsub__(self, other):
+        if not isinstance(other, int):
+            return NotImplemented
+        v = other - self.v
+        return integer._make(v % self.m if self.m else v, self.m)
+
+    def __neg__(self):
+        return integer._make(-self.v % self.m if self.m else -self.v, self.m)
+
+    def __pow__(self, exp, modulus=None):
+        if not isinstance(exp, (integer, int)):
+            return NotImplemented
+        e = exp.v if isinstance(exp, integer) else exp
+        m = self.m
+        if modulus is not None:
+            m = mpz(int(modulus))
+        if _counts is not None:
+            _count('Exp')
+        if m:
+            return integer._make(gmpy2.powmod(self.v, e, m), m)
+        return integer._make(self.v ** e, m)
+
+    def __truediv__(self, other):
+        if not isinstance(other, (integer, int)):
+            return NotImplemented
+        m = self._modulus(other)
+        if _counts is not None:
+            _count('Div')
+        o = other.v if isinstance(other, integer) else mpz(other)
+        if m:
+            return integer._make(self.v * gmpy2.invert(o, m) % m, m)
+        return integer._make(self.v // o, m)
+
+    def __rtruediv__(self, other):
+        if not isinstance(other, int):
+            return NotImplemented
+        return integer(other, self.m) / self
+
+    def __mod__(self, modulus):
+        if not isinstance(modulus, (integer, int)):
+            return NotImplemented
+        m = mpz(modulus.v if isinstance(modulus, integer) else modulus)
+        return integer._make(self.v % m, m)
+
+    def __rmod__(self, other):
+        if not isinstance(other, int):
+            return NotImplemented
+        return integer._make(mpz(other) % self.v, self.v)
+
+    # comparison and conversion
+
+    def __eq__(self, other):
+        if isinstance(other, integer):
+            return self.v == other.v and self.m == other.m
+        if isinstance(other, int):
+            return self.v == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    def __lt__(self, other):
+        return self.v < _value(other)
+
+    def __le__(self, other):
+        return self.v <= _value(other)
+
+    def __gt__(self, other):
+        return self.v > _value(other)
+
+    def __ge__(self, other):
+        return self.v >= _value(other)
+
+    def __hash__(self):
+        return hash((self.v, self.m))
+
+    def __int__(self):
+        return int(self.v)
+
+    def __str__(self):
+        return '{} mod {}'.format(self.v, self.m) if self.m \
+            else str(self.v)
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        return integer, (int(self.v), int(self.m))
+
+
+def _value(n):
+    return n.v if isinstance(n, integer) else n
+
+
+def _count(op):
+    if op in _started:
+        _counts[op] += 1
+
+
+def random(upper):
+    """
+    A random integer below upper, modulo upper.
+    """
+    upper = int(upper)
+    return integer(secrets.randbelow(upper), upper)
+
+
+def randomBits(bits):
+    return secrets.randbits(bits)
+
+
+def isPrime(n):
+    return gmpy2.is_prime(int(n), _PRIME_REPS)
+
+
+def randomPrime(bits):
+    while True:
+        candidate = secrets.randbits(bits) | (1 << (bits - 1)) | 1
+        if gmpy2.is_prime(candidate, _PRIME_REPS):
+            return integer(candidate)
+
+
+def toInt(n):
+    """
+    The value of n, without its modulus.
+    """
+    return integer(int(n))
+
+
+def _serializeValue(v):
+    if not v:
+        return b'0:'
+    b64 = base64.b64encode(int(v).to_bytes((v.bit_length() + 7) // 8, 'big'))
+    return str(len(b64)).encode() + b':' + b64
+
+
+def serialize(n):
+    res = (b'1:' if n.v < 0 else b'0:') + _serializeValue(abs(n.v)) + b':'
+    if n.m:
+        res += _serializeValue(n.m) + b':'
+    return res
+
+
+def deserialize(data):
+    parts = data.split(b':')
+    sign = parts[0]
+
+    def value(i):
+        return int.from_bytes(base64.b64decode(parts[i + 1]), 'big') \
+            if int(parts[i]) else 0
+
+    v = value(1)
+    if sign == b'1':
+        v = -v
+    m = value(3) if len(parts) > 4 and parts[3] else 0
+    return integer(v, m)
+
+
+class Conversion(_CharmConversion):
+    @classmethod
+    def IP2OS(cls, number, xLen=None):
+        if isinstance(number, integer):
+            number = int(number)
+        if not isinstance(number, int):
+            return super().IP2OS(number, xLen)
+        if xLen is None:
+            # computed as charm does
+            xLen = int(math.ceil(math.log(number, 2) / 8.0))
+        return (number % (1 << (8 * xLen))).to_bytes(xLen, 'big')
+
+    @classmethod
+    def bytes2integer(cls, bytesIn):
+        return integer(bytes(bytesIn))
+
+
+def InitBenchmark():
+    global _counts, _started
+    _counts = None
+    _started = None
+
+
+def StartBenchmark(ops):
+    global _counts, _started
+    _started = frozenset(ops)
+    _counts = {op: 0 for op in ('Exp', 'Mul', 'Div')}
+
+
+def EndBenchmark():
+    global _counts, _ended
+    _ended = _counts
+    _counts = None
+
+
+def GetGeneralBenchmarks():
+    return dict(_ended or {})
@@ -1,25 +1,105 @@
-import glob
+"""
+The crypto backends anoncreds can run on, and cmod, the module of the
+selected one. The backend is imported on first use of cmod, so importing
+anoncreds doesn't pay for it.
+
+The backend is the one selected with selectBackend, else the one named by
+the ANONCREDS_CRYPTO_BACKEND environment variable, else 'charm'.
+"""
 import importlib
+import logging
 import os
-import re
+import threading
+
+BACKEND_ENV = 'ANONCREDS_CRYPTO_BACKEND'
+DEFAULT_BACKEND = 'charm'
+
+# backend name -> module
+_backends = {
+    'charm': 'config.config-crypto-example1',
+    # integers on gmpy2, pairings on charm
+    'gmpy2': 'config.config-crypto-gmpy2',
+}
+# backends that may change or go away, warned about when loaded
+_experimental = {'gmpy2'}
+_selected = None
+_loaded = None
+_lock = threading.Lock()
+
+
+def registerBackend(name, moduleName):
+    """
+    Makes a backend module available under the name.
+    """
+    _backends[name] = moduleName
+
+
+def availableBackends():
+    return sorted(_backends)
+
+
+def selectBackend(name):
+    """
+    Selects the backend to load on first use of cmod.
+
+    :raises ValueError: if no backend is registered under the name
+    :raises RuntimeError: if another backend is already loaded
+    """
+    global _selected
+    if name not in _backends:
+        raise ValueError('Unknown crypto backend {}, expected one of {}'
+                         .format(name, ', '.join(availableBackends())))
+    with _lock:
+        if _loaded and _loaded[0] != name:
+            raise RuntimeError('Crypto backend {} is already loaded'
+                               .format(_loaded[0]))
+        _selected = name
+
+
+def selectedBackend():
+    return _selected or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND
+
+
+def loadBackend():
+    """
+    Imports the selected backend (once).
 
+    :return: the backend module
+    """
+    global _loaded
+    if _loaded:
+        return _loaded[1]
+    with _lock:
+        if not _loaded:
+            name = selectedBackend()
+            if name not in _backends:
+                raise ValueError(
+                    'Unknown crypto backend {}, expected one of {}'.format(
+                        name, ', '.join(availableBackends())))
+            mod = importlib.import_module(_backends[name])
+            logging.debug('Loaded crypto backend %s from %s', name,
+                          mod.__name__)
+            if name in _experimental:
+                logging.warning('Crypto backend %s is experimental', name)
+            _loaded = (name, mod)
+    return _loaded[1]
 
-def dynamicModule():
-    pkg = os.path.dirname(os.path.realpath(__file__))
-    clib_pattern = os.path.join(pkg, '**', 'config-crypto-*.py')
-    clibs = [fn for fn in glob.glob(clib_pattern, recursive=True)]
 
-    if len(clibs) == 0:
-        raise RuntimeError('A crypto-lib must exist for anoncreds to run.')
-    elif len(clibs) > 1:
-        print('Found more than one crypto library, picking the first one...')
-    print('Loading module {}'.format(clibs[0]))
+class _LazyBackend:
+    """
+    Stands in for the backend module, importing it on first attribute
+    access. Looked up attributes are kept, so later lookups are as cheap as
+    on the module itself.
+    """
 
-    m = re.match('.*(config-crypto-.*)\.py', clibs[0]).groups()[0]
+    def __getattr__(self, name):
+        value = getattr(loadBackend(), name)
+        setattr(self, name, value)
+        return value
 
-    mod = importlib.import_module('config.' + m)
-    print('Module loaded.')
-    return mod
+    def __repr__(self):
+        return '<crypto backend {}>'.format(
+            _loaded[0] if _loaded else selectedBackend() + ' (not loaded)')
 
 
-cmod = dynamicModule()
+cmod = _LazyBackend()
@@ -44,6 +44,7 @@ setup(
         '': ['*.txt', '*.md', '*.rst', '*.json', '*.conf', '*.html',
              '*.css', '*.ico', '*.png', 'LICENSE', 'LEGAL']},
     install_requires=['Charm-Crypto', 'lazy-object-proxy', 'base58'],
+    extras_require={'gmpy2': ['gmpy2']},
     setup_requires=['pytest-runner'],
     tests_require=['pytest', 'pytest-asyncio']
 )